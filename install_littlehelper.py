@@ -25,7 +25,7 @@ def get_installed_version(path):
     try:
         with open(path, "r") as f:
             for line in f:
-                match = re.match(r"#\s*version\s*=\s*(\S+)", line.strip())
+                match = re.match(r"#\s*version\s*[=\s]\s*(\S+)", line.strip())
                 if match:
                     return match.group(1)
     except:
@@ -44,9 +44,9 @@ def compare_versions(v1, v2):
         return [int(x) if x.isdigit() else x for x in re.split(r'[.-]', v)]
     return normalize(v1) < normalize(v2)
 
-def script_url(script_name):
+def script_url(script_name, file_name=None):
     subdir = script_name.split(".")[0]  # e.g., pkmangui.py → pkmangui
-    return f"{REPO_BASE}/scripts/{subdir}/{script_name}"
+    return f"{REPO_BASE}/scripts/{subdir}/{file_name or script_name}"
 
 def show_menu(scripts):
     actions = []
@@ -74,25 +74,28 @@ def show_menu(scripts):
     print(" Q|q - Quit")
     return actions
 
-def download_and_install(script_name, target):
-    url = script_url(script_name)
+def download_and_install(script_name, target, files=()):
+    # files: additional modules of the script (scripts.yaml "files"), installed next to it
     try:
-        response = requests.get(url)
-        response.raise_for_status()
         os.makedirs(os.path.dirname(target), exist_ok=True)
-        with open(target, "w") as f:
-            f.write(response.text)
-        os.chmod(target, 0o755)
+        for file_name, path, mode in [(None, target, 0o755)] + [
+                (name, os.path.join(os.path.dirname(target), name), 0o644) for name in files]:
+            response = requests.get(script_url(script_name, file_name))
+            response.raise_for_status()
+            with open(path, "w") as f:
+                f.write(response.text)
+            os.chmod(path, mode)
         print(f"{script_name} installed to {target}")
     except Exception as e:
         print(f"Failed to install {script_name}: {e}")
 
-def uninstall_script(path):
-    try:
-        os.remove(path)
-        print(f"Removed {path}")
-    except Exception as e:
-        print(f"Failed to remove {path}: {e}")
+def uninstall_script(path, files=()):
+    for file_path in [path] + [os.path.join(os.path.dirname(path), name) for name in files]:
+        try:
+            os.remove(file_path)
+            print(f"Removed {file_path}")
+        except Exception as e:
+            print(f"Failed to remove {file_path}: {e}")
 
 def main():
     scripts = fetch_yaml().get("scripts", [])
@@ -110,6 +113,7 @@ def main():
         action, entry, path = actions[int(choice) - 1]
         name = entry["name"]
         version = entry.get("version", "0.0.0")
+        files = entry.get("files", [])
 
         if action == "install":
             scope = input("Install for user (u) or globally (g)? [u/g]: ").strip().lower()
@@ -118,11 +122,13 @@ def main():
                 if os.geteuid() != 0:
                     print("Need sudo to install globally.")
                     os.system(f"sudo curl -s {script_url(name)} -o {target} && sudo chmod +x {target}")
+                    for file_name in files:
+                        os.system(f"sudo curl -s {script_url(name, file_name)} -o /usr/local/bin/{file_name}")
                 else:
-                    download_and_install(name, target)
+                    download_and_install(name, target, files)
             else:
                 target = os.path.expanduser(f"~/.local/bin/{name}")
-                download_and_install(name, target)
+                download_and_install(name, target, files)
 
         elif action in ("uninstall", "update_or_uninstall"):
             if action == "update_or_uninstall":
@@ -130,13 +136,13 @@ def main():
                 print(f"2 - Uninstall {name}")
                 sub = input("Choose action: ").strip()
                 if sub == "1":
-                    download_and_install(name, path)
+                    download_and_install(name, path, files)
                 elif sub == "2":
-                    uninstall_script(path)
+                    uninstall_script(path, files)
             else:
                 confirm = input(f"Really uninstall {name}? [y/N]: ").strip().lower()
                 if confirm == "y":
-                    uninstall_script(path)
+                    uninstall_script(path, files)
 
         input("Press Enter to continue...")
 
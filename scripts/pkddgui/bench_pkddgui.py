@@ -0,0 +1,445 @@
+#version 0.0.1
+
+#============================================================================
+#MIT License
+#
+#Copyright (c) 2025 Peter Kasparak <peter.kasparak@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#DEALINGS IN THE SOFTWARE.
+#============================================================================
+
+# Benchmark-Suite für die Kopier-Engine von pkddengine.py: misst dd, alle Kopierstrategien, Pipeline,
+# O_DIRECT, Sparse, Kompression/Entpacken und Verifikation über mehrere Blockgrößen und Testdaten
+# und schreibt die Ergebnisse als JSON/CSV, damit Versionen verglichen werden können.
+#
+#   python3 bench_pkddgui.py --size 512 --block-sizes 1M 4M 16M
+#   python3 bench_pkddgui.py --datasets dense sparse --json neu.json --compare alt.json
+#   python3 bench_pkddgui.py --methods dd readinto compress:zstd verify --csv ergebnisse.csv
+#   sudo python3 bench_pkddgui.py --loop --drop-caches   # Quelle/Ziel als Loop-Devices, ohne Page-Cache
+
+import os
+import sys
+import csv
+import stat
+import json
+import time
+import platform
+import argparse
+import statistics
+import tempfile
+import subprocess
+
+import pkddengine
+
+# Testdaten: zufällig (nicht komprimierbar), überwiegend leer (Lücken und Nullen) und komprimierbar
+DATASETS = ("dense", "sparse", "compressible")
+
+# Ab dieser Verschlechterung des Durchsatzes meldet --compare eine Regression
+REGRESSION_THRESHOLD = 0.10
+
+
+def create_test_file(path, size):
+    """
+    Legt eine Datei mit Zufallsdaten der angegebenen Größe an.
+    """
+    chunk = os.urandom(pkddengine.DEFAULT_BLOCK_SIZE)
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            f.write(chunk[:remaining])
+            remaining -= len(chunk)
+
+
+def create_mostly_empty_file(path, size, data_percent):
+    """
+    Legt eine Datei an, von der nur data_percent Prozent (verteilt) Zufallsdaten enthalten.
+    Der Rest besteht zur Hälfte aus geschriebenen Nullen und zur Hälfte aus Lücken.
+    """
+    block = pkddengine.DEFAULT_BLOCK_SIZE
+    data = os.urandom(block)
+    zeros = bytes(block)
+    blocks = max(1, size // block)
+    step = max(1, round(100 / data_percent)) if data_percent else blocks + 1
+    with open(path, "wb") as f:
+        for i in range(blocks):
+            if i % step == 0:
+                f.write(data)
+            elif i % 2:
+                f.write(zeros)
+            else:
+                f.seek(block, os.SEEK_CUR)
+        f.truncate(blocks * block)
+
+
+def create_compressible_file(path, size):
+    """
+    Legt eine Datei mit gut komprimierbaren Daten an (Textzeilen mit wechselnden Zahlen, etwa wie Logs).
+    """
+    block = pkddengine.DEFAULT_BLOCK_SIZE
+    with open(path, "wb") as f:
+        written = line = 0
+        while written < size:
+            lines = []
+            length = 0
+            while length < block:
+                text = f"{line:012d} pkddgui benchmark {line * 7919 % 100003:06d} status=ok\n".encode()
+                lines.append(text)
+                length += len(text)
+                line += 1
+            chunk = b"".join(lines)[:min(block, size - written)]
+            f.write(chunk)
+            written += len(chunk)
+
+
+def create_dataset(path, dataset, size, data_percent):
+    """
+    Legt die Testdatei für dataset an (siehe DATASETS).
+    """
+    if dataset == "dense":
+        create_test_file(path, size)
+    elif dataset == "sparse":
+        create_mostly_empty_file(path, size, data_percent)
+    else:
+        create_compressible_file(path, size)
+
+
+def attach_loop(path):
+    """
+    Hängt eine Datei als Loop-Device ein und gibt den Gerätepfad zurück (benötigt root).
+    """
+    return subprocess.check_output(["losetup", "--find", "--show", path], text=True).strip()
+
+
+def detach_loop(device):
+    """
+    Löst ein Loop-Device wieder.
+    """
+    subprocess.run(["losetup", "-d", device], check=False)
+
+
+def drop_caches():
+    """
+    Schreibt alles auf die Medien und leert den Page-Cache (benötigt root).
+    """
+    os.sync()
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3\n")
+
+
+def run_dd(source, dest, block_size):
+    """
+    Der bisherige Weg: dd als Subprozess.
+    """
+    subprocess.run(
+        ["dd", f"if={source}", f"of={dest}", f"bs={block_size}", "conv=fsync", "status=none"],
+        check=True
+    )
+
+
+def run_engine(source, dest, block_size, strategy, direct=False):
+    """
+    Die Kopier-Engine mit einer festen Strategie.
+    """
+    pkddengine.copy_path(source, dest, block_size, strategy=strategy, direct=direct)
+
+
+def run_sparse(source, dest, block_size):
+    """
+    Wie copy_path mit sparse=True, gibt aber die Anzahl übersprungener Bytes zurück
+    (0, wenn das Ziel keine reguläre Datei ist und daher normal geschrieben wird).
+    """
+    src_fd = os.open(source, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if stat.S_ISREG(os.fstat(dst_fd).st_mode):
+                skipped = pkddengine.sparse_copy(src_fd, dst_fd, block_size)[1]
+            else:
+                pkddengine.copy_data(src_fd, dst_fd, block_size)
+                skipped = 0
+            os.fsync(dst_fd)
+            return skipped
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def allocated_bytes(path):
+    """
+    Tatsächlich belegter Platz einer Datei (st_blocks); None für Blockgeräte.
+    """
+    st = os.stat(path)
+    return st.st_blocks * 512 if stat.S_ISREG(st.st_mode) else None
+
+
+def timed(func, *args):
+    """
+    Führt func aus und gibt die benötigte Zeit in Sekunden zurück.
+    """
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def all_methods():
+    """
+    Alle Messverfahren in der Reihenfolge der Ausgabe.
+    """
+    methods = ["dd"] + pkddengine.available_strategies() + ["pipeline", "direct", "sparse", "verify"]
+    for fmt in pkddengine.available_compressions():
+        methods += [f"compress:{fmt}", f"decompress:{fmt}"]
+    return methods
+
+
+def measure(method, source, dest, block_size, tmp, details):
+    """
+    Misst ein Verfahren einmal und gibt die Zeit in Sekunden zurück. Vorbereitungen (das Image zum
+    Entpacken, das Ziel zum Verifizieren) werden nicht mitgemessen. Beim Sparse-Modus werden die
+    übersprungenen Bytes in details eingetragen.
+    """
+    if method == "dd":
+        return timed(run_dd, source, dest, block_size)
+    if method in ("readinto", "copy_file_range", "sendfile", "pipeline"):
+        return timed(run_engine, source, dest, block_size, method)
+    if method == "direct":
+        return timed(run_engine, source, dest, block_size, "pipeline", True)
+    if method == "sparse":
+        start = time.perf_counter()
+        details["skipped_bytes"] = run_sparse(source, dest, block_size)
+        return time.perf_counter() - start
+    if method == "verify":
+        run_engine(source, dest, block_size, "auto")
+        size = pkddengine.get_size_bytes(source)
+        start = time.perf_counter()
+        if pkddengine.verify_path(source, dest, size) is not None:
+            raise RuntimeError("Verifikation meldet Unterschiede")
+        return time.perf_counter() - start
+    kind, fmt = method.split(":")
+    image = os.path.join(tmp, "image" + pkddengine.COMPRESSIONS[fmt][0])
+    if kind == "compress":
+        return timed(lambda: pkddengine.copy_path(source, image, block_size, compress=fmt))
+    if not os.path.exists(image):
+        pkddengine.copy_path(source, image, block_size, compress=fmt)
+    return timed(lambda: pkddengine.copy_path(image, dest, block_size, decompress=fmt))
+
+
+def measure_repeated(args, method, source, dest, block_size, tmp, details):
+    """
+    Misst ein Verfahren args.repeat-mal und gibt die einzelnen Zeiten zurück.
+    """
+    times = []
+    for _ in range(args.repeat):
+        if args.drop_caches:
+            drop_caches()
+        times.append(measure(method, source, dest, block_size, tmp, details))
+    return times
+
+
+def add_sparse_report(args, result, results, source, dest, tmp, log):
+    """
+    Ergänzt eine Sparse-Messung um den belegten Platz des Ziels und die Zeitersparnis gegenüber
+    einer normalen Kopie (readinto) derselben Testdaten und Blockgröße. Wurde readinto nicht
+    gemessen, wird es hier zum Vergleich nachgeholt.
+    """
+    result["allocated_bytes"] = allocated_bytes(dest)
+    baseline = next((r.get("seconds") for r in results
+                     if r["dataset"] == result["dataset"] and r["method"] == "readinto"
+                     and r["block_size"] == result["block_size"]), None)
+    if baseline is None:
+        try:
+            baseline = statistics.median(
+                measure_repeated(args, "readinto", source, dest, result["block_size"], tmp, {}))
+        except OSError:
+            baseline = None
+    if baseline:
+        result["saved_seconds"] = baseline - result["seconds"]
+    log(sparse_summary(result))
+
+
+def sparse_summary(result):
+    """
+    Textzeile mit übersprungenen Bytes, belegtem Platz und Zeitersparnis einer Sparse-Messung.
+    """
+    mib = 1024 * 1024
+    parts = []
+    if result.get("skipped_bytes") is not None:
+        parts.append(f"übersprungen {result['skipped_bytes'] / mib:.1f} MiB")
+    if result.get("allocated_bytes") is not None:
+        parts.append(f"belegt {result['allocated_bytes'] / mib:.1f} MiB statt {result['bytes'] / mib:.1f} MiB")
+    if result.get("saved_seconds") is not None:
+        baseline = result["seconds"] + result["saved_seconds"]
+        parts.append(f"gespart {result['saved_seconds']:.3f} s ({result['saved_seconds'] / baseline * 100:.0f} %)")
+    return f"{'':<14}{'':<22}{'':>8}  " + (", ".join(parts) or "keine Sparse-Angaben")
+
+
+def run_benchmark(args, tmp, source, dest, dataset, size, log):
+    """
+    Misst alle gewählten Verfahren und Blockgrößen für eine Testdatei und gibt die Ergebnisse zurück.
+    """
+    results = []
+    for bs_text in args.block_sizes:
+        block_size = pkddengine.parse_size(bs_text)
+        for method in args.methods:
+            result = {"dataset": dataset, "method": method, "block_size": block_size, "bytes": size}
+            try:
+                times = measure_repeated(args, method, source, dest, block_size, tmp, result)
+            except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+                result["error"] = getattr(e, "strerror", None) or str(e)
+                log(f"{dataset:<14}{method:<22}{bs_text:>8}{'nicht unterstützt':>24}  ({result['error']})")
+                results.append(result)
+                continue
+            seconds = statistics.median(times)
+            result.update(seconds=seconds, best=min(times), runs=len(times), mb_s=size / seconds / 1e6)
+            log(f"{dataset:<14}{method:<22}{bs_text:>8}{seconds:>12.3f}{result['mb_s']:>12.1f}")
+            if method == "sparse":
+                add_sparse_report(args, result, results, source, dest, tmp, log)
+            results.append(result)
+        # Komprimierte Images sind je Blockgröße neu zu messen
+        for fmt in pkddengine.COMPRESSIONS:
+            image = os.path.join(tmp, "image" + pkddengine.COMPRESSIONS[fmt][0])
+            if os.path.exists(image):
+                os.remove(image)
+    return results
+
+
+def engine_version():
+    """
+    Versionszeile aus dem Kopf von pkddengine.py (#version ...).
+    """
+    with open(pkddengine.__file__, "r", encoding="utf-8") as f:
+        first = f.readline().strip()
+    return first.split(None, 1)[1] if first.startswith("#version") else "unbekannt"
+
+
+def write_csv(path, results):
+    """
+    Schreibt die Ergebnisse als CSV (eine Zeile je Messung).
+    """
+    fields = ["dataset", "method", "block_size", "bytes", "seconds", "best", "runs", "mb_s",
+              "skipped_bytes", "allocated_bytes", "saved_seconds", "error"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+
+
+def compare(path, results, threshold, log):
+    """
+    Vergleicht den Durchsatz mit einer früheren JSON-Ausgabe (gleiche Testdaten, Methode, Blockgröße
+    und Größe). Gibt die Anzahl Regressionen zurück.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        old = {(r["dataset"], r["method"], r["block_size"], r["bytes"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    log(f"\nVergleich mit {path}:")
+    log(f"{'Daten':<14}{'Methode':<22}{'Block':>8}{'alt MB/s':>12}{'neu MB/s':>12}{'Änderung':>10}")
+    for result in results:
+        previous = old.get((result["dataset"], result["method"], result["block_size"], result["bytes"]), {})
+        before = previous.get("mb_s")
+        after = result.get("mb_s")
+        if not before or not after:
+            continue
+        change = after / before - 1
+        mark = ""
+        if change < -threshold:
+            mark = "  ← Regression"
+            regressions += 1
+        log(f"{result['dataset']:<14}{result['method']:<22}{pkddengine.format_size(result['block_size']):>8}"
+            f"{before:>12.1f}{after:>12.1f}{change * 100:>+9.0f}%{mark}")
+        if result["method"] == "sparse":
+            log(f"{'':<14}{'':<22}{'':>8}  alt: " + sparse_summary(previous).strip())
+            log(f"{'':<14}{'':<22}{'':>8}  neu: " + sparse_summary(result).strip())
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark-Suite: dd vs. pkddgui-Kopier-Engine")
+    parser.add_argument("--size", type=int, default=256, help="Größe der Testdaten in MiB")
+    parser.add_argument("--block-sizes", nargs="+", default=["1M", "4M", "16M"], help="Zu testende Blockgrößen")
+    parser.add_argument("--datasets", nargs="+", choices=DATASETS, default=["dense"], help="Testdaten")
+    parser.add_argument("--methods", nargs="+", default=None,
+                        help=f"Verfahren (Standard: alle, also {' '.join(all_methods())})")
+    parser.add_argument("--sparse-percent", type=int, default=10, help="Belegter Anteil der sparse-Testdaten in %%")
+    parser.add_argument("--repeat", type=int, default=1, help="Messungen je Verfahren (Median wird berichtet)")
+    parser.add_argument("--loop", action="store_true", help="Quelle und Ziel als Loop-Devices einhängen (root)")
+    parser.add_argument("--drop-caches", action="store_true", help="Vor jeder Messung den Page-Cache leeren (root)")
+    parser.add_argument("--dir", default=None, help="Verzeichnis für die Testdateien")
+    parser.add_argument("--json", help="Ergebnisse als JSON schreiben")
+    parser.add_argument("--csv", help="Ergebnisse als CSV schreiben")
+    parser.add_argument("--compare", metavar="JSON", help="Mit früheren Ergebnissen vergleichen; Exit-Code 1 bei Regression")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Verschlechterung, ab der eine Regression gemeldet wird (0.10 = 10 %%)")
+    args = parser.parse_args()
+
+    args.methods = args.methods or all_methods()
+    unknown = set(args.methods) - set(all_methods())
+    if unknown:
+        parser.error(f"Unbekannte oder nicht verfügbare Verfahren: {', '.join(sorted(unknown))}")
+    if (args.loop or args.drop_caches) and os.geteuid() != 0:
+        print("--loop und --drop-caches benötigen root-Rechte.")
+        sys.exit(1)
+
+    size = args.size * 1024 * 1024
+    results = []
+    print(f"{'Daten':<14}{'Methode':<22}{'Block':>8}{'Zeit (s)':>12}{'MB/s':>12}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for dataset in args.datasets:
+            src_file = os.path.join(tmp, f"{dataset}_source.img")
+            dst_file = os.path.join(tmp, f"{dataset}_dest.img")
+            create_dataset(src_file, dataset, size, args.sparse_percent)
+            create_test_file(dst_file, size)
+
+            source, dest = src_file, dst_file
+            loops = []
+            if args.loop:
+                source, dest = attach_loop(src_file), attach_loop(dst_file)
+                loops = [source, dest]
+            try:
+                results += run_benchmark(args, tmp, source, dest, dataset, size, print)
+            finally:
+                for device in loops:
+                    detach_loop(device)
+                os.remove(src_file)
+                os.remove(dst_file)
+
+    meta = {
+        "version": engine_version(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "host": platform.node(),
+        "kernel": platform.release(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "size": size,
+        "loop": args.loop,
+        "drop_caches": args.drop_caches,
+        "repeat": args.repeat,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    if args.csv:
+        write_csv(args.csv, results)
+    if args.compare and compare(args.compare, results, args.threshold, print):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
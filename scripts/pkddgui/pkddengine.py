@@ -0,0 +1,3392 @@
+#version 0.0.1
+
+#============================================================================
+#MIT License
+#
+#Copyright (c) 2025 Peter Kasparak <peter.kasparak@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell   
+#copies of the Software, and to permit persons to whom the Software is       
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in 
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR 
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE 
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     
+#FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         
+#DEALINGS IN THE SOFTWARE.
+#============================================================================
+
+# Kopier-Engine von pkddgui.py ohne Qt: wird von der Oberfläche, von bench_pkddgui.py und
+# im Headless-Modus (pkddgui.py --headless JOBDATEI) benutzt.
+
+import os
+import sys
+import mmap
+import errno
+import fcntl
+import queue
+import stat
+import threading
+import time
+import io
+import gzip
+import lzma
+import json
+import hashlib
+import hmac
+import select
+import socket
+import struct
+import zlib
+import tempfile
+import argparse
+import ctypes
+import platform
+import urllib.parse
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard  # optional: pip install zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import yaml  # optional: pip install pyyaml (Jobdateien im YAML-Format)
+except ImportError:
+    yaml = None
+
+# -------------------------------------------------------------------
+#Kopier-Engine (ersetzt den dd-Aufruf)
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Wählbare Blockgrößen (Anzeige, Bytes)
+BLOCK_SIZES = [
+    ("1M", 1024 * 1024),
+    ("4M", 4 * 1024 * 1024),
+    ("8M", 8 * 1024 * 1024),
+    ("16M", 16 * 1024 * 1024),
+    ("64M", 64 * 1024 * 1024),
+]
+
+# Kopierstrategien in der Reihenfolge, in der sie im Modus "auto" probiert werden
+COPY_STRATEGIES = ("copy_file_range", "sendfile", "readinto")
+
+# Anzahl vorab angelegter Puffer in der Lese-/Schreib-Pipeline
+PIPELINE_DEPTH = 4
+
+# Maximale Anzahl Blöcke, die beim Klonen auf mehrere Ziele je Ziel warten dürfen
+FANOUT_QUEUE_DEPTH = 8
+
+# Ausrichtung für O_DIRECT (deckt 512-Byte- und 4K-Sektoren ab)
+DIRECT_ALIGNMENT = 4096
+
+# Block-Manifest für den Delta-Modus: Prüfsumme je Chunk, als JSON neben dem Image
+MANIFEST_FORMAT = "pkddgui-manifest"
+MANIFEST_ALGORITHM = "blake2b-256"
+MANIFEST_CHUNK_SIZE = 4 * 1024 * 1024
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Automatische Blockgröße: Kandidaten, Pipeline-Tiefen (1 = ohne Pipeline) und Datenmenge je Messung
+AUTO_BLOCK_SIZE = "auto"
+TUNE_BLOCK_SIZES = (1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024)
+TUNE_DEPTHS = (1, PIPELINE_DEPTH)
+TUNE_PROBE_SIZE = 32 * 1024 * 1024
+TUNE_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pkddgui", "io-tuning.json"
+)
+
+# Fortsetzbare Kopien: Journal je Ziel, Checkpoint (fdatasync + Journal) alle CHECKPOINT_INTERVAL Bytes
+JOURNAL_FORMAT = "pkddgui-journal"
+JOURNAL_DIR = os.path.join(
+    os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state"), "pkddgui", "journals"
+)
+CHECKPOINT_INTERVAL = 256 * 1024 * 1024
+
+# Rettungsmodus: Map-Dateien, Lesefehler, die als defekter Bereich gelten, und die Wiederholungsdurchgänge
+# (Blockgröße, rückwärts) nach dem schnellen ersten Durchgang
+RESCUE_FORMAT = "pkddgui-rescue-map"
+RESCUE_DIR = os.path.join(os.path.dirname(JOURNAL_DIR), "rescue")
+RESCUE_MAX_SKIP = 64 * 1024 * 1024
+RESCUE_PASSES = ((1024 * 1024, True), (64 * 1024, False), (0, True), (0, False))
+_READ_ERRNOS = {errno.EIO, errno.ENODATA, errno.EILSEQ, errno.EBADMSG}
+
+# Höchstens so oft pro Sekunde wird Fortschritt an die Oberfläche gemeldet
+PROGRESS_INTERVAL = 0.25
+
+# Gecachte Null-Puffer je Blockgröße für die Erkennung leerer Blöcke
+_zero_blocks = {}
+
+# Kompressionsformate: Dateiendung und Magic Bytes
+COMPRESSIONS = {
+    "gzip": (".gz", b"\x1f\x8b"),
+    "xz": (".xz", b"\xfd7zXZ\x00"),
+    "zstd": (".zst", b"\x28\xb5\x2f\xfd"),
+    "indexed": (".pkdi", b"PKDDIMG1"),  # eigenes Format mit Index (siehe IndexedImage)
+}
+
+# Fehlercodes, mit denen der Kernel eine Strategie für diese Dateien ablehnt
+_UNSUPPORTED_ERRNOS = {errno.EINVAL, errno.ENOSYS, errno.EXDEV, errno.EOPNOTSUPP}
+
+
+class CopyAborted(Exception):
+    """
+    Wird ausgelöst, wenn der Kopiervorgang abgebrochen wurde.
+    """
+
+
+def get_size_bytes(path):
+    """
+    Gibt die Größe einer Datei oder eines Blockgeräts in Bytes zurück (ohne Subprozess).
+    Bei Netzwerkpfaden wird der Empfänger gefragt.
+    """
+    if is_remote(path):
+        try:
+            return remote_size(path)
+        except (OSError, ValueError):
+            return None
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return os.lseek(fd, 0, os.SEEK_END)
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+
+
+def alloc_buffer(size):
+    """
+    Legt einen wiederverwendbaren Puffer an. mmap-Speicher ist immer seitenausgerichtet.
+    """
+    return mmap.mmap(-1, size)
+
+
+def write_all(fd, view):
+    """
+    Schreibt den kompletten Inhalt von view, auch wenn os.write nur teilweise schreibt.
+    """
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def read_full(fd, view):
+    """
+    Liest, bis view gefüllt oder das Dateiende erreicht ist, und gibt die Anzahl Bytes zurück.
+    """
+    got = 0
+    while got < len(view):
+        try:
+            n = os.readv(fd, [view[got:]])
+        except OSError as e:
+            # O_DIRECT nach einem kurzen Lesevorgang (nicht ausgerichtet): ohne O_DIRECT weiterlesen
+            if e.errno != errno.EINVAL or not got or not is_direct(fd):
+                raise
+            clear_direct(fd)
+            continue
+        if n == 0:
+            break
+        got += n
+    return got
+
+
+def open_fd(path, flags, direct=False):
+    """
+    Öffnet path mit os.open. Mit direct=True wird O_DIRECT versucht.
+    Gibt (fd, direct) zurück; direct ist False, wenn das Dateisystem O_DIRECT ablehnt.
+    """
+    if direct and hasattr(os, "O_DIRECT"):
+        try:
+            return os.open(path, flags | os.O_DIRECT, 0o644), True
+        except OSError as e:
+            if e.errno != errno.EINVAL:
+                raise
+    return os.open(path, flags, 0o644), False
+
+
+def is_direct(fd):
+    """
+    Prüft, ob fd mit O_DIRECT geöffnet ist.
+    """
+    return bool(fcntl.fcntl(fd, fcntl.F_GETFL) & getattr(os, "O_DIRECT", 0))
+
+
+def clear_direct(fd):
+    """
+    Schaltet O_DIRECT für fd ab, z. B. für ein nicht ausgerichtetes Dateiende.
+    """
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags & ~getattr(os, "O_DIRECT", 0))
+
+
+def pwrite_all(fd, view, offset):
+    """
+    Schreibt den kompletten Inhalt von view ab offset, auch bei teilweisen Schreibvorgängen.
+    """
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def is_zero_block(buf, n):
+    """
+    Prüft, ob die ersten n Bytes von buf nur aus Nullen bestehen.
+    buf.find mit einem gleich langen, gecachten Null-Puffer vergleicht ohne Kopie der Daten.
+    """
+    zero = _zero_blocks.get(len(buf))
+    if zero is None:
+        zero = _zero_blocks[len(buf)] = memoryview(bytes(len(buf)))
+    return buf.find(zero[:n], 0, n) == 0
+
+
+def feed_zeros(on_data, length, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Übergibt on_data length Null-Bytes in Stücken von höchstens block_size (für Lücken in Sparse-Dateien).
+    """
+    zero = _zero_blocks.get(block_size)
+    if zero is None:
+        zero = _zero_blocks[block_size] = memoryview(bytes(block_size))
+    while length > 0:
+        n = min(length, block_size)
+        on_data(zero[:n])
+        length -= n
+
+
+def data_extents(fd, size):
+    """
+    Liefert (Anfang, Ende) aller Datenbereiche von fd über SEEK_DATA/SEEK_HOLE.
+    Kennt das Dateisystem keine Lücken (z. B. Blockgeräte), ist alles ein Datenbereich.
+    """
+    if not hasattr(os, "SEEK_DATA"):
+        yield 0, size
+        return
+    pos = 0
+    while pos < size:
+        try:
+            start = os.lseek(fd, pos, os.SEEK_DATA)
+        except OSError as e:
+            if e.errno == errno.ENXIO:
+                return  # ab pos nur noch Lücke
+            if e.errno in _UNSUPPORTED_ERRNOS and pos == 0:
+                yield 0, size
+                return
+            raise
+        end = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+        yield start, end
+        pos = end
+
+
+def available_strategies():
+    """
+    Gibt die Kopierstrategien zurück, die dieses Python/Betriebssystem anbietet.
+    """
+    return [name for name in COPY_STRATEGIES if name == "readinto" or hasattr(os, name)]
+
+
+def copy_data(src_fd, dst_fd, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, strategy="auto",
+              on_data=None, length=None, depth=PIPELINE_DEPTH):
+    """
+    Kopiert ab der aktuellen Position alle Daten von src_fd nach dst_fd und gibt die Anzahl Bytes zurück.
+
+    Im Modus "auto" wird zuerst copy_file_range, dann sendfile und zuletzt readinto in einen
+    ausgerichteten Puffer probiert. Lehnt der Kernel eine Strategie ab, wird ab der aktuellen
+    Dateiposition mit der nächsten weitergemacht. "pipeline" liest und schreibt in getrennten
+    Threads (siehe pipeline_copy). on_progress erhält die exakte Bytezahl.
+    on_data bekommt jeden geschriebenen Block; die Daten müssen dafür durch den Prozess laufen,
+    copy_file_range und sendfile werden dann nicht benutzt. Mit length wird höchstens so viel kopiert.
+    """
+    if strategy == "pipeline":
+        return pipeline_copy(src_fd, dst_fd, block_size, on_progress, should_abort, depth, on_data, length)
+    if on_data:
+        strategy = "readinto"
+    strategies = available_strategies() if strategy == "auto" else [strategy]
+    copied = 0
+    buf = None
+    try:
+        while True:
+            name = strategies[0]
+            try:
+                while True:
+                    if should_abort and should_abort():
+                        raise CopyAborted()
+                    chunk = block_size if length is None else min(block_size, length - copied)
+                    if chunk == 0:
+                        return copied
+                    if name == "copy_file_range":
+                        n = os.copy_file_range(src_fd, dst_fd, chunk)
+                    elif name == "sendfile":
+                        n = os.sendfile(dst_fd, src_fd, None, chunk)
+                    else:
+                        if buf is None:
+                            buf = alloc_buffer(block_size)
+                        with memoryview(buf) as view:
+                            n = os.readv(src_fd, [view[:chunk]])
+                            if n:
+                                write_all(dst_fd, view[:n])
+                                if on_data:
+                                    on_data(view[:n])
+                    if n == 0:
+                        return copied
+                    copied += n
+                    if on_progress:
+                        on_progress(copied)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS or len(strategies) == 1:
+                    raise
+                strategies.pop(0)
+    finally:
+        if buf is not None:
+            buf.close()
+
+
+def pipeline_copy(src_fd, dst_fd, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, depth=PIPELINE_DEPTH,
+                  on_data=None, length=None):
+    """
+    Kopiert mit getrenntem Lese- und Schreib-Thread und gibt die Anzahl Bytes zurück.
+
+    Ein Lese-Thread füllt depth vorab angelegte, ausgerichtete Puffer und reicht sie an den
+    aufrufenden Thread weiter, der sie schreibt und wieder freigibt. Die Quelle liest also
+    weiter, während das Ziel noch schreibt; mehr als depth Puffer sind nie unterwegs.
+    Mit length wird höchstens so viel kopiert.
+    """
+    buffers = [alloc_buffer(block_size) for _ in range(depth)]
+    free = queue.Queue()
+    for buf in buffers:
+        free.put(buf)
+    filled = queue.Queue()
+    stop = threading.Event()
+
+    def reader():
+        requested = 0
+        try:
+            while not stop.is_set():
+                try:
+                    buf = free.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                want = block_size if length is None else min(block_size, length - requested)
+                with memoryview(buf) as view:
+                    n = read_full(src_fd, view[:want])
+                requested += n
+                last = n < want or requested == length
+                filled.put((buf, n, last))
+                if last:
+                    return
+        except Exception as e:
+            filled.put((None, e, True))
+
+    thread = io_thread(reader, name="pkddgui-reader")
+    thread.start()
+    direct = is_direct(dst_fd)
+    copied = 0
+    try:
+        while True:
+            if should_abort and should_abort():
+                raise CopyAborted()
+            buf, n, last = filled.get()
+            if buf is None:
+                raise n
+            if n:
+                if direct and n % DIRECT_ALIGNMENT:
+                    # O_DIRECT verlangt ausgerichtete Längen, das Ende geht über den Page-Cache
+                    clear_direct(dst_fd)
+                    direct = False
+                with memoryview(buf) as view:
+                    write_all(dst_fd, view[:n])
+                    if on_data:
+                        on_data(view[:n])
+                copied += n
+                if on_progress:
+                    on_progress(copied)
+            free.put(buf)
+            if last:
+                return copied
+    finally:
+        stop.set()
+        thread.join()
+        for buf in buffers:
+            buf.close()
+
+
+def sparse_copy(src_fd, dst_fd, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, on_data=None):
+    """
+    Kopiert src_fd in die reguläre Datei dst_fd, ohne leere Bereiche zu schreiben.
+
+    Lücken einer Quelldatei werden über SEEK_DATA/SEEK_HOLE gar nicht erst gelesen, gelesene
+    Null-Blöcke werden im Ziel übersprungen. Zum Schluss wird das Ziel auf die Quellgröße
+    gesetzt, alle übersprungenen Bereiche bleiben Lücken in der Datei.
+    on_data bekommt alle Daten in Dateireihenfolge, für Lücken entsprechend viele Nullen.
+    Gibt (verarbeitete Bytes, übersprungene Bytes) zurück.
+    """
+    size = os.lseek(src_fd, 0, os.SEEK_END)
+    buf = alloc_buffer(block_size)
+    skipped = 0
+    pos = 0
+    try:
+        with memoryview(buf) as view:
+            for start, end in data_extents(src_fd, size):
+                skipped += start - pos
+                if on_data:
+                    feed_zeros(on_data, start - pos, block_size)
+                pos = start
+                while pos < end:
+                    if should_abort and should_abort():
+                        raise CopyAborted()
+                    n = os.preadv(src_fd, [view[:min(block_size, end - pos)]], pos)
+                    if n == 0:
+                        break
+                    if is_zero_block(buf, n):
+                        skipped += n
+                    else:
+                        pwrite_all(dst_fd, view[:n], pos)
+                    if on_data:
+                        on_data(view[:n])
+                    pos += n
+                    if on_progress:
+                        on_progress(pos)
+                pos = end
+        skipped += size - pos
+        if on_data:
+            feed_zeros(on_data, size - pos, block_size)
+        os.ftruncate(dst_fd, size)
+        if on_progress:
+            on_progress(size)
+    finally:
+        buf.close()
+    return size, skipped
+
+
+def fanout_copy(src_fd, dst_fds, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None,
+                depth=FANOUT_QUEUE_DEPTH, on_data=None):
+    """
+    Liest src_fd ein einziges Mal und schreibt jeden Block gleichzeitig in alle dst_fds.
+
+    Jedes Ziel hat einen eigenen Schreib-Thread mit eigener, begrenzter Queue. Ein langsames
+    Ziel bremst den Leser erst, wenn seine eigene Queue voll ist; die übrigen Ziele schreiben
+    bis dahin ungehindert weiter. Fällt ein Ziel mit einem Fehler aus, laufen die anderen weiter.
+    Die Blöcke liegen in einem festen Ring von depth + 2 vorab angelegten Puffern; ein Puffer wird
+    erst wieder gefüllt, wenn alle Ziele ihn freigegeben haben.
+    on_progress(index, bytes) meldet den Fortschritt je Ziel, on_data bekommt jeden gelesenen Block.
+    Gibt (gelesene Bytes, {index: Fehler}) zurück.
+    """
+    queues = [queue.Queue(maxsize=depth) for _ in dst_fds]
+    failed = {}
+    stop = threading.Event()
+
+    # Puffer-Ring: jede Queue kann voll sein und ihr Schreiber einen weiteren Block halten
+    buffers = [alloc_buffer(block_size) for _ in range(depth + 2)]
+    free = queue.Queue()
+    for slot in range(len(buffers)):
+        free.put(slot)
+    refs = [0] * len(buffers)
+    refs_lock = threading.Lock()
+
+    def release(slot):
+        with refs_lock:
+            refs[slot] -= 1
+            if refs[slot] == 0:
+                free.put(slot)
+
+    def writer(index, fd, blocks):
+        direct = is_direct(fd)
+        done = 0
+        try:
+            while True:
+                item = blocks.get()
+                if item is None:
+                    os.fsync(fd)
+                    return
+                slot, n = item
+                try:
+                    if stop.is_set():
+                        return
+                    if direct and n % DIRECT_ALIGNMENT:
+                        clear_direct(fd)
+                        direct = False
+                    with memoryview(buffers[slot]) as view:
+                        write_all(fd, view[:n])
+                finally:
+                    release(slot)
+                done += n
+                if on_progress:
+                    on_progress(index, done)
+        except Exception as e:
+            failed[index] = e
+            # Restliche Blöcke freigeben, damit der Leser für die anderen Ziele weiterarbeiten kann
+            while True:
+                item = blocks.get()
+                if item is None:
+                    return
+                release(item[0])
+
+    threads = [
+        io_thread(writer, (i, fd, q), f"pkddgui-writer-{i}")
+        for i, (fd, q) in enumerate(zip(dst_fds, queues))
+    ]
+    for thread in threads:
+        thread.start()
+
+    read = 0
+    try:
+        while len(failed) < len(dst_fds):
+            if should_abort and should_abort():
+                raise CopyAborted()
+            # Nächsten freien Puffer aus dem Ring holen; alle Ziele lesen ihn nur
+            while True:
+                try:
+                    slot = free.get(timeout=0.1)
+                    break
+                except queue.Empty:
+                    if should_abort and should_abort():
+                        raise CopyAborted()
+            with memoryview(buffers[slot]) as view:
+                n = read_full(src_fd, view)
+                if n and on_data:
+                    on_data(view[:n])
+            if not n:
+                free.put(slot)
+            else:
+                refs[slot] = len(queues)
+                for i, blocks in enumerate(queues):
+                    while True:
+                        if i in failed:
+                            # ausgefallenes Ziel: seinen Anteil gleich freigeben
+                            release(slot)
+                            break
+                        try:
+                            blocks.put((slot, n), timeout=0.1)
+                            break
+                        except queue.Full:
+                            if should_abort and should_abort():
+                                raise CopyAborted()
+                read += n
+            if n < block_size:
+                break
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        # Schreib-Threads beenden; ein Thread, der schon weg ist, braucht kein Endzeichen mehr
+        for thread, blocks in zip(threads, queues):
+            while thread.is_alive():
+                try:
+                    blocks.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+        for thread in threads:
+            thread.join()
+    return read, failed
+
+
+def clone_path(source, dests, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, direct=False,
+               on_message=None, hasher=None, throttle=None):
+    """
+    Klont source auf alle Geräte in dests mit nur einem Lesedurchgang (siehe fanout_copy).
+    Mit hasher (ChunkHasher) werden die Prüfsummen der Quelle beim Lesen mitberechnet.
+    Mit throttle (IOThrottle) wird der Lesedurchgang begrenzt; da jedes Ziel jeden Block schreibt
+    und der Puffer-Ring die Schreiber kurz hält, gilt die Rate so für jedes Ziel.
+    Gibt (gelesene Bytes, {Ziel: Fehler}) zurück.
+    """
+    def on_data(data):
+        if hasher:
+            hasher.update(data)
+        if throttle:
+            throttle.consume(len(data), should_abort)
+
+    src_fd, _ = open_fd(source, os.O_RDONLY, direct)
+    dst_fds = []
+    try:
+        for dest in dests:
+            fd, dst_direct = open_fd(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, direct)
+            dst_fds.append(fd)
+            if direct and not dst_direct and on_message:
+                on_message(f"Hinweis: {dest} unterstützt kein O_DIRECT, Schreiben über den Page-Cache.")
+        read, failed = fanout_copy(src_fd, dst_fds, block_size, on_progress, should_abort,
+                                   on_data=on_data if hasher or throttle else None)
+        return read, {dests[i]: error for i, error in failed.items()}
+    finally:
+        for fd in dst_fds:
+            os.close(fd)
+        os.close(src_fd)
+
+
+def chunk_digest(data):
+    """
+    Prüfsumme eines Chunks für das Block-Manifest.
+    """
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+class ChunkHasher:
+    """
+    Berechnet Chunk-Prüfsummen (wie im Block-Manifest) aus fortlaufend übergebenen Datenblöcken.
+    update kann direkt als on_data der Kopierfunktionen dienen; die Blockgröße ist dabei beliebig.
+    """
+    def __init__(self, chunk_size=MANIFEST_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.digests = []
+        self._hash = hashlib.blake2b(digest_size=32)
+        self._filled = 0
+
+    def update(self, data):
+        """
+        Hängt data an und schließt dabei jeden vollen Chunk ab.
+        """
+        with memoryview(data) as view:
+            while view:
+                take = min(len(view), self.chunk_size - self._filled)
+                self._hash.update(view[:take])
+                self._filled += take
+                view = view[take:]
+                if self._filled == self.chunk_size:
+                    self.digests.append(self._hash.hexdigest())
+                    self._hash = hashlib.blake2b(digest_size=32)
+                    self._filled = 0
+
+    def finish(self):
+        """
+        Schließt einen angefangenen letzten Chunk ab und gibt alle Prüfsummen zurück.
+        """
+        if self._filled:
+            self.digests.append(self._hash.hexdigest())
+            self._hash = hashlib.blake2b(digest_size=32)
+            self._filled = 0
+        return self.digests
+
+
+def manifest_path(image):
+    """
+    Pfad des Block-Manifests, das neben dem Image liegt.
+    """
+    return image + MANIFEST_SUFFIX
+
+
+def load_manifest(image):
+    """
+    Liest das Block-Manifest zu image. Gibt None zurück, wenn es fehlt oder nicht passt.
+    """
+    try:
+        with open(manifest_path(image), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != MANIFEST_FORMAT or manifest.get("algorithm") != MANIFEST_ALGORITHM:
+        return None
+    return manifest
+
+
+def save_manifest(image, size, chunk_size, chunks):
+    """
+    Schreibt das Block-Manifest zu image (atomar über eine temporäre Datei).
+    """
+    path = manifest_path(image)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({
+            "format": MANIFEST_FORMAT,
+            "version": 1,
+            "algorithm": MANIFEST_ALGORITHM,
+            "chunk_size": chunk_size,
+            "size": size,
+            "chunks": chunks,
+        }, f)
+    os.replace(path + ".tmp", path)
+
+
+def map_chunks(func, size, chunk_size, on_progress=None, should_abort=None, workers=None):
+    """
+    Ruft func(offset, länge) für alle Chunks von 0 bis size in einem Thread-Pool auf und gibt die
+    Ergebnisse in Chunk-Reihenfolge zurück. Höchstens 2 * workers Chunks sind gleichzeitig in Arbeit.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = []
+    pending = collections.deque()
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        offset = 0
+        while offset < size or pending:
+            if should_abort and should_abort():
+                raise CopyAborted()
+            if offset < size:
+                length = min(chunk_size, size - offset)
+                pending.append((pool.submit(func, offset, length), length))
+                offset += length
+            if pending and (offset >= size or len(pending) >= 2 * workers):
+                future, length = pending.popleft()
+                results.append(future.result())
+                done += length
+                if on_progress:
+                    on_progress(done)
+    return results
+
+
+def hash_chunks(fd, size, chunk_size=MANIFEST_CHUNK_SIZE, on_progress=None, should_abort=None, workers=None):
+    """
+    Berechnet die Chunk-Prüfsummen von fd parallel auf allen Kernen.
+    """
+    return map_chunks(
+        lambda offset, length: chunk_digest(os.pread(fd, length, offset)),
+        size, chunk_size, on_progress, should_abort, workers
+    )
+
+
+def delta_copy(src_fd, dst_fd, old_chunks, chunk_size=MANIFEST_CHUNK_SIZE, on_progress=None, should_abort=None,
+               workers=None):
+    """
+    Aktualisiert das Image dst_fd auf den Stand von src_fd und schreibt nur geänderte Chunks.
+
+    Die Quelle wird parallel gelesen und gehasht; jeder Chunk, dessen Prüfsumme von old_chunks
+    abweicht, wird vom selben Thread per pwrite an seine Position geschrieben.
+    Gibt (Größe, geschriebene Bytes, neue Prüfsummen) zurück.
+    """
+    size = os.lseek(src_fd, 0, os.SEEK_END)
+
+    def update(offset, length):
+        data = os.pread(src_fd, length, offset)
+        digest = chunk_digest(data)
+        index = offset // chunk_size
+        if index < len(old_chunks) and old_chunks[index] == digest:
+            return digest, 0
+        pwrite_all(dst_fd, data, offset)
+        return digest, len(data)
+
+    results = map_chunks(update, size, chunk_size, on_progress, should_abort, workers)
+    os.ftruncate(dst_fd, size)
+    return size, sum(written for _, written in results), [digest for digest, _ in results]
+
+
+def delta_path(source, image, on_progress=None, should_abort=None, on_message=None, hasher=None):
+    """
+    Erstellt oder aktualisiert image im Delta-Modus und pflegt das Block-Manifest daneben.
+    Fehlt ein passendes Manifest für ein vorhandenes Image, wird es zuerst aus dem Image berechnet.
+    Mit hasher (ChunkHasher) werden die neuen Prüfsummen der Quelle für die Verifikation übernommen.
+    """
+    src_fd = os.open(source, os.O_RDONLY)
+    try:
+        dst_fd = os.open(image, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            image_size = os.fstat(dst_fd).st_size
+            manifest = load_manifest(image)
+            if manifest and manifest["chunk_size"] == MANIFEST_CHUNK_SIZE and manifest["size"] == image_size:
+                old_chunks = manifest["chunks"]
+            elif image_size:
+                if on_message:
+                    on_message("Kein passendes Manifest gefunden, Prüfsummen des vorhandenen Images werden berechnet...")
+                old_chunks = hash_chunks(dst_fd, image_size, should_abort=should_abort)
+            else:
+                old_chunks = []
+            size, written, chunks = delta_copy(src_fd, dst_fd, old_chunks, MANIFEST_CHUNK_SIZE, on_progress, should_abort)
+            os.fsync(dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    save_manifest(image, size, MANIFEST_CHUNK_SIZE, chunks)
+    if hasher is not None and hasher.chunk_size == MANIFEST_CHUNK_SIZE:
+        hasher.digests = list(chunks)
+    if on_message:
+        on_message(f"Delta: {written / 1024 / 1024:.1f} MiB von {size / 1024 / 1024:.1f} MiB neu geschrieben.")
+    return size
+
+
+def available_compressions():
+    """
+    Gibt die nutzbaren Kompressionsformate zurück (zstd nur mit python-zstandard).
+    """
+    return [fmt for fmt in COMPRESSIONS if fmt != "zstd" or zstandard is not None]
+
+
+def detect_compression(path):
+    """
+    Erkennt das Kompressionsformat einer Image-Datei an den Magic Bytes, None für Roh-Images.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(8)
+    except OSError:
+        return None
+    for fmt, (_, magic) in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return fmt
+    return None
+
+
+def compress_block(fmt, data):
+    """
+    Komprimiert einen Block unabhängig von allen anderen.
+    """
+    if fmt == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if fmt == "xz":
+        return lzma.compress(data, preset=3)
+    if fmt == "indexed":
+        return pack_chunk(indexed_codec(), data)[1]
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def estimate_compressed_size(path, fmt, size=None, samples=16, sample_size=1024 * 1024):
+    """
+    Schätzt die komprimierte Größe von path anhand gleichmäßig verteilter Stichproben.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if size is None:
+            size = os.lseek(fd, 0, os.SEEK_END)
+        if not size:
+            return 0
+        step = max(size // samples, sample_size)
+        read = packed = 0
+        for offset in range(0, size, step):
+            data = os.pread(fd, sample_size, offset)
+            read += len(data)
+            packed += len(compress_block(fmt, data))
+        return int(size * packed / read) if read else size
+    finally:
+        os.close(fd)
+
+
+def compress_copy(src_fd, dst_fd, fmt, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None,
+                  workers=None, on_data=None):
+    """
+    Liest src_fd blockweise und schreibt die Daten komprimiert nach dst_fd. Gibt die gelesenen Bytes zurück.
+
+    zstd nutzt die Multithreading-Unterstützung von python-zstandard. gzip und xz komprimieren
+    unabhängige Blöcke in einem Thread-Pool und schreiben sie in Lesereihenfolge; die
+    aneinandergehängten Members bzw. Streams ergeben wieder eine gültige .gz- bzw. .xz-Datei.
+    """
+    done = 0
+    if fmt == "indexed":
+        return indexed_compress(src_fd, dst_fd, on_progress, should_abort, workers, on_data)
+    if fmt == "zstd":
+        buf = alloc_buffer(block_size)
+        cctx = zstandard.ZstdCompressor(level=3, threads=-1)
+        try:
+            with open(dst_fd, "wb", closefd=False) as raw, cctx.stream_writer(raw, closefd=False) as writer, \
+                    memoryview(buf) as view:
+                while True:
+                    if should_abort and should_abort():
+                        raise CopyAborted()
+                    n = read_full(src_fd, view)
+                    if n == 0:
+                        break
+                    writer.write(view[:n])
+                    if on_data:
+                        on_data(view[:n])
+                    done += n
+                    if on_progress:
+                        on_progress(done)
+        finally:
+            buf.close()
+        return done
+
+    workers = workers or os.cpu_count() or 1
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        eof = False
+        while not eof or pending:
+            if should_abort and should_abort():
+                raise CopyAborted()
+            if not eof:
+                chunk = bytearray(block_size)
+                with memoryview(chunk) as view:
+                    n = read_full(src_fd, view)
+                del chunk[n:]
+                eof = n < block_size
+                if n and on_data:
+                    on_data(chunk)
+                if n:
+                    pending.append((pool.submit(compress_block, fmt, chunk), n))
+            # Ergebnisse in Reihenfolge schreiben, sobald genug Blöcke in Arbeit sind
+            while pending and (eof or len(pending) >= 2 * workers):
+                future, n = pending.popleft()
+                write_all(dst_fd, future.result())
+                done += n
+                if on_progress:
+                    on_progress(done)
+                if not eof:
+                    break
+    return done
+
+
+def open_decompressor(raw, fmt):
+    """
+    Gibt ein Dateiobjekt zurück, das den komprimierten Datenstrom raw entpackt liest.
+    """
+    if fmt == "gzip":
+        return gzip.GzipFile(fileobj=raw)
+    if fmt == "xz":
+        return lzma.LZMAFile(raw)
+    if fmt == "indexed":
+        return IndexedImage(raw)
+    return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=False)
+
+
+def decompress_copy(src_fd, dst_fd, fmt, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None,
+                    on_data=None):
+    """
+    Entpackt das komprimierte Image src_fd während des Kopierens nach dst_fd.
+    on_progress erhält die gelesenen komprimierten Bytes, zurückgegeben werden die geschriebenen Bytes.
+    Indizierte Images werden parallel entpackt (siehe IndexedImage.extract).
+    """
+    if fmt == "indexed":
+        with open(src_fd, "rb", closefd=False) as raw, IndexedImage(raw) as image:
+            return image.extract(dst_fd, on_progress=on_progress and (lambda done: on_progress(image.raw_position(done))),
+                                 should_abort=should_abort, on_data=on_data)
+    written = 0
+    buf = alloc_buffer(block_size)
+    try:
+        with open(src_fd, "rb", closefd=False) as raw:
+            with open_decompressor(raw, fmt) as stream, memoryview(buf) as view:
+                while True:
+                    if should_abort and should_abort():
+                        raise CopyAborted()
+                    n = stream.readinto(view)
+                    if not n:
+                        break
+                    write_all(dst_fd, view[:n])
+                    if on_data:
+                        on_data(view[:n])
+                    written += n
+                    if on_progress:
+                        on_progress(raw.tell())
+    finally:
+        buf.close()
+    return written
+
+
+def journal_path(dest):
+    """
+    Pfad des Checkpoint-Journals für das Ziel dest (Datei oder Gerät).
+    """
+    return os.path.join(JOURNAL_DIR, os.path.abspath(dest).strip("/").replace("/", "_") + ".json")
+
+
+def load_journal(path):
+    """
+    Liest ein Checkpoint-Journal. Gibt None zurück, wenn es fehlt oder nicht passt.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            journal = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if journal.get("format") != JOURNAL_FORMAT or journal.get("chunk_size") != MANIFEST_CHUNK_SIZE:
+        return None
+    return journal
+
+
+def save_journal(path, journal):
+    """
+    Schreibt das Journal (oder eine Rettungs-Map) atomar und dauerhaft (temporäre Datei, fsync, rename).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(journal, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def list_journals():
+    """
+    Gibt alle offenen Checkpoint-Journale zurück (abgebrochene oder unterbrochene Kopien).
+    """
+    try:
+        names = sorted(os.listdir(JOURNAL_DIR))
+    except OSError:
+        return []
+    journals = [load_journal(os.path.join(JOURNAL_DIR, name)) for name in names if name.endswith(".json")]
+    return [journal for journal in journals if journal]
+
+
+def resume_offset(src_fd, dst_fd, journal, on_message=None):
+    """
+    Prüft, ab wo eine Kopie laut journal fortgesetzt werden kann, und gibt den Offset zurück.
+
+    Der letzte Chunk vor dem Checkpoint wird in Quelle und Ziel neu gehasht. Weicht die Quelle ab,
+    hat sie sich geändert und es wird von vorn begonnen. Weicht nur das Ziel ab, wird Chunk für Chunk
+    zurückgegangen, bis Ziel und Journal wieder übereinstimmen.
+    """
+    chunk_size = journal["chunk_size"]
+    chunks = journal["chunks"]
+    index = min(journal["offset"] // chunk_size, len(chunks))
+    if index and chunk_digest(os.pread(src_fd, chunk_size, (index - 1) * chunk_size)) != chunks[index - 1]:
+        if on_message:
+            on_message("Die Quelle hat sich seit dem Checkpoint geändert, die Kopie beginnt von vorn.")
+        return 0
+    while index and chunk_digest(os.pread(dst_fd, chunk_size, (index - 1) * chunk_size)) != chunks[index - 1]:
+        index -= 1
+    return index * chunk_size
+
+
+def checkpoint_path(source, dest, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, strategy="auto",
+                    direct=False, on_message=None, hasher=None, depth=PIPELINE_DEPTH, job=None):
+    """
+    Kopiert source nach dest in Abschnitten von CHECKPOINT_INTERVAL Bytes und führt ein Journal.
+
+    Nach jedem Abschnitt wird das Ziel mit fdatasync geschrieben und im Journal der nun dauerhaft
+    geschriebene Offset samt Chunk-Prüfsummen der Quelle festgehalten. Passt ein vorhandenes Journal
+    zu Quelle und Ziel, wird nach einer Prüfung des letzten Chunks (siehe resume_offset) dort
+    weitergemacht. job (Optionen als dict) wird im Journal gespeichert, damit die Kopie später mit
+    denselben Einstellungen fortgesetzt werden kann. Nach erfolgreichem Abschluss wird das Journal gelöscht.
+    """
+    path = journal_path(dest)
+    hasher = hasher or ChunkHasher()
+    src_fd, src_direct = open_fd(source, os.O_RDONLY, direct)
+    try:
+        dst_fd, dst_direct = open_fd(dest, os.O_RDWR | os.O_CREAT, direct)
+        try:
+            if direct:
+                strategy = "pipeline"
+                if on_message and not (src_direct and dst_direct):
+                    on_message("Hinweis: O_DIRECT wird nicht auf beiden Seiten unterstützt, teilweise über den Page-Cache.")
+            size = os.lseek(src_fd, 0, os.SEEK_END)
+            journal = load_journal(path)
+            pos = 0
+            if journal and journal["source"] == source and journal["size"] == size:
+                pos = resume_offset(src_fd, dst_fd, journal, on_message)
+                if pos and on_message:
+                    on_message(f"Setze beim Checkpoint bei {pos / 1024 / 1024:.0f} MiB fort.")
+            hasher.digests = journal["chunks"][:pos // MANIFEST_CHUNK_SIZE] if pos else []
+            journal = {
+                "format": JOURNAL_FORMAT,
+                "version": 1,
+                "source": source,
+                "dest": dest,
+                "size": size,
+                "chunk_size": MANIFEST_CHUNK_SIZE,
+                "offset": pos,
+                "chunks": hasher.digests,
+                "job": job or {},
+            }
+            save_journal(path, journal)
+            while pos < size:
+                os.lseek(src_fd, pos, os.SEEK_SET)
+                os.lseek(dst_fd, pos, os.SEEK_SET)
+                start = pos
+                copied = copy_data(
+                    src_fd, dst_fd, block_size,
+                    on_progress=(lambda n: on_progress(start + n)) if on_progress else None,
+                    should_abort=should_abort, strategy=strategy, on_data=hasher.update,
+                    length=min(CHECKPOINT_INTERVAL, size - pos), depth=depth
+                )
+                if copied == 0:
+                    break
+                pos += copied
+                os.fdatasync(dst_fd)
+                journal["offset"] = pos
+                journal["chunks"] = hasher.digests
+                save_journal(path, journal)
+            if stat.S_ISREG(os.fstat(dst_fd).st_mode):
+                os.ftruncate(dst_fd, pos)
+            os.fsync(dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    os.remove(path)
+    return pos
+
+
+def rescue_map_path(dest):
+    """
+    Pfad der Map-Datei mit den nicht lesbaren Bereichen für das Ziel dest.
+    """
+    return os.path.join(RESCUE_DIR, os.path.abspath(dest).strip("/").replace("/", "_") + ".json")
+
+
+def load_rescue_map(path):
+    """
+    Liest eine Map-Datei des Rettungsmodus. Gibt None zurück, wenn sie fehlt oder nicht passt.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get("format") == RESCUE_FORMAT else None
+
+
+def add_range(ranges, start, end):
+    """
+    Fügt [start, end) in die sortierte Liste ranges ein und verschmilzt angrenzende Bereiche.
+    """
+    ranges.append([start, end])
+    ranges.sort()
+    merged = [ranges[0]]
+    for current in ranges[1:]:
+        if current[0] <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], current[1])
+        else:
+            merged.append(current)
+    ranges[:] = merged
+
+
+def remove_range(ranges, start, end):
+    """
+    Entfernt [start, end) aus der sortierten Liste ranges (Bereiche werden dabei ggf. geteilt).
+    """
+    result = []
+    for low, high in ranges:
+        if high <= start or low >= end:
+            result.append([low, high])
+            continue
+        if low < start:
+            result.append([low, start])
+        if high > end:
+            result.append([end, high])
+    ranges[:] = result
+
+
+def rescue_read(fd, view, offset):
+    """
+    Liest view ab offset so weit wie möglich. Gibt die Anzahl Bytes zurück, Lesefehler werden weitergereicht.
+    """
+    got = 0
+    while got < len(view):
+        try:
+            n = os.preadv(fd, [view[got:]], offset + got)
+        except OSError as e:
+            # O_DIRECT und ein nicht ausgerichtetes Geräteende: ohne O_DIRECT weiterlesen
+            if e.errno != errno.EINVAL or not is_direct(fd):
+                raise
+            clear_direct(fd)
+            continue
+        if n == 0:
+            break
+        got += n
+    return got
+
+
+def rescue_path(source, dest, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, on_message=None):
+    """
+    Kopiert eine Quelle mit Lesefehlern so vollständig wie möglich, ähnlich wie ddrescue.
+
+    Der erste Durchgang liest vorwärts in großen Blöcken. Nach einem Lesefehler wird ein immer
+    größer werdender Bereich übersprungen (bis RESCUE_MAX_SKIP), damit defekte Zonen nicht bremsen;
+    alles Übersprungene kommt in die Liste der defekten Bereiche. Gesunde Datenträger laufen so
+    ohne Umweg durch. Die folgenden Durchgänge (RESCUE_PASSES) lesen nur noch die defekten Bereiche
+    mit kleiner werdenden Blöcken bis hinunter zur Sektorgröße, abwechselnd rückwärts und vorwärts.
+    Nicht lesbare Bereiche bleiben im Ziel unverändert. Die Map-Datei (siehe rescue_map_path) hält
+    Fortschritt und defekte Bereiche fest; ein erneuter Aufruf macht dort weiter.
+    Gibt (Größe, nicht lesbare Bytes) zurück.
+    """
+    map_path = rescue_map_path(dest)
+    device = device_inventory().find(source)
+    sector = max(device.logical_block_size if device else 512, 512)
+    src_fd, _ = open_fd(source, os.O_RDONLY, direct=True)
+    try:
+        dst_fd = os.open(dest, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            size = os.lseek(src_fd, 0, os.SEEK_END)
+            state = load_rescue_map(map_path)
+            if not (state and state["source"] == source and state["size"] == size):
+                state = {"format": RESCUE_FORMAT, "version": 1, "source": source, "dest": dest, "size": size,
+                         "pos": 0, "passes_done": 0, "bad": []}
+            else:
+                if state["pos"] >= size and state["passes_done"] >= len(RESCUE_PASSES):
+                    state["passes_done"] = 0  # abgeschlossene Rettung: defekte Bereiche noch einmal versuchen
+                if on_message:
+                    on_message(f"Map-Datei gefunden, setze bei {state['pos'] / 1024 / 1024:.0f} MiB fort "
+                               f"({len(state['bad'])} defekte Bereiche bekannt).")
+            bad = state["bad"]
+            buf = alloc_buffer(max(block_size, RESCUE_PASSES[0][0]))
+            last_save = time.monotonic()
+
+            def checkpoint(force=False):
+                nonlocal last_save
+                if force or time.monotonic() - last_save > 5:
+                    os.fdatasync(dst_fd)
+                    save_journal(map_path, state)
+                    last_save = time.monotonic()
+
+            def copy_block(view, pos):
+                """
+                Liest und schreibt einen Block, gibt False bei einem Lesefehler zurück.
+                """
+                try:
+                    n = rescue_read(src_fd, view, pos)
+                except OSError as e:
+                    if e.errno not in _READ_ERRNOS:
+                        raise
+                    return False
+                pwrite_all(dst_fd, view[:n], pos)
+                return True
+
+            try:
+                with memoryview(buf) as view:
+                    # Durchgang 1: vorwärts, große Blöcke, nach Fehlern wachsend überspringen
+                    pos = state["pos"]
+                    skip = block_size
+                    while pos < size:
+                        if should_abort and should_abort():
+                            raise CopyAborted()
+                        length = min(block_size, size - pos)
+                        if copy_block(view[:length], pos):
+                            pos += length
+                            skip = block_size
+                        else:
+                            end = min(size, pos + max(length, skip))
+                            add_range(bad, pos, end)
+                            pos = end
+                            skip = min(skip * 2, RESCUE_MAX_SKIP)
+                        state["pos"] = pos
+                        if on_progress:
+                            on_progress(pos)
+                        checkpoint()
+                    checkpoint(True)
+
+                    # Weitere Durchgänge: nur die defekten Bereiche, kleinere Blöcke, wechselnde Richtung
+                    for number, (piece, reverse) in enumerate(RESCUE_PASSES, 2):
+                        if not bad:
+                            break
+                        if number - 2 < state["passes_done"]:
+                            continue
+                        piece = piece or sector
+                        if on_message:
+                            on_message(
+                                f"Durchgang {number} ({'rückwärts' if reverse else 'vorwärts'}, {format_size(piece)}): "
+                                f"{len(bad)} Bereiche, {sum(end - start for start, end in bad) / 1024 / 1024:.1f} MiB"
+                            )
+                        for start, end in list(reversed(bad) if reverse else bad):
+                            offsets = range(start, end, piece)
+                            for offset in (reversed(offsets) if reverse else offsets):
+                                if should_abort and should_abort():
+                                    raise CopyAborted()
+                                length = min(piece, end - offset)
+                                if copy_block(view[:length], offset):
+                                    remove_range(bad, offset, offset + length)
+                                checkpoint()
+                        state["passes_done"] = number - 1
+                        checkpoint(True)
+            finally:
+                buf.close()
+            if stat.S_ISREG(os.fstat(dst_fd).st_mode) and os.fstat(dst_fd).st_size < size:
+                os.ftruncate(dst_fd, size)
+            os.fsync(dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    unreadable = sum(end - start for start, end in bad)
+    if bad:
+        save_journal(map_path, state)
+        if on_message:
+            on_message(f"{unreadable / 1024 / 1024:.1f} MiB in {len(bad)} Bereichen nicht lesbar, siehe {map_path}.")
+    else:
+        os.remove(map_path)
+        if on_message:
+            on_message("Alle Bereiche gelesen.")
+    return size, unreadable
+
+
+def copy_path(source, dest, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, strategy="auto",
+              direct=False, sparse=False, compress=None, decompress=None, delta=False, on_message=None, hasher=None,
+              depth=PIPELINE_DEPTH, checkpoint=False, job=None, rescue=False, net_compress=None):
+    """
+    Öffnet Quelle und Ziel (Datei oder Blockgerät), kopiert alles und schreibt die Daten auf das Medium.
+    Mit direct=True werden beide Seiten mit O_DIRECT geöffnet und über die Pipeline kopiert.
+    Mit sparse=True werden leere Blöcke als Lücken angelegt, wenn das Ziel eine reguläre Datei ist.
+    compress bzw. decompress geben das Format an, mit dem das Ziel gepackt bzw. die Quelle entpackt wird.
+    Mit delta=True wird ein vorhandenes Image nur an geänderten Chunks überschrieben (siehe delta_path).
+    Mit hasher (ChunkHasher) werden die Prüfsummen der (entpackten) Quelldaten beim Kopieren mitberechnet,
+    sodass verify_path danach nur noch das Ziel lesen muss. depth ist die Anzahl Puffer der Pipeline.
+    Mit checkpoint=True ist eine Rohkopie fortsetzbar (siehe checkpoint_path).
+    Mit rescue=True werden Lesefehler übersprungen und später erneut versucht (siehe rescue_path).
+    Ist Quelle oder Ziel ein Netzwerkpfad (pkdd://...), wird gestreamt, Chunks ggf. mit net_compress gepackt.
+    """
+    if is_remote(dest):
+        return send_path(source, dest, block_size, on_progress, should_abort, net_compress,
+                         hasher.update if hasher else None)
+    if is_remote(source):
+        return receive_path(source, dest, block_size, on_progress, should_abort, net_compress,
+                            hasher.update if hasher else None)
+    if rescue:
+        return rescue_path(source, dest, block_size, on_progress, should_abort, on_message)[0]
+    if delta:
+        return delta_path(source, dest, on_progress, should_abort, on_message, hasher)
+    if checkpoint:
+        if not (sparse or compress or decompress):
+            return checkpoint_path(source, dest, block_size, on_progress, should_abort, strategy, direct, on_message,
+                                   hasher, depth, job)
+        if on_message:
+            on_message("Hinweis: Sparse- und komprimierte Kopien sind nicht fortsetzbar, es wird kein Journal geführt.")
+    on_data = hasher.update if hasher else None
+    if sparse or compress or decompress:
+        direct = False
+    src_fd, src_direct = open_fd(source, os.O_RDONLY, direct)
+    try:
+        dst_fd, dst_direct = open_fd(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, direct)
+        try:
+            if direct:
+                strategy = "pipeline"
+                if on_message and not (src_direct and dst_direct):
+                    on_message("Hinweis: O_DIRECT wird nicht auf beiden Seiten unterstützt, teilweise über den Page-Cache.")
+            if compress or decompress:
+                if compress:
+                    copied = compress_copy(src_fd, dst_fd, compress, block_size, on_progress, should_abort,
+                                           on_data=on_data)
+                else:
+                    copied = decompress_copy(src_fd, dst_fd, decompress, block_size, on_progress, should_abort,
+                                             on_data=on_data)
+                os.fsync(dst_fd)
+                return copied
+            if sparse and stat.S_ISREG(os.fstat(dst_fd).st_mode):
+                copied, skipped = sparse_copy(src_fd, dst_fd, block_size, on_progress, should_abort, on_data)
+                os.fsync(dst_fd)
+                if on_message:
+                    on_message(f"{skipped / 1024 / 1024:.1f} MiB leere Blöcke übersprungen.")
+                return copied
+            if sparse and on_message:
+                on_message("Hinweis: Das Ziel ist keine Datei, leere Blöcke werden normal geschrieben.")
+            copied = copy_data(src_fd, dst_fd, block_size, on_progress, should_abort, strategy, on_data, depth=depth)
+            os.fsync(dst_fd)
+            return copied
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def hash_stream(path, length, chunk_size=MANIFEST_CHUNK_SIZE, fmt=None, should_abort=None):
+    """
+    Liest die ersten length Bytes von path (entpackt, falls fmt gesetzt ist) und liefert die Chunk-Prüfsummen.
+
+    Unkomprimierte Daten werden mit O_DIRECT in einen ausgerichteten Puffer gelesen, damit vom
+    Medium und nicht aus dem Page-Cache verglichen wird. Endet path vor length, wird früher aufgehört.
+    """
+    buf = alloc_buffer(chunk_size)
+    try:
+        with memoryview(buf) as view:
+            if fmt:
+                raw = open(path, "rb")
+                stream = open_decompressor(raw, fmt)
+                fd = None
+            else:
+                fd, _ = open_fd(path, os.O_RDONLY, direct=True)
+            try:
+                pos = 0
+                while pos < length:
+                    if should_abort and should_abort():
+                        raise CopyAborted()
+                    if fd is None:
+                        n = 0
+                        while n < chunk_size:
+                            got = stream.readinto(view[n:])
+                            if not got:
+                                break
+                            n += got
+                    else:
+                        n = read_full(fd, view)
+                    n = min(n, length - pos)
+                    if n == 0:
+                        return
+                    yield chunk_digest(view[:n])
+                    pos += n
+            finally:
+                if fd is None:
+                    stream.close()
+                    raw.close()
+                else:
+                    os.close(fd)
+    finally:
+        buf.close()
+
+
+def verify_path(source, dest, length, source_digests=None, source_format=None, dest_format=None,
+                chunk_size=MANIFEST_CHUNK_SIZE, on_progress=None, should_abort=None):
+    """
+    Vergleicht die ersten length Bytes von source und dest chunkweise über Prüfsummen.
+
+    Quelle und Ziel werden gleichzeitig in je einem Thread gelesen und gehasht; verglichen wird,
+    sobald beide Prüfsummen eines Chunks vorliegen, und beim ersten Unterschied wird aufgehört.
+    Wurden source_digests schon beim Kopieren berechnet (ChunkHasher), wird nur noch das Ziel gelesen.
+    source_format bzw. dest_format geben an, ob eine Seite ein komprimiertes Image ist.
+    Gibt den Offset des ersten abweichenden Chunks zurück oder None, wenn alles übereinstimmt.
+    """
+    stop = threading.Event()
+    digests = queue.Queue()
+    thread = None
+
+    def aborted():
+        return stop.is_set() or bool(should_abort and should_abort())
+
+    def hash_source():
+        try:
+            for digest in hash_stream(source, length, chunk_size, source_format, aborted):
+                digests.put(digest)
+            digests.put(None)
+        except Exception as e:
+            digests.put(e)
+
+    if source_digests is None:
+        thread = io_thread(hash_source, name="pkddgui-verify")
+        thread.start()
+    try:
+        index = 0
+        for digest in hash_stream(dest, length, chunk_size, dest_format, should_abort):
+            if source_digests is None:
+                expected = digests.get()
+                if isinstance(expected, Exception):
+                    raise expected
+            else:
+                expected = source_digests[index] if index < len(source_digests) else None
+            if digest != expected:
+                return index * chunk_size
+            index += 1
+            if on_progress:
+                on_progress(min(length, index * chunk_size))
+        if index * chunk_size < length:
+            return index * chunk_size  # Ziel ist kürzer als die kopierten Daten
+        return None
+    finally:
+        stop.set()
+        if thread is not None:
+            thread.join()
+
+
+def format_rate(size, seconds):
+    """
+    Formatiert einen Durchsatz in MB/s für Statusmeldungen.
+    """
+    return f"{size / seconds / 1e6:.1f} MB/s" if seconds > 0 else "- MB/s"
+
+
+# Fortschrittsmeldung: Bytes, Gesamtgröße (oder None), aktueller und mittlerer Durchsatz in Bytes/s,
+# geschätzte Restzeit in Sekunden (oder None) und die Phase ("Kopieren", "Verifizieren", ...)
+ProgressInfo = collections.namedtuple("ProgressInfo", "done total rate average eta phase")
+
+
+class ProgressTracker:
+    """
+    Verdichtet die Byte-Zähler der Kopierfunktionen zu ProgressInfo-Meldungen.
+    update kann als on_progress dienen und ruft emit höchstens alle interval Sekunden auf,
+    egal wie klein die Blöcke sind; finish meldet immer den Endstand.
+    """
+    def __init__(self, total, emit, phase="Kopieren", interval=PROGRESS_INTERVAL):
+        self.total = total
+        self.emit = emit
+        self.phase = phase
+        self.interval = interval
+        self.start = self._last_time = time.monotonic()
+        self._last_done = 0
+        self.done = 0
+
+    def update(self, done):
+        """
+        Merkt sich den neuen Stand und meldet ihn, wenn seit der letzten Meldung genug Zeit vergangen ist.
+        """
+        self.done = done
+        now = time.monotonic()
+        if now - self._last_time >= self.interval:
+            self._report(now)
+
+    def finish(self):
+        """
+        Meldet den letzten Stand unabhängig vom Intervall.
+        """
+        self._report(time.monotonic())
+
+    def _report(self, now):
+        elapsed = now - self.start
+        step = now - self._last_time
+        rate = (self.done - self._last_done) / step if step > 0 else 0
+        average = self.done / elapsed if elapsed > 0 else 0
+        eta = None
+        if self.total and average > 0:
+            eta = max(0, self.total - self.done) / average
+        self._last_time = now
+        self._last_done = self.done
+        self.emit(ProgressInfo(self.done, self.total, rate, average, eta, self.phase))
+
+
+def format_progress(info):
+    """
+    Formatiert eine ProgressInfo als kurze Statuszeile.
+    """
+    text = f"{info.phase}: {info.done / 1024 / 1024:.0f} MiB"
+    if info.total:
+        text += f" von {info.total / 1024 / 1024:.0f} MiB"
+    text += f" – aktuell {info.rate / 1e6:.1f} MB/s, Schnitt {info.average / 1e6:.1f} MB/s"
+    if info.eta is not None:
+        minutes, seconds = divmod(int(info.eta), 60)
+        text += f", Rest {minutes // 60}:{minutes % 60:02d}:{seconds:02d}"
+    return text
+
+
+# -------------------------------------------------------------------
+#Indiziertes Image-Format mit wahlfreiem Zugriff
+#
+# Aufbau: Kopf (INDEXED_HEADER), unabhängig komprimierte Chunks zu je INDEXED_CHUNK_SIZE Bytes,
+# dahinter der Index (je Chunk INDEXED_ENTRY: Position, Länge, Flags, BLAKE2b-256 der Rohdaten) und
+# zuletzt der Abschluss (INDEXED_FOOTER) mit Position des Index, Rohgröße und Anzahl Chunks. Jeder
+# Bytebereich lässt sich so lesen, ohne die Chunks davor zu entpacken.
+INDEXED_MAGIC = b"PKDDIMG1"
+INDEXED_FOOTER_MAGIC = b"PKDDIDX1"
+INDEXED_VERSION = 1
+INDEXED_CHUNK_SIZE = MANIFEST_CHUNK_SIZE
+INDEXED_HEADER = struct.Struct("!8sBBxxI")
+INDEXED_ENTRY = struct.Struct("!QIB32s")
+INDEXED_FOOTER = struct.Struct("!QQQ8s")
+INDEXED_CODECS = {1: "zlib", 2: "zstd"}
+INDEXED_FLAG_STORED = 1  # unkomprimiert abgelegt (Kompression hätte nichts gebracht)
+INDEXED_FLAG_ZERO = 2  # nur Nullen, nicht gespeichert
+# Entpackte Chunks, die ein IndexedImage für benachbarte Lesezugriffe behält
+INDEXED_CACHE_CHUNKS = 4
+
+
+def indexed_codec():
+    """
+    Codec für neue indizierte Images: zstd, wenn python-zstandard da ist, sonst zlib.
+    """
+    return "zstd" if zstandard else "zlib"
+
+
+def pack_chunk(codec, data):
+    """
+    Komprimiert einen Chunk des indizierten Formats. Gibt (Flags, Nutzdaten, Prüfsumme) zurück.
+    """
+    digest = hashlib.blake2b(data, digest_size=32).digest()
+    if is_zero_block(data, len(data)):
+        return INDEXED_FLAG_ZERO, b"", digest
+    packed = zstandard.ZstdCompressor(level=3).compress(data) if codec == "zstd" else zlib.compress(data, 6)
+    if len(packed) < len(data):
+        return 0, packed, digest
+    return INDEXED_FLAG_STORED, bytes(data), digest
+
+
+def indexed_compress(src_fd, dst_fd, on_progress=None, should_abort=None, workers=None, on_data=None):
+    """
+    Schreibt src_fd als indiziertes Image nach dst_fd. Die Chunks werden im Thread-Pool komprimiert
+    und in Lesereihenfolge geschrieben, der Index folgt am Ende. Gibt die gelesenen Bytes zurück.
+    """
+    codec = indexed_codec()
+    codec_id = next(key for key, name in INDEXED_CODECS.items() if name == codec)
+    write_all(dst_fd, INDEXED_HEADER.pack(INDEXED_MAGIC, INDEXED_VERSION, codec_id, INDEXED_CHUNK_SIZE))
+    pos = INDEXED_HEADER.size
+    entries = []
+    done = 0
+    workers = workers or os.cpu_count() or 1
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        eof = False
+        while not eof or pending:
+            if should_abort and should_abort():
+                raise CopyAborted()
+            if not eof:
+                chunk = bytearray(INDEXED_CHUNK_SIZE)
+                with memoryview(chunk) as view:
+                    n = read_full(src_fd, view)
+                del chunk[n:]
+                eof = n < INDEXED_CHUNK_SIZE
+                if n and on_data:
+                    on_data(chunk)
+                if n:
+                    pending.append((pool.submit(pack_chunk, codec, chunk), n))
+            while pending and (eof or len(pending) >= 2 * workers):
+                future, n = pending.popleft()
+                flags, payload, digest = future.result()
+                write_all(dst_fd, payload)
+                entries.append(INDEXED_ENTRY.pack(pos, len(payload), flags, digest))
+                pos += len(payload)
+                done += n
+                if on_progress:
+                    on_progress(done)
+                if not eof:
+                    break
+    write_all(dst_fd, b"".join(entries))
+    write_all(dst_fd, INDEXED_FOOTER.pack(pos, done, len(entries), INDEXED_FOOTER_MAGIC))
+    return done
+
+
+class IndexedImage(io.RawIOBase):
+    """
+    Liest ein indiziertes Image (siehe indexed_compress) wie eine Datei mit den Rohdaten:
+    read/readinto/seek für sequentielles Lesen, pread(length, offset) für beliebige Bereiche.
+    raw ist ein Pfad oder eine geöffnete Binärdatei (die dann nicht mitgeschlossen wird).
+    Jeder entpackte Chunk wird gegen seine Prüfsumme geprüft.
+    """
+    def __init__(self, raw):
+        super().__init__()
+        self._owned = isinstance(raw, str)
+        self.raw = open(raw, "rb") if self._owned else raw
+        try:
+            fd = self.raw.fileno()
+            magic, version, codec_id, self.chunk_size = INDEXED_HEADER.unpack(os.pread(fd, INDEXED_HEADER.size, 0))
+            if magic != INDEXED_MAGIC or version != INDEXED_VERSION or codec_id not in INDEXED_CODECS:
+                raise ValueError("Kein indiziertes Image oder unbekannte Version.")
+            self.codec = INDEXED_CODECS[codec_id]
+            if self.codec == "zstd" and zstandard is None:
+                raise ValueError("Dieses Image ist mit zstd komprimiert und benötigt python-zstandard.")
+            end = os.fstat(fd).st_size
+            footer = os.pread(fd, INDEXED_FOOTER.size, end - INDEXED_FOOTER.size)
+            index_offset, self.size, count, magic = INDEXED_FOOTER.unpack(footer)
+            if magic != INDEXED_FOOTER_MAGIC:
+                raise ValueError("Index fehlt, das Image ist unvollständig.")
+            index = os.pread(fd, count * INDEXED_ENTRY.size, index_offset)
+            self.entries = list(INDEXED_ENTRY.iter_unpack(index))
+        except (struct.error, OSError, ValueError) as e:
+            if self._owned:
+                self.raw.close()
+            if isinstance(e, struct.error):
+                raise ValueError("Das indizierte Image ist unvollständig.") from e
+            raise
+        self._fd = fd
+        self._pos = 0
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._pos, os.SEEK_END: self.size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, b):
+        data = self.pread(len(b), self._pos)
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self):
+        if self._owned and not self.closed:
+            self.raw.close()
+        super().close()
+
+    def chunk_length(self, index):
+        """
+        Rohlänge des Chunks index (nur der letzte kann kürzer sein).
+        """
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def raw_position(self, done):
+        """
+        Position im Image-File, bis zu der gelesen werden muss, um die ersten done Rohbytes zu erhalten.
+        """
+        if done <= 0 or not self.entries:
+            return INDEXED_HEADER.size
+        offset, length, _, _ = self.entries[min((done - 1) // self.chunk_size, len(self.entries) - 1)]
+        return offset + length
+
+    def decode(self, index):
+        """
+        Liest und entpackt den Chunk index (threadsicher, ohne Cache).
+        """
+        offset, length, flags, digest = self.entries[index]
+        size = self.chunk_length(index)
+        if flags & INDEXED_FLAG_ZERO:
+            data = bytes(size)
+        else:
+            data = os.pread(self._fd, length, offset)
+            if not flags & INDEXED_FLAG_STORED:
+                try:
+                    if self.codec == "zstd":
+                        data = zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+                    else:
+                        data = zlib.decompress(data)
+                except (zlib.error, getattr(zstandard, "ZstdError", zlib.error)):
+                    data = b""
+        if len(data) != size or hashlib.blake2b(data, digest_size=32).digest() != digest:
+            raise OSError(errno.EBADMSG, f"Chunk {index} (ab Byte {index * self.chunk_size}) ist beschädigt.")
+        return data
+
+    def chunk(self, index):
+        """
+        Wie decode, behält aber die zuletzt gelesenen Chunks.
+        """
+        with self._lock:
+            data = self._cache.get(index)
+            if data is not None:
+                self._cache.move_to_end(index)
+                return data
+        data = self.decode(index)
+        with self._lock:
+            self._cache[index] = data
+            while len(self._cache) > INDEXED_CACHE_CHUNKS:
+                self._cache.popitem(last=False)
+        return data
+
+    def pread(self, length, offset):
+        """
+        Liest length Rohbytes ab offset; entpackt werden nur die betroffenen Chunks.
+        """
+        length = max(0, min(length, self.size - offset))
+        parts = []
+        while length > 0:
+            index, start = divmod(offset, self.chunk_size)
+            data = self.chunk(index)[start:start + length]
+            parts.append(data)
+            offset += len(data)
+            length -= len(data)
+        return b"".join(parts)
+
+    def extract(self, dst_fd, offset=0, length=None, on_progress=None, should_abort=None, on_data=None, workers=None):
+        """
+        Schreibt length Rohbytes ab offset nach dst_fd (Standard: alles ab offset). Die benötigten
+        Chunks werden im Thread-Pool entpackt und in Reihenfolge geschrieben. Gibt die Bytes zurück.
+        """
+        end = self.size if length is None else min(self.size, offset + length)
+        if offset >= end:
+            return 0
+        first, last = offset // self.chunk_size, (end - 1) // self.chunk_size
+        workers = workers or os.cpu_count() or 1
+        pending = collections.deque()
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for index in range(first, last + 1):
+                if should_abort and should_abort():
+                    raise CopyAborted()
+                pending.append((index, pool.submit(self.decode, index)))
+                while pending and (index == last or len(pending) >= 2 * workers):
+                    current, future = pending.popleft()
+                    data = future.result()
+                    start = offset - current * self.chunk_size if current == first else 0
+                    stop = end - current * self.chunk_size if current == last else len(data)
+                    with memoryview(data) as view:
+                        write_all(dst_fd, view[start:stop])
+                        if on_data:
+                            on_data(view[start:stop])
+                    done += stop - start
+                    if on_progress:
+                        on_progress(done)
+                    if index != last:
+                        break
+        return done
+
+
+def extract_range(image, dest, offset=0, length=None, on_progress=None, should_abort=None):
+    """
+    Kopiert einen Bytebereich aus einem Image (indiziert oder roh) nach dest, z. B. eine Partition
+    (siehe image_partitions). Gibt die geschriebenen Bytes zurück.
+    """
+    fmt = detect_compression(image)
+    if fmt not in (None, "indexed"):
+        raise ValueError(f"{image}: {fmt}-Images erlauben keinen wahlfreien Zugriff, nur indizierte Images.")
+    dst_fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if fmt == "indexed":
+            with IndexedImage(image) as reader:
+                done = reader.extract(dst_fd, offset, length, on_progress, should_abort)
+        else:
+            src_fd = os.open(image, os.O_RDONLY)
+            try:
+                os.lseek(src_fd, offset, os.SEEK_SET)
+                size = os.lseek(src_fd, 0, os.SEEK_END) - offset if length is None else length
+                os.lseek(src_fd, offset, os.SEEK_SET)
+                done = copy_data(src_fd, dst_fd, DEFAULT_BLOCK_SIZE, on_progress, should_abort, "readinto",
+                                 length=size)
+            finally:
+                os.close(src_fd)
+        os.fsync(dst_fd)
+    finally:
+        os.close(dst_fd)
+    return done
+
+
+def image_partitions(image):
+    """
+    Liest die Partitionstabelle (GPT oder MBR, nur primäre Partitionen) eines Images (indiziert oder roh).
+    Gibt eine Liste von (Nummer, Start in Bytes, Größe in Bytes, Name bzw. Typ) zurück.
+    """
+    if detect_compression(image) == "indexed":
+        with IndexedImage(image) as reader:
+            return read_partition_table(reader.pread)
+    fd = os.open(image, os.O_RDONLY)
+    try:
+        return read_partition_table(lambda length, offset: os.pread(fd, length, offset))
+    finally:
+        os.close(fd)
+
+
+def read_partition_table(pread):
+    """
+    Wertet GPT (Sektorgröße 512 oder 4096) bzw. MBR aus; pread(length, offset) liest aus dem Image.
+    """
+    for sector in (512, 4096):
+        header = pread(92, sector)
+        if header[:8] != b"EFI PART":
+            continue
+        entries_lba, count, entry_size = struct.unpack_from("<QII", header, 72)
+        table = pread(count * entry_size, entries_lba * sector)
+        partitions = []
+        for number in range(count):
+            entry = table[number * entry_size:(number + 1) * entry_size]
+            if len(entry) < 128 or entry[:16] == bytes(16):
+                continue
+            first, last = struct.unpack_from("<QQ", entry, 32)
+            name = entry[56:128].decode("utf-16-le", "replace").rstrip("\x00")
+            partitions.append((number + 1, first * sector, (last - first + 1) * sector, name))
+        return partitions
+    mbr = pread(512, 0)
+    if len(mbr) < 512 or mbr[510:512] != b"\x55\xaa":
+        return []
+    partitions = []
+    for number in range(4):
+        ptype, start, sectors = struct.unpack_from("<B3xII", mbr, 446 + number * 16 + 4)
+        if ptype and sectors:
+            partitions.append((number + 1, start * 512, sectors * 512, f"Typ 0x{ptype:02x}"))
+    return partitions
+
+
+# -------------------------------------------------------------------
+#Netzwerk: Images zu einem Empfänger streamen und von dort lesen
+#
+# Protokoll über TCP: Der Client schickt eine Anfrage (4 Byte Länge + JSON mit op "put", "get" oder
+# "stat"), der Empfänger antwortet ebenso. Danach folgen Chunks: Kopf NET_CHUNK (Offset, Länge der
+# Daten, Länge der Nutzlast, Flags, BLAKE2b-256 der unkomprimierten Daten) und die Nutzlast, die je
+# Chunk komprimiert sein kann. Ein Kopf mit Länge 0 beendet den Datenstrom; bei "put" bestätigt der
+# Empfänger danach, dass alles auf dem Medium ist. Ist beim Empfänger ein Token gesetzt, muss die
+# Anfrage es im Feld "token" mitschicken (Client: Umgebungsvariable PKDD_TOKEN).
+NET_SCHEME = "pkdd://"
+NET_PORT = 7650
+NET_PROTOCOL = "pkddgui"
+NET_VERSION = 1
+NET_CHUNK = struct.Struct("!QIIB32s")
+NET_FLAG_COMPRESSED = 1
+NET_MAX_CHUNK = 64 * 1024 * 1024
+NET_MAX_MESSAGE = 64 * 1024
+NET_CONNECT_TIMEOUT = 10
+NET_TIMEOUT = 300
+# Der Empfänger lauscht ohne ausdrückliche Adresse nur lokal; gemeinsames Token (Umgebungsvariable) für Client und Empfänger
+NET_DEFAULT_HOST = "127.0.0.1"
+NET_TOKEN_ENV = "PKDD_TOKEN"
+
+
+def net_compressions():
+    """
+    Gibt die Formate zurück, mit denen Chunks komprimiert übertragen werden können.
+    """
+    return ["zstd", "zlib"] if zstandard else ["zlib"]
+
+
+def is_remote(path):
+    """
+    True für Netzwerkpfade der Form pkdd://host[:port]/pfad.
+    """
+    return isinstance(path, str) and path.startswith(NET_SCHEME)
+
+
+def parse_remote(url):
+    """
+    Zerlegt pkdd://host[:port]/pfad in (host, port, pfad); der Pfad ist relativ zum Verzeichnis des Empfängers.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if not parts.hostname or not parts.path.strip("/"):
+        raise ValueError(f"Ungültiger Netzwerkpfad (erwartet {NET_SCHEME}host[:port]/pfad): {url}")
+    return parts.hostname, parts.port or NET_PORT, parts.path.lstrip("/")
+
+
+def recv_exact(sock, size):
+    """
+    Empfängt genau size Bytes; bricht die Verbindung vorher ab, wird ConnectionError ausgelöst.
+    """
+    buf = bytearray(size)
+    with memoryview(buf) as view:
+        got = 0
+        while got < size:
+            n = sock.recv_into(view[got:])
+            if n == 0:
+                raise ConnectionError("Verbindung vorzeitig geschlossen.")
+            got += n
+    return buf
+
+
+def send_message(sock, message):
+    """
+    Schickt eine Steuernachricht (JSON mit vorangestellter Länge).
+    """
+    data = json.dumps(message).encode("utf-8")
+    sock.sendall(struct.pack("!I", len(data)) + data)
+
+
+def recv_message(sock):
+    """
+    Empfängt eine Steuernachricht (siehe send_message).
+    """
+    size, = struct.unpack("!I", recv_exact(sock, 4))
+    if size > NET_MAX_MESSAGE:
+        raise ConnectionError(f"Steuernachricht zu groß ({size} Bytes), falsches Protokoll?")
+    return json.loads(recv_exact(sock, size))
+
+
+def encode_chunk(data, compress):
+    """
+    Berechnet die Prüfsumme eines Chunks und komprimiert ihn, wenn er dadurch kleiner wird.
+    Gibt (Flags, Nutzlast, Prüfsumme) zurück.
+    """
+    digest = hashlib.blake2b(data, digest_size=32).digest()
+    if compress:
+        packed = zlib.compress(data, 1) if compress == "zlib" else zstandard.ZstdCompressor(level=1).compress(data)
+        if len(packed) < len(data):
+            return NET_FLAG_COMPRESSED, packed, digest
+    return 0, data, digest
+
+
+def decode_chunk(offset, flags, payload, size, digest, compress):
+    """
+    Entpackt einen empfangenen Chunk und prüft Länge und Prüfsumme.
+    """
+    data = payload
+    if flags & NET_FLAG_COMPRESSED:
+        if compress == "zlib":
+            data = zlib.decompress(payload)
+        elif compress == "zstd" and zstandard:
+            data = zstandard.ZstdDecompressor().decompress(payload, max_output_size=size)
+        else:
+            raise OSError(errno.EBADMSG, f"Chunk bei Byte {offset} ist unbekannt komprimiert.")
+    if len(data) != size or hashlib.blake2b(data, digest_size=32).digest() != digest:
+        raise OSError(errno.EBADMSG, f"Prüfsumme des Chunks bei Byte {offset} stimmt nicht.")
+    return data
+
+
+def _drain(items, thread):
+    # Lässt einen Thread, der in eine volle Queue schreiben will, zu Ende laufen
+    while thread.is_alive():
+        try:
+            items.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    thread.join()
+
+
+def send_chunks(src_fd, sock, block_size=DEFAULT_BLOCK_SIZE, compress=None, on_progress=None, should_abort=None,
+                on_data=None, workers=None):
+    """
+    Liest src_fd bis zum Ende und schickt die Daten als Chunks über sock. Gibt die gesendeten Bytes zurück.
+
+    Lesen, Prüfsummen/Kompression (Thread-Pool) und Senden laufen gleichzeitig; höchstens
+    2 * workers Chunks sind unterwegs, gesendet wird in Lesereihenfolge. Meldet sich die Gegenseite
+    währenddessen (Fehlermeldung oder Verbindungsende), wird mit ConnectionError abgebrochen.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = queue.Queue(maxsize=2 * workers)
+    stop = threading.Event()
+    errors = []
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def reader():
+            offset = 0
+            try:
+                while not stop.is_set():
+                    chunk = bytearray(block_size)
+                    with memoryview(chunk) as view:
+                        n = read_full(src_fd, view)
+                    del chunk[n:]
+                    if n == 0:
+                        break
+                    if on_data:
+                        on_data(chunk)
+                    items.put((offset, n, pool.submit(encode_chunk, chunk, compress)))
+                    offset += n
+                    if n < block_size:
+                        break
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                items.put(None)
+
+        thread = io_thread(reader)
+        thread.start()
+        try:
+            while True:
+                if should_abort and should_abort():
+                    raise CopyAborted()
+                item = items.get()
+                if item is None:
+                    break
+                offset, n, future = item
+                flags, payload, digest = future.result()
+                if select.select([sock], [], [], 0)[0]:
+                    raise ConnectionError("Die Gegenseite hat die Übertragung abgebrochen.")
+                sock.sendall(NET_CHUNK.pack(offset, n, len(payload), flags, digest))
+                sock.sendall(payload)
+                done += n
+                if on_progress:
+                    on_progress(done)
+            if errors:
+                raise errors[0]
+            sock.sendall(NET_CHUNK.pack(done, 0, 0, 0, bytes(32)))
+        finally:
+            stop.set()
+            _drain(items, thread)
+    return done
+
+
+def receive_chunks(sock, dst_fd, compress=None, on_progress=None, should_abort=None, on_data=None, workers=None):
+    """
+    Empfängt Chunks (siehe send_chunks) und schreibt sie nach dst_fd. Gibt die geschriebenen Bytes zurück.
+    Entpacken und Prüfen laufen im Thread-Pool, während der nächste Chunk empfangen wird.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = queue.Queue(maxsize=2 * workers)
+    stop = threading.Event()
+    errors = []
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def receiver():
+            try:
+                while not stop.is_set():
+                    offset, size, length, flags, digest = NET_CHUNK.unpack(recv_exact(sock, NET_CHUNK.size))
+                    if size == 0:
+                        break
+                    if size > NET_MAX_CHUNK or length > NET_MAX_CHUNK:
+                        raise ConnectionError(f"Chunk zu groß ({size} Bytes), falsches Protokoll?")
+                    payload = recv_exact(sock, length)
+                    items.put((offset, pool.submit(decode_chunk, offset, flags, payload, size, digest, compress)))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                items.put(None)
+
+        thread = io_thread(receiver)
+        thread.start()
+        try:
+            while True:
+                if should_abort and should_abort():
+                    raise CopyAborted()
+                item = items.get()
+                if item is None:
+                    break
+                offset, future = item
+                data = future.result()
+                if offset != done:
+                    raise ConnectionError(f"Chunk bei Byte {offset} erwartet bei Byte {done}.")
+                with memoryview(data) as view:
+                    write_all(dst_fd, view)
+                if on_data:
+                    on_data(data)
+                done += len(data)
+                if on_progress:
+                    on_progress(done)
+            if errors:
+                raise errors[0]
+        except CopyAborted:
+            # Ein im Empfang blockierter Thread wacht erst auf, wenn die Verbindung zu ist
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            raise
+        finally:
+            stop.set()
+            _drain(items, thread)
+    return done
+
+
+def connect_remote(url, op, **options):
+    """
+    Verbindet sich mit dem Empfänger und schickt eine Anfrage. Gibt (Socket, Antwort) zurück;
+    lehnt der Empfänger ab, wird OSError mit seiner Fehlermeldung ausgelöst.
+    """
+    host, port, path = parse_remote(url)
+    sock = socket.create_connection((host, port), timeout=NET_CONNECT_TIMEOUT)
+    try:
+        sock.settimeout(NET_TIMEOUT)
+        request = dict(options, protocol=NET_PROTOCOL, version=NET_VERSION, op=op, path=path)
+        token = os.environ.get(NET_TOKEN_ENV)
+        if token:
+            request["token"] = token
+        send_message(sock, request)
+        reply = recv_message(sock)
+        if not reply.get("ok"):
+            raise OSError(f"{host}:{port}: {reply.get('error', 'Anfrage abgelehnt')}")
+    except BaseException:
+        sock.close()
+        raise
+    return sock, reply
+
+
+def remote_size(url):
+    """
+    Fragt den Empfänger nach der Größe einer Datei.
+    """
+    sock, reply = connect_remote(url, "stat")
+    sock.close()
+    return reply["size"]
+
+
+def send_path(source, url, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, compress=None,
+              on_data=None):
+    """
+    Streamt source (Datei oder Blockgerät) zum Empfänger, der sie unter dem Pfad der URL ablegt.
+    Gibt die gesendeten Bytes zurück, sobald der Empfänger sie auf sein Medium geschrieben hat.
+    """
+    src_fd = os.open(source, os.O_RDONLY)
+    try:
+        sock, _ = connect_remote(url, "put", compress=compress)
+        with sock:
+            try:
+                sent = send_chunks(src_fd, sock, block_size, compress, on_progress, should_abort, on_data)
+            except OSError as e:
+                # Der Empfänger bricht bei Fehlern ab und schickt vorher noch den Grund
+                reason = None
+                sock.settimeout(1)
+                try:
+                    reason = recv_message(sock).get("error")
+                except (OSError, ValueError):
+                    pass
+                if reason:
+                    raise OSError(f"Empfänger: {reason}") from e
+                raise
+            reply = recv_message(sock)
+    finally:
+        os.close(src_fd)
+    if not reply.get("ok"):
+        raise OSError(f"Empfänger: {reply.get('error')}")
+    return sent
+
+
+def receive_path(url, dest, block_size=DEFAULT_BLOCK_SIZE, on_progress=None, should_abort=None, compress=None,
+                 on_data=None):
+    """
+    Liest eine Datei vom Empfänger und schreibt sie nach dest (Datei oder Blockgerät).
+    """
+    sock, _ = connect_remote(url, "get", compress=compress, block_size=block_size)
+    with sock:
+        dst_fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            copied = receive_chunks(sock, dst_fd, compress, on_progress, should_abort, on_data)
+            os.fsync(dst_fd)
+        finally:
+            os.close(dst_fd)
+    return copied
+
+
+def served_path(root, path):
+    """
+    Bildet den Pfad einer Anfrage auf eine Datei unterhalb von root ab; Pfade außerhalb werden abgelehnt.
+    """
+    target = os.path.realpath(os.path.join(root, path.lstrip("/")))
+    if os.path.commonpath([root, target]) != root or target == root:
+        raise ValueError(f"Pfad außerhalb des Empfangsverzeichnisses: {path}")
+    return target
+
+
+def is_loopback(host):
+    """
+    True, wenn host nur lokal erreichbar ist (127.0.0.0/8, ::1, localhost).
+    """
+    return host in ("localhost", "::1") or host.startswith("127.")
+
+
+def receive_to_path(conn, path, compress, on_start=None):
+    """
+    Empfängt ein Image für "put" nach path. Reguläre Dateien werden zuerst in eine temporäre Datei
+    im selben Verzeichnis geschrieben und erst nach vollständigem, geprüftem Empfang und fsync per
+    os.replace umbenannt; bei Abbruch oder Fehler bleibt das bisherige Image unverändert.
+    Geräte (z. B. Blockgeräte unter dem Empfangsverzeichnis) werden direkt beschrieben.
+    """
+    try:
+        direct = not stat.S_ISREG(os.stat(path).st_mode)
+    except FileNotFoundError:
+        direct = False
+    if direct:
+        fd = os.open(path, os.O_WRONLY)
+        try:
+            send_message(conn, {"ok": True})
+            if on_start:
+                on_start()
+            size = receive_chunks(conn, fd, compress)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return size
+
+    directory, name = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".part")
+    try:
+        try:
+            os.fchmod(fd, 0o644)
+            send_message(conn, {"ok": True})
+            if on_start:
+                on_start()
+            size = receive_chunks(conn, fd, compress)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # Umbenennung dauerhaft machen
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    return size
+
+
+def handle_connection(conn, addr, root, on_message=print, token=None):
+    """
+    Bearbeitet eine Anfrage an den Empfänger (siehe serve).
+    """
+    peer = addr[0]
+    streaming = False
+    with conn:
+        try:
+            conn.settimeout(NET_TIMEOUT)
+            request = recv_message(conn)
+            if request.get("protocol") != NET_PROTOCOL or request.get("version") != NET_VERSION:
+                raise ValueError("Unbekanntes Protokoll oder Version.")
+            if token and not hmac.compare_digest(str(request.get("token", "")).encode(), token.encode()):
+                raise PermissionError(errno.EACCES, "Zugriff verweigert (falsches oder fehlendes Token)")
+            op = request.get("op")
+            path = served_path(root, str(request.get("path", "")))
+            compress = request.get("compress")
+            if compress and compress not in net_compressions():
+                raise ValueError(f"Kompression '{compress}' wird nicht unterstützt.")
+            if op == "stat":
+                size = get_size_bytes(path)
+                if size is None:
+                    raise FileNotFoundError(errno.ENOENT, "Datei nicht gefunden", path)
+                send_message(conn, {"ok": True, "size": size})
+            elif op == "put":
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                size = receive_to_path(conn, path, compress, lambda: on_message(f"{peer}: empfange {path}..."))
+                send_message(conn, {"ok": True, "size": size})
+                on_message(f"{peer}: {size} Bytes nach {path} geschrieben.")
+            elif op == "get":
+                block_size = min(int(request.get("block_size") or DEFAULT_BLOCK_SIZE), NET_MAX_CHUNK)
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    send_message(conn, {"ok": True, "size": os.lseek(fd, 0, os.SEEK_END)})
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    streaming = True
+                    on_message(f"{peer}: sende {path}...")
+                    size = send_chunks(fd, conn, block_size, compress)
+                finally:
+                    os.close(fd)
+                on_message(f"{peer}: {size} Bytes aus {path} gesendet.")
+            else:
+                raise ValueError(f"Unbekannte Operation {op!r}.")
+        except (OSError, ValueError) as e:
+            on_message(f"{peer}: Fehler: {e}")
+            if not streaming:
+                try:
+                    send_message(conn, {"ok": False, "error": str(e)})
+                    # Restliche Daten des Clients verwerfen, bis er die Meldung gelesen und geschlossen hat
+                    conn.shutdown(socket.SHUT_WR)
+                    conn.settimeout(5)
+                    while conn.recv(1024 * 1024):
+                        pass
+                except OSError:
+                    pass
+
+
+def serve(root, host=NET_DEFAULT_HOST, port=NET_PORT, on_message=print, should_abort=None, token=None):
+    """
+    Empfänger-Modus: nimmt Images unter root entgegen (put) und liefert sie aus (get), jede
+    Verbindung in einem eigenen Thread. Läuft, bis should_abort True liefert oder Strg+C gedrückt wird.
+    Standardmäßig nur auf localhost; mit token werden nur Anfragen mit diesem Token angenommen.
+    """
+    root = os.path.realpath(root)
+    if not os.path.isdir(root):
+        raise ValueError(f"Empfangsverzeichnis {root} existiert nicht.")
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    with socket.create_server((host, port), family=family, backlog=16) as listener:
+        listener.settimeout(1)
+        on_message(f"Empfänger bereit auf {host}:{port}, Verzeichnis {root}.")
+        if not token and not is_loopback(host):
+            on_message(f"Warnung: kein Token gesetzt ({NET_TOKEN_ENV} oder --token-file), "
+                       f"jeder Rechner im Netz kann Images unter {root} lesen und überschreiben.")
+        while not (should_abort and should_abort()):
+            try:
+                conn, addr = listener.accept()
+            except socket.timeout:
+                continue
+            io_thread(handle_connection, (conn, addr, root, on_message, token)).start()
+
+
+# -------------------------------------------------------------------
+#Geräteliste aus /sys/block (ersetzt lsblk und blockdev)
+SYS_BLOCK = "/sys/block"
+SYS_CLASS_BLOCK = "/sys/class/block"
+MOUNTINFO = "/proc/self/mountinfo"
+
+# Netlink-Protokoll, über das der Kernel uevents (Geräte hinzugefügt/entfernt/geändert) verschickt
+NETLINK_KOBJECT_UEVENT = 15
+
+# Ein Blockgerät (Laufwerk oder Partition); Größen in Bytes, disk ist der Name des Laufwerks
+BlockDevice = collections.namedtuple(
+    "BlockDevice",
+    "path name size rotational logical_block_size physical_block_size optimal_io_size "
+    "model serial removable mountpoints disk"
+)
+
+
+def read_sys(path, default=None):
+    """
+    Liest einen Wert aus sysfs, default, wenn es ihn nicht gibt.
+    """
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def parse_mountinfo(text):
+    """
+    Ordnet "major:minor" aus /proc/self/mountinfo die Einhängepunkte zu.
+    """
+    mounts = collections.defaultdict(list)
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) > 4:
+            mounts[fields[2]].append(fields[4].replace("\\040", " "))
+    return mounts
+
+
+def scan_block_devices(mounts=None, sys_block=SYS_BLOCK):
+    """
+    Liest alle Laufwerke und Partitionen direkt aus sysfs, ohne Subprozess.
+    Blockgrößen, Rotation, Modell und Seriennummer gelten für das Laufwerk und damit auch für seine Partitionen.
+    """
+    if mounts is None:
+        try:
+            with open(MOUNTINFO, "r") as f:
+                mounts = parse_mountinfo(f.read())
+        except OSError:
+            mounts = {}
+    devices = []
+    for disk in sorted(os.listdir(sys_block)):
+        base = os.path.join(sys_block, disk)
+        queue_dir = os.path.join(base, "queue")
+        common = dict(
+            rotational=read_sys(os.path.join(queue_dir, "rotational")) == "1",
+            logical_block_size=int(read_sys(os.path.join(queue_dir, "logical_block_size"), "512")),
+            physical_block_size=int(read_sys(os.path.join(queue_dir, "physical_block_size"), "512")),
+            optimal_io_size=int(read_sys(os.path.join(queue_dir, "optimal_io_size"), "0")),
+            model=read_sys(os.path.join(base, "device", "model"), ""),
+            serial=read_sys(os.path.join(base, "device", "serial")) or read_sys(os.path.join(base, "device", "wwid"), ""),
+            removable=read_sys(os.path.join(base, "removable")) == "1",
+            disk=disk,
+        )
+        entries = [(disk, base)] + [
+            (name, os.path.join(base, name)) for name in sorted(os.listdir(base))
+            if os.path.exists(os.path.join(base, name, "partition"))
+        ]
+        for name, sys_dir in entries:
+            devices.append(BlockDevice(
+                path="/dev/" + name.replace("!", "/"),
+                name=name,
+                size=int(read_sys(os.path.join(sys_dir, "size"), "0")) * 512,
+                mountpoints=tuple(mounts.get(read_sys(os.path.join(sys_dir, "dev"), ""), ())),
+                **common
+            ))
+    return devices
+
+
+class DeviceInventory:
+    """
+    Zwischengespeicherte Geräteliste (siehe scan_block_devices) für alle Fenster und Jobs.
+
+    Neu eingelesen wird nur nach einer Änderung: Der Kernel meldet hinzugefügte, entfernte oder
+    geänderte Blockgeräte als uevent über Netlink, geänderte Einhängepunkte über POLLPRI auf
+    /proc/self/mountinfo. Ohne Netlink wird stattdessen /sys/class/block verglichen.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._devices = None
+        self._signature = None
+        self._uevents = None
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+            sock.bind((0, 1))  # Multicast-Gruppe 1: uevents direkt vom Kernel
+            sock.setblocking(False)
+            self._uevents = sock
+        except (OSError, AttributeError):
+            pass
+        self._mount_file = None
+        self._mount_poll = None
+        try:
+            self._mount_file = open(MOUNTINFO, "r")
+            self._mount_poll = select.poll()
+            self._mount_poll.register(self._mount_file, select.POLLPRI | select.POLLERR)
+        except (OSError, AttributeError):
+            pass
+
+    def _sys_signature(self):
+        try:
+            return os.stat(SYS_BLOCK).st_mtime_ns, tuple(sorted(os.listdir(SYS_CLASS_BLOCK)))
+        except OSError:
+            return None
+
+    def _changed(self):
+        changed = False
+        if self._uevents is not None:
+            while True:
+                try:
+                    if b"SUBSYSTEM=block" in self._uevents.recv(16384):
+                        changed = True
+                except BlockingIOError:
+                    break
+                except OSError:
+                    changed = True  # z. B. ENOBUFS: Meldungen verpasst
+                    break
+        elif self._sys_signature() != self._signature:
+            changed = True
+        if self._mount_poll is not None and self._mount_poll.poll(0):
+            changed = True
+        return changed
+
+    def _read_mounts(self):
+        if self._mount_file is None:
+            return None
+        # Erst das erneute Lesen setzt das POLLPRI-Ereignis zurück
+        self._mount_file.seek(0)
+        return parse_mountinfo(self._mount_file.read())
+
+    def devices(self):
+        """
+        Gibt alle Blockgeräte zurück; liest sysfs nur nach einer gemeldeten Änderung neu.
+        """
+        with self._lock:
+            if self._devices is None or self._changed():
+                self._signature = self._sys_signature()
+                self._devices = scan_block_devices(self._read_mounts())
+            return self._devices
+
+    def find(self, path):
+        """
+        Gibt das BlockDevice zu path zurück (auch über Symlinks wie /dev/disk/by-id), sonst None.
+        """
+        real = os.path.realpath(path)
+        for device in self.devices():
+            if device.path == real:
+                return device
+        return None
+
+
+_inventory = None
+
+
+def device_inventory():
+    """
+    Gibt die gemeinsame DeviceInventory des Prozesses zurück.
+    """
+    global _inventory
+    if _inventory is None:
+        _inventory = DeviceInventory()
+    return _inventory
+
+
+def device_size_bytes(path):
+    """
+    Größe eines Blockgeräts aus der Geräteliste, für alles andere über get_size_bytes.
+    """
+    device = device_inventory().find(path)
+    return device.size if device else get_size_bytes(path)
+
+
+def format_size(size):
+    """
+    Formatiert eine Größe kurz wie lsblk, z. B. "931.5G".
+    """
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}".replace(".0" + unit, unit)
+        size /= 1024
+
+# -------------------------------------------------------------------
+#Automatische Wahl von Blockgröße und Pipeline-Tiefe
+def disk_of(path):
+    """
+    Gibt das BlockDevice des Laufwerks zurück, auf dem path liegt (Gerät oder Datei), sonst None.
+    """
+    name = physical_device(path)
+    for device in device_inventory().devices():
+        if device.name == name:
+            return device
+    return None
+
+
+def tuning_key(source, dest, write):
+    """
+    Schlüssel für den Tuning-Cache: Modell und Seriennummer der beteiligten Laufwerke.
+    Bei Dateien zählt das Laufwerk, auf dem sie liegen.
+    """
+    parts = []
+    for path in (source, dest):
+        disk = disk_of(path)
+        ident = (f"{disk.model} {disk.serial}".strip() or disk.name) if disk else physical_device(path)
+        parts.append(ident if os.path.realpath(path).startswith("/dev/") else f"Datei auf {ident}")
+    return f"{parts[0]} → {parts[1]} ({'rw' if write else 'r'})"
+
+
+def tuning_candidates(paths):
+    """
+    Liefert die zu messenden (Blockgröße, Pipeline-Tiefe)-Paare. Melden die Laufwerke in sysfs eine
+    optimale I/O-Größe (z. B. RAID-Stripe), werden alle Blockgrößen auf Vielfache davon aufgerundet.
+    """
+    unit = 0
+    for path in paths:
+        disk = disk_of(path)
+        if disk:
+            unit = max(unit, disk.optimal_io_size)
+    sizes = set(TUNE_BLOCK_SIZES)
+    if unit:
+        sizes = {-(-size // unit) * unit for size in sizes}
+        if unit <= max(TUNE_BLOCK_SIZES):
+            sizes.add(unit)
+    return [(size, depth) for size in sorted(sizes) for depth in TUNE_DEPTHS]
+
+
+def load_tuning_cache():
+    """
+    Liest die gespeicherten Messergebnisse ({Schlüssel: [Blockgröße, Tiefe]}).
+    """
+    try:
+        with open(TUNE_CACHE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_tuning_cache(cache):
+    """
+    Speichert die Messergebnisse; ein nicht beschreibbarer Cache ist kein Fehler.
+    """
+    try:
+        os.makedirs(os.path.dirname(TUNE_CACHE), exist_ok=True)
+        with open(TUNE_CACHE + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1)
+        os.replace(TUNE_CACHE + ".tmp", TUNE_CACHE)
+    except OSError:
+        pass
+
+
+def tune_io(source, dest, write=True, on_message=None, should_abort=None):
+    """
+    Ermittelt die schnellste (Blockgröße, Pipeline-Tiefe) für eine Kopie von source nach dest.
+
+    Jeder Kandidat kopiert TUNE_PROBE_SIZE Bytes aus einem eigenen Bereich der Quelle (mit O_DIRECT,
+    damit der Page-Cache nichts verfälscht) an dieselbe Stelle des Ziels und wartet auf fdatasync.
+    Das Ziel bekommt also nur Daten, die die Kopie danach ohnehin dort hinschreibt. Mit write=False
+    (Sparse, Kompression, Delta, mehrere Ziele) wird nur die Quelle gemessen. Das Ergebnis wird je
+    Laufwerkspaar gespeichert; ist die Quelle zu klein für die Messung, gelten die Standardwerte.
+    """
+    key = tuning_key(source, dest, write)
+    cache = load_tuning_cache()
+    if key in cache:
+        block_size, depth = cache[key]
+        if on_message:
+            on_message(f"Gespeicherte I/O-Parameter für {key}: Blockgröße {format_size(block_size)}, Tiefe {depth}.")
+        return block_size, depth
+    candidates = tuning_candidates([source, dest] if write else [source])
+    size = get_size_bytes(source)
+    if not size or size < len(candidates) * TUNE_PROBE_SIZE:
+        return DEFAULT_BLOCK_SIZE, PIPELINE_DEPTH
+    if on_message:
+        on_message(f"Messe {len(candidates)} Kombinationen aus Blockgröße und Pipeline-Tiefe...")
+    results = []
+    src_fd, _ = open_fd(source, os.O_RDONLY, direct=True)
+    try:
+        dst_fd = os.open(dest if write else os.devnull, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            for i, (block_size, depth) in enumerate(candidates):
+                offset = i * TUNE_PROBE_SIZE
+                os.lseek(src_fd, offset, os.SEEK_SET)
+                if write:
+                    os.lseek(dst_fd, offset, os.SEEK_SET)
+                start = time.monotonic()
+                copy_data(src_fd, dst_fd, block_size, should_abort=should_abort,
+                          strategy="pipeline" if depth > 1 else "readinto", length=TUNE_PROBE_SIZE, depth=depth)
+                if write:
+                    os.fdatasync(dst_fd)
+                results.append((TUNE_PROBE_SIZE / max(time.monotonic() - start, 1e-9), block_size, depth))
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    rate, block_size, depth = max(results)
+    if on_message:
+        on_message(f"Gewählt: Blockgröße {format_size(block_size)}, Tiefe {depth} ({rate / 1e6:.1f} MB/s).")
+    cache[key] = [block_size, depth]
+    save_tuning_cache(cache)
+    return block_size, depth
+
+# -------------------------------------------------------------------
+#Bandbreitenbegrenzung und I/O-Priorität
+
+# Token Bucket: höchstens so viele Sekunden Guthaben ansammeln, Mindestrate im adaptiven Modus
+THROTTLE_BURST = 0.5
+THROTTLE_MIN_RATE = 1e6
+# Adaptiver Modus: Messintervall der Schreiblatenz, Bremsfaktor bei Überschreitung, Erhöhung sonst
+ADAPT_INTERVAL = 1.0
+ADAPT_DECREASE = 0.7
+ADAPT_INCREASE = 1.1
+
+# ioprio_set(2)/ioprio_get(2) haben kein Gegenstück im os-Modul; Syscall-Nummern je Architektur
+_IOPRIO_SET = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "riscv64": 30, "armv7l": 314, "ppc64le": 273}
+_IOPRIO_GET = {"x86_64": 252, "i386": 290, "i686": 290, "aarch64": 31, "riscv64": 31, "armv7l": 315, "ppc64le": 274}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_IDLE = 3
+
+# libc-Handle für syscall(), wird beim ersten Gebrauch geladen
+_libc = None
+# I/O-Prioritätsgruppe des aktuellen Threads (siehe IOPriority, io_thread)
+_io_local = threading.local()
+
+
+def _ioprio_libc():
+    """
+    Lädt libc für syscall() einmal und gibt das Handle zurück.
+    """
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(None, use_errno=True)
+    return _libc
+
+
+def get_io_priority(tid):
+    """
+    Liest die I/O-Priorität des Threads tid (ioprio_get), None wenn das nicht geht.
+    """
+    number = _IOPRIO_GET.get(platform.machine())
+    if number is None:
+        return None
+    # IOPRIO_WHO_PROCESS mit einer Thread-ID gilt nur für diesen Thread
+    value = _ioprio_libc().syscall(number, IOPRIO_WHO_PROCESS, tid)
+    return value if value >= 0 else None
+
+
+def put_io_priority(tid, value):
+    """
+    Setzt die I/O-Priorität des Threads tid (ioprio_set). Ein schon beendeter Thread zählt als Erfolg.
+    """
+    number = _IOPRIO_SET.get(platform.machine())
+    if number is None:
+        return False
+    libc = _ioprio_libc()
+    return libc.syscall(number, IOPRIO_WHO_PROCESS, tid, value) == 0 or ctypes.get_errno() == errno.ESRCH
+
+
+class IOPriority:
+    """
+    I/O priority of one copy: the thread that calls enter() and every thread the engine starts
+    from it via io_thread(). set_idle() switches exactly these threads to the idle class
+    (like ionice -c3) and back to the priority each had before; other threads of the process,
+    e.g. the GUI thread, are not touched. set_idle() may be called from any thread.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle = False
+        # Thread-ID -> Priorität vor idle
+        self.saved = {}
+
+    def enter(self, parent=None):
+        """
+        Nimmt den aufrufenden Thread in die Gruppe auf; parent ist der Thread, der ihn gestartet hat.
+        """
+        tid = threading.get_native_id()
+        _io_local.group = self
+        with self.lock:
+            # Ein neuer Thread erbt die aktuelle Klasse seines Erzeugers, gespeichert wird dessen frühere
+            value = self.saved.get(parent) if parent in self.saved else get_io_priority(tid)
+            self.saved[tid] = value
+            if self.idle:
+                return put_io_priority(tid, IOPRIO_CLASS_IDLE << 13)
+            if value is not None and parent is not None:
+                return put_io_priority(tid, value)
+        return True
+
+    def leave(self):
+        """
+        Nimmt den aufrufenden Thread aus der Gruppe und stellt seine frühere Priorität wieder her.
+        """
+        tid = threading.get_native_id()
+        _io_local.group = None
+        with self.lock:
+            value = self.saved.pop(tid, None)
+            if self.idle and value is not None:
+                put_io_priority(tid, value)
+
+    def set_idle(self, idle):
+        """
+        Schaltet alle Threads der Gruppe auf idle bzw. zurück. Gibt False zurück, wenn das nicht geht.
+        """
+        if _IOPRIO_SET.get(platform.machine()) is None or _IOPRIO_GET.get(platform.machine()) is None:
+            return False
+        ok = True
+        with self.lock:
+            self.idle = idle
+            for tid, value in self.saved.items():
+                if idle:
+                    ok = put_io_priority(tid, IOPRIO_CLASS_IDLE << 13) and ok
+                elif value is not None:
+                    ok = put_io_priority(tid, value) and ok
+        return ok
+
+
+def io_thread(target, args=(), name=None):
+    """
+    Erzeugt (ohne zu starten) einen Daemon-Thread, der zur I/O-Prioritätsgruppe des aufrufenden Threads gehört.
+    """
+    group = getattr(_io_local, "group", None)
+    if group is None:
+        return threading.Thread(target=target, args=args, name=name, daemon=True)
+    parent = threading.get_native_id()
+
+    def run():
+        group.enter(parent)
+        try:
+            target(*args)
+        finally:
+            group.leave()
+
+    return threading.Thread(target=run, name=name, daemon=True)
+
+
+def read_write_stat(path):
+    """
+    Liest abgeschlossene Schreibvorgänge und deren Gesamtdauer in ms aus /sys/block/<dev>/stat.
+    """
+    fields = read_sys(path).split()
+    return int(fields[4]), int(fields[7])
+
+
+class IOThrottle:
+    """
+    Begrenzt den Durchsatz einer Kopie (Token Bucket in Bytes/s, 0 = unbegrenzt). Mit latency_target
+    (ms) wird die Rate zusätzlich an die mittlere Schreiblatenz der Ziel-Laufwerke angepasst: liegt sie
+    darüber, wird gebremst, sonst langsam wieder beschleunigt. Beide Werte lassen sich während der
+    Kopie ändern; consume() wird aus den Kopier-Threads aufgerufen.
+    """
+    def __init__(self, rate=0, latency_target=0):
+        self.rate = rate
+        self.latency_target = latency_target
+        self.adaptive_rate = 0
+        self.latency = None
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+        self._generation = 0
+        self._stats = {}
+        self._bytes = 0
+        self._sample_time = self._next
+
+    def attach(self, paths):
+        """
+        Merkt sich die Laufwerke der Ziele für den adaptiven Modus. Gibt False zurück, wenn für
+        keines eine Latenz messbar ist (z. B. Netzlaufwerke).
+        """
+        stats = {}
+        for path in paths:
+            disk = disk_of(path)
+            stat_path = f"/sys/block/{disk.name}/stat" if disk else None
+            if stat_path and os.path.exists(stat_path):
+                stats[stat_path] = read_write_stat(stat_path)
+        with self._lock:
+            self._stats = stats
+            self._bytes = 0
+            self._sample_time = time.monotonic()
+        return bool(stats)
+
+    def set_rate(self, rate):
+        """
+        Setzt die Obergrenze in Bytes/s (0 = unbegrenzt); wartende Kopier-Threads laufen sofort weiter.
+        """
+        with self._lock:
+            self.rate = rate
+            self._next = time.monotonic()
+            self._generation += 1
+
+    def set_latency_target(self, latency_target):
+        """
+        Setzt die Ziel-Latenz in ms (0 = aus) und vergisst die bisher angepasste Rate.
+        """
+        with self._lock:
+            self.latency_target = latency_target
+            self.adaptive_rate = 0
+            self._next = time.monotonic()
+            self._generation += 1
+
+    def effective_rate(self):
+        """
+        Die aktuell geltende Rate in Bytes/s: das Minimum aus fester und angepasster Rate (0 = unbegrenzt).
+        """
+        rates = [rate for rate in (self.rate, self.adaptive_rate if self.latency_target else 0) if rate]
+        return min(rates) if rates else 0
+
+    def describe(self):
+        """
+        Kurzbeschreibung für die Fortschrittsanzeige, leer ohne Begrenzung.
+        """
+        rate = self.effective_rate()
+        parts = [f"Limit {rate / 1e6:.1f} MB/s" if rate else ""]
+        if self.latency_target and self.latency is not None:
+            parts.append(f"Latenz {self.latency:.1f} ms (Ziel {self.latency_target} ms)")
+        return ", ".join(part for part in parts if part)
+
+    def _adapt(self, now):
+        # Mittlere Latenz der Schreibvorgänge seit der letzten Messung, über alle Ziel-Laufwerke das Maximum
+        latencies = []
+        for path, (ios, ticks) in self._stats.items():
+            new_ios, new_ticks = read_write_stat(path)
+            if new_ios > ios:
+                latencies.append((new_ticks - ticks) / (new_ios - ios))
+            self._stats[path] = (new_ios, new_ticks)
+        throughput = self._bytes / (now - self._sample_time)
+        self._bytes = 0
+        self._sample_time = now
+        if not latencies:
+            return
+        self.latency = max(latencies)
+        if self.latency > self.latency_target:
+            current = min(self.adaptive_rate, throughput) if self.adaptive_rate else throughput
+            self.adaptive_rate = max(current * ADAPT_DECREASE, THROTTLE_MIN_RATE)
+        elif self.adaptive_rate:
+            self.adaptive_rate *= ADAPT_INCREASE
+            if self.adaptive_rate > 4 * throughput:
+                self.adaptive_rate = 0  # Quelle ist ohnehin langsamer, Bremse lösen
+
+    def consume(self, n, should_abort=None):
+        """
+        Verbucht n kopierte Bytes und wartet, bis die Rate wieder eingehalten ist.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._bytes += n
+            if self.latency_target and self._stats and now - self._sample_time >= ADAPT_INTERVAL:
+                try:
+                    self._adapt(now)
+                except (OSError, ValueError, IndexError):
+                    self._stats = {}
+            rate = self.effective_rate()
+            if not rate:
+                self._next = now
+                return
+            self._next = max(self._next, now - THROTTLE_BURST) + n / rate
+            generation = self._generation
+        while True:
+            with self._lock:
+                if self._generation != generation:
+                    return
+                remaining = self._next - time.monotonic()
+            if remaining <= 0 or (should_abort and should_abort()):
+                return
+            time.sleep(min(remaining, 0.1))
+
+    def wrap(self, on_progress, should_abort=None):
+        """
+        Hängt die Begrenzung an einen Fortschritts-Callback on_progress(done), der bei jedem Block
+        aufgerufen wird. Der erste Aufruf zählt nicht (fortgesetzte Kopien beginnen nicht bei 0).
+        """
+        last = [None]
+
+        def paced(done):
+            if last[0] is not None and done > last[0]:
+                self.consume(done - last[0], should_abort)
+            last[0] = done
+            on_progress(done)
+        return paced
+
+# -------------------------------------------------------------------
+#Jobs, Scheduler und Headless-Modus
+
+# Kopiermodi in Jobdateien und die zugehörigen Optionen von copy_path
+JOB_MODES = {
+    "raw": {},
+    "pipeline": {"strategy": "pipeline"},
+    "direct": {"direct": True},
+    "sparse": {"sparse": True},
+    "delta": {"delta": True},
+    "rescue": {"rescue": True},
+}
+
+
+def parse_size(text):
+    """
+    Wandelt Angaben wie "4M" oder "512K" in Bytes um.
+    """
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = str(text).strip().upper()
+    if text[-1:] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+def parse_block_size(text):
+    """
+    Wie parse_size, erlaubt aber zusätzlich "auto" (siehe tune_io).
+    """
+    return AUTO_BLOCK_SIZE if str(text).strip().lower() == AUTO_BLOCK_SIZE else parse_size(text)
+
+
+class Job:
+    """
+    Ein Kopierauftrag: eine Quelle, ein oder mehrere Ziele und die Optionen für copy_path bzw. clone_path.
+    """
+    def __init__(self, source, dests, block_size=DEFAULT_BLOCK_SIZE, strategy="auto", direct=False, sparse=False,
+                 compress=None, decompress=None, delta=False, verify=False, dry_run=False, name=None, resumable=False,
+                 rescue=False, rate_limit=0, latency_target=0, net_compress=None):
+        self.source = source
+        self.dests = [dests] if isinstance(dests, str) else list(dests)
+        self.block_size = block_size
+        self.strategy = strategy
+        self.direct = direct
+        self.sparse = sparse
+        self.compress = compress
+        self.decompress = decompress
+        self.delta = delta
+        self.verify = verify
+        self.dry_run = dry_run
+        self.resumable = resumable
+        self.rescue = rescue
+        self.net_compress = net_compress
+        self.throttle = IOThrottle(rate_limit, latency_target)
+        self.name = name or f"{source} → {', '.join(self.dests)}"
+
+    def describe(self):
+        """
+        Beschreibt Quelle, Ziele und Optionen in einer Zeile (für den Dry Run).
+        """
+        return (
+            f"{self.source} → {', '.join(self.dests)} "
+            f"(Blockgröße: {self.block_size if self.block_size == AUTO_BLOCK_SIZE else f'{self.block_size} Bytes'}, Strategie: {self.strategy}, O_DIRECT: {self.direct}, Sparse: {self.sparse}, "
+            f"Kompression: {self.compress or self.decompress or 'keine'}, Delta: {self.delta}, Verifikation: {self.verify}, "
+            f"Fortsetzbar: {self.resumable}, Rettungsmodus: {self.rescue}, Netzwerk-Kompression: {self.net_compress or 'keine'}, "
+            f"Limit: {f'{self.throttle.rate / 1e6:.1f} MB/s' if self.throttle.rate else 'keines'}, "
+            f"Ziel-Latenz: {f'{self.throttle.latency_target} ms' if self.throttle.latency_target else 'aus'})"
+        )
+
+    def options(self):
+        """
+        Die Optionen eines fortsetzbaren Jobs für das Checkpoint-Journal (siehe Job.from_journal).
+        """
+        return {
+            "block_size": self.block_size,
+            "strategy": self.strategy,
+            "direct": self.direct,
+            "verify": self.verify,
+            "name": self.name,
+            "rate_limit": self.throttle.rate,
+            "latency_target": self.throttle.latency_target,
+        }
+
+    @classmethod
+    def from_journal(cls, journal):
+        """
+        Baut den Job, mit dem die Kopie eines Checkpoint-Journals fortgesetzt wird.
+        """
+        return cls(journal["source"], journal["dest"], resumable=True, **journal.get("job", {}))
+
+
+def run_job(job, on_message=print, on_progress=None, should_abort=None, progress_interval=PROGRESS_INTERVAL):
+    """
+    Führt job aus: Kopieren (ein Ziel) bzw. Klonen (mehrere Ziele) und auf Wunsch Verifizieren.
+
+    on_message bekommt Statusmeldungen, on_progress(Index des Ziels, ProgressInfo) höchstens alle
+    progress_interval Sekunden den Fortschritt. Nur das Kopieren läuft durch job.throttle, beim Klonen
+    der gemeinsame Lesedurchgang, sodass die Rate für jedes Ziel gilt; die Verifikation liest ungebremst.
+    CopyAborted und Fehler beim Öffnen werden weitergereicht.
+    Gibt True zurück, wenn alle Ziele geschrieben (und ggf. verifiziert) wurden.
+    """
+    if job.dry_run:
+        on_message(f"[DRY RUN] {job.describe()}")
+        return True
+
+    def emitter(index):
+        return lambda info: on_progress(index, info) if on_progress else None
+
+    block_size, strategy, depth = job.block_size, job.strategy, PIPELINE_DEPTH
+    remote = is_remote(job.source) or any(is_remote(dest) for dest in job.dests)
+    if block_size == AUTO_BLOCK_SIZE and (job.rescue or remote):
+        # keine Messung auf einem Datenträger mit Lesefehlern oder über das Netzwerk
+        block_size = DEFAULT_BLOCK_SIZE
+    if block_size == AUTO_BLOCK_SIZE:
+        # Nur bei einer Rohkopie auf ein Ziel darf die Messung ins Ziel schreiben
+        raw = len(job.dests) == 1 and not (job.sparse or job.compress or job.decompress or job.delta)
+        block_size, depth = tune_io(job.source, job.dests[0], raw, on_message, should_abort)
+        if depth > 1 and strategy == "auto":
+            strategy = "pipeline"
+
+    throttle = job.throttle
+    if not throttle.attach(job.dests) and throttle.latency_target:
+        on_message("Hinweis: Die Schreiblatenz der Ziele ist nicht messbar, nur das feste Limit gilt.")
+
+    total = get_size_bytes(job.source)
+    hasher = ChunkHasher() if job.verify and not (job.rescue or remote) else None
+    if job.verify and job.rescue:
+        on_message("Hinweis: Im Rettungsmodus wird nicht verifiziert, nicht lesbare Bereiche stehen in der Map-Datei.")
+    elif job.verify and remote:
+        on_message("Hinweis: Über das Netzwerk wird jeder Chunk mit seiner Prüfsumme geprüft, kein eigener Verifikationslauf.")
+    trackers = [ProgressTracker(total, emitter(i), interval=progress_interval) for i in range(len(job.dests))]
+    start = time.monotonic()
+    if len(job.dests) == 1:
+        copied = copy_path(
+            job.source, job.dests[0], block_size,
+            on_progress=throttle.wrap(trackers[0].update, should_abort),
+            should_abort=should_abort,
+            strategy=strategy,
+            direct=job.direct,
+            sparse=job.sparse,
+            compress=job.compress,
+            decompress=job.decompress,
+            delta=job.delta,
+            on_message=on_message,
+            hasher=hasher,
+            depth=depth,
+            checkpoint=job.resumable,
+            job=job.options(),
+            rescue=job.rescue,
+            net_compress=job.net_compress
+        )
+        failed = {}
+        trackers[0].finish()
+        on_message(f"Fertig: {copied} Bytes kopiert ({format_rate(copied, time.monotonic() - start)}).")
+    else:
+        # Geklont wird immer über fanout_copy (ein Lesedurchgang, ein Schreib-Thread je Ziel)
+        ignored = []
+        if job.strategy != "auto":
+            ignored.append(f"Strategie {job.strategy}")
+        if job.resumable:
+            ignored.append("Fortsetzen (Journal)")
+        if job.sparse:
+            ignored.append("Sparse")
+        if ignored:
+            on_message(f"Hinweis: Beim Klonen auf mehrere Ziele gilt nicht: {', '.join(ignored)}.")
+        copied, failed = clone_path(
+            job.source, job.dests, block_size,
+            on_progress=lambda index, done: trackers[index].update(done),
+            should_abort=should_abort,
+            direct=job.direct,
+            on_message=on_message,
+            hasher=hasher,
+            throttle=throttle
+        )
+        for tracker in trackers:
+            tracker.finish()
+        for dest, error in failed.items():
+            on_message(f"Fehler bei {dest}: {error}")
+        on_message(
+            f"Fertig: {copied} Bytes gelesen, {len(job.dests) - len(failed)} Ziel(e) geschrieben "
+            f"({format_rate(copied, time.monotonic() - start)})."
+        )
+    if not hasher:
+        return not failed
+
+    digests = hasher.finish()
+
+    def verify(target):
+        index, dest = target
+        on_message(f"Verifiziere {dest}...")
+        tracker = ProgressTracker(copied, emitter(index), "Verifizieren", progress_interval)
+        mismatch = verify_path(
+            job.source, dest, copied, digests,
+            source_format=job.decompress, dest_format=job.compress,
+            on_progress=tracker.update, should_abort=should_abort
+        )
+        tracker.finish()
+        if mismatch is None:
+            rate = format_rate(copied, time.monotonic() - tracker.start)
+            on_message(f"Verifikation erfolgreich: {dest} stimmt mit der Quelle überein ({rate}).")
+            return True
+        on_message(f"Verifikation fehlgeschlagen: {dest} weicht ab Byte {mismatch} von der Quelle ab.")
+        return False
+
+    # Jedes Ziel ist ein eigenes Gerät und wird in einem eigenen Thread gelesen
+    targets = [(i, dest) for i, dest in enumerate(job.dests) if dest not in failed]
+    with ThreadPoolExecutor(max_workers=len(targets) or 1) as pool:
+        results = list(pool.map(verify, targets))
+    if len(targets) > 1 and not all(results):
+        on_message("Mindestens ein Ziel konnte nicht verifiziert werden.")
+    return not failed and all(results)
+
+
+def physical_device(path):
+    """
+    Gibt den Namen des physischen Laufwerks zurück, auf dem path liegt (Blockgerät, Datei oder neue Datei).
+    Partitionen zählen zu ihrem Laufwerk; ohne Eintrag in /sys wird "major:minor" zurückgegeben.
+    Für Netzwerkpfade ist das "Laufwerk" der Empfänger (host:port).
+    """
+    if is_remote(path):
+        host, port, _ = parse_remote(path)
+        return f"{host}:{port}"
+    probe = os.path.abspath(path)
+    while not os.path.exists(probe):
+        probe = os.path.dirname(probe)
+    st = os.stat(probe)
+    dev = st.st_rdev if stat.S_ISBLK(st.st_mode) else st.st_dev
+    number = f"{os.major(dev)}:{os.minor(dev)}"
+    sys_dir = os.path.realpath(f"/sys/dev/block/{number}")
+    if os.path.exists(os.path.join(sys_dir, "partition")):
+        sys_dir = os.path.dirname(sys_dir)
+    return os.path.basename(sys_dir) if os.path.isdir(sys_dir) else number
+
+
+class JobScheduler:
+    """
+    Führt Jobs parallel aus, aber höchstens per_device gleichzeitig je physischem Laufwerk und
+    höchstens max_jobs insgesamt. Jobs starten in ihrer Reihenfolge, sobald alle ihre Laufwerke frei
+    sind; ein wartender Job hält spätere Jobs auf anderen Laufwerken nicht auf.
+    run(job, should_abort) führt einen Job aus und gibt True bei Erfolg zurück.
+    """
+    def __init__(self, run, per_device=1, max_jobs=None):
+        if per_device < 1 or (max_jobs is not None and max_jobs < 1):
+            raise ValueError("per_device und max_jobs müssen mindestens 1 sein.")
+        self.run = run
+        self.per_device = per_device
+        self.max_jobs = max_jobs
+        self.abort = threading.Event()
+
+    def run_all(self, jobs):
+        """
+        Führt alle Jobs aus und gibt ihre Ergebnisse in Job-Reihenfolge zurück.
+        Bei Strg+C werden laufende Jobs abgebrochen und noch nicht gestartete übersprungen.
+        """
+        devices = [{physical_device(path) for path in [job.source] + job.dests} for job in jobs]
+        results = [False] * len(jobs)
+        pending = list(range(len(jobs)))
+        busy = collections.Counter()
+        running = [0]
+        cond = threading.Condition()
+        threads = []
+
+        def ready(index):
+            if self.max_jobs is not None and running[0] >= self.max_jobs:
+                return False
+            return all(busy[dev] < self.per_device for dev in devices[index])
+
+        def worker(index):
+            try:
+                results[index] = self.run(jobs[index], self.abort.is_set)
+            finally:
+                with cond:
+                    busy.subtract(devices[index])
+                    running[0] -= 1
+                    cond.notify_all()
+
+        try:
+            with cond:
+                while pending and not self.abort.is_set():
+                    index = next((i for i in pending if ready(i)), None)
+                    if index is None:
+                        cond.wait()
+                        continue
+                    pending.remove(index)
+                    busy.update(devices[index])
+                    running[0] += 1
+                    thread = io_thread(worker, (index,), f"pkddgui-job-{index}")
+                    threads.append(thread)
+                    thread.start()
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.abort.set()
+            for thread in threads:
+                thread.join()
+        return results
+
+
+def job_from_dict(entry, dry_run=False):
+    """
+    Baut einen Job aus einem Eintrag der Jobdatei. Unbekannte Werte lösen ValueError aus.
+    """
+    if not isinstance(entry, dict) or "source" not in entry or "dest" not in entry:
+        raise ValueError(f"Job braucht mindestens 'source' und 'dest': {entry!r}")
+    mode = entry.get("mode", "raw")
+    if mode not in JOB_MODES:
+        raise ValueError(f"Unbekannter Modus '{mode}' (möglich: {', '.join(JOB_MODES)})")
+    compress = entry.get("compress")
+    if compress and compress not in available_compressions():
+        raise ValueError(f"Kompression '{compress}' nicht verfügbar (möglich: {', '.join(available_compressions())})")
+    source = entry["source"]
+    decompress = detect_compression(source) if os.path.isfile(source) else None
+    if decompress and decompress not in available_compressions():
+        raise ValueError(f"{source}: {decompress}-Images benötigen python-zstandard")
+    dests = entry["dest"]
+    if compress and isinstance(dests, str) and not dests.endswith(COMPRESSIONS[compress][0]):
+        dests += COMPRESSIONS[compress][0]
+    if mode == "rescue" and (compress or decompress):
+        raise ValueError(f"Der Rettungsmodus arbeitet nur mit unkomprimierten Daten: {entry!r}")
+    if not isinstance(dests, str) and len(dests) > 1 and (mode in ("sparse", "delta", "rescue") or compress or decompress):
+        raise ValueError(f"Modus '{mode}' und komprimierte Images gehen nur mit einem Ziel: {entry!r}")
+    net_compress = entry.get("net_compress")
+    if net_compress and net_compress not in net_compressions():
+        raise ValueError(f"Netzwerk-Kompression '{net_compress}' nicht verfügbar (möglich: {', '.join(net_compressions())})")
+    remote = [path for path in [source] + ([dests] if isinstance(dests, str) else list(dests)) if is_remote(path)]
+    for path in remote:
+        parse_remote(path)
+    if remote and (mode not in ("raw", "pipeline") or compress or entry.get("resumable")
+                   or not isinstance(dests, str) and len(dests) > 1):
+        raise ValueError(f"Netzwerkpfade gehen nur mit Modus raw oder pipeline, einem Ziel und ohne Kompression/Journal: {entry!r}")
+    return Job(
+        source, dests,
+        block_size=parse_block_size(entry.get("block_size", DEFAULT_BLOCK_SIZE)),
+        compress=compress,
+        decompress=decompress,
+        verify=bool(entry.get("verify", False)),
+        dry_run=dry_run or bool(entry.get("dry_run", False)),
+        resumable=bool(entry.get("resumable", False)),
+        rate_limit=float(entry.get("rate_limit", 0)) * 1e6,
+        latency_target=float(entry.get("latency_target", 0)),
+        net_compress=net_compress,
+        name=entry.get("name"),
+        **JOB_MODES[mode]
+    )
+
+
+def load_jobs(path, dry_run=False):
+    """
+    Liest eine Jobdatei (JSON oder YAML): eine Liste von Jobs oder ein Objekt mit dem Schlüssel "jobs".
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json") or text.lstrip()[:1] in ("[", "{"):
+        data = json.loads(text)
+    elif yaml is not None:
+        data = yaml.safe_load(text)
+    else:
+        raise ValueError("YAML-Jobdateien benötigen pyyaml (pip install pyyaml), alternativ JSON verwenden.")
+    if isinstance(data, dict):
+        data = data.get("jobs", [])
+    return [job_from_dict(entry, dry_run) for entry in data or []]
+
+
+def extract_main(args, parser):
+    """
+    --partitions und --extract von main.
+    """
+    try:
+        if args.partitions:
+            for number, start, size, name in image_partitions(args.partitions):
+                print(f"{number}: Start {start} ({format_size(start)}), Größe {size} ({format_size(size)}) {name}")
+            return 0
+        if not args.output:
+            parser.error("--extract braucht --output")
+        offset, length = parse_size(args.offset), parse_size(args.length) if args.length else None
+        if args.partition is not None:
+            matches = [p for p in image_partitions(args.extract) if p[0] == args.partition]
+            if not matches:
+                raise ValueError(f"{args.extract} hat keine Partition {args.partition}.")
+            _, offset, length, _ = matches[0]
+        start = time.monotonic()
+        done = extract_range(args.extract, args.output, offset, length)
+        print(f"Fertig: {done} Bytes nach {args.output} ({format_rate(done, time.monotonic() - start)}).")
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+
+
+def main(argv=None):
+    """
+    Headless-Modus: führt die Jobs einer Jobdatei ohne Oberfläche aus (z. B. per SSH oder cron)
+    oder läuft mit --serve als Empfänger für Netzwerkpfade (pkdd://host:port/pfad).
+    Mit --partitions bzw. --extract werden Partitionen eines Images aufgelistet bzw. herauskopiert.
+    """
+    parser = argparse.ArgumentParser(
+        prog="pkddgui.py --headless",
+        description="Führt Kopier-Jobs aus einer JSON- oder YAML-Jobdatei ohne Oberfläche aus."
+    )
+    parser.add_argument("jobfile", nargs="?",
+                        help="Jobdatei (Liste von Jobs mit source, dest, mode, compress, block_size, verify, "
+                             "resumable, rate_limit in MB/s, latency_target in ms, net_compress); block_size: auto "
+                             "misst die schnellste Blockgröße")
+    parser.add_argument("--per-device", type=int, default=1, help="Gleichzeitige Jobs je physischem Laufwerk")
+    parser.add_argument("--max-jobs", type=int, default=None, help="Gleichzeitige Jobs insgesamt")
+    parser.add_argument("--dry-run", action="store_true", help="Jobs nur anzeigen, nicht ausführen")
+    parser.add_argument("--progress-interval", type=float, default=10, help="Sekunden zwischen Fortschrittszeilen")
+    parser.add_argument("--idle-io", action="store_true", help="Mit I/O-Priorität idle arbeiten (wie ionice -c3)")
+    parser.add_argument("--serve", metavar="VERZEICHNIS", help="Als Empfänger laufen und Images unter VERZEICHNIS ablegen")
+    parser.add_argument("--listen", default=f"{NET_DEFAULT_HOST}:{NET_PORT}",
+                        help="Adresse und Port des Empfängers (host:port, Standard nur localhost; "
+                             "0.0.0.0 bzw. [::] für alle Schnittstellen)")
+    parser.add_argument("--token-file", help=f"Datei mit dem Token, das Clients mitschicken müssen "
+                                             f"(Standard: Umgebungsvariable {NET_TOKEN_ENV})")
+    parser.add_argument("--partitions", metavar="IMAGE", help="Partitionen eines Images (roh oder indiziert) auflisten")
+    parser.add_argument("--extract", metavar="IMAGE", help="Partition oder Bytebereich aus einem Image kopieren")
+    parser.add_argument("--partition", type=int, help="Nummer der Partition für --extract")
+    parser.add_argument("--offset", default="0", help="Start des Bereichs für --extract (z. B. 1M)")
+    parser.add_argument("--length", help="Länge des Bereichs für --extract (Standard: bis zum Ende)")
+    parser.add_argument("--output", help="Ziel für --extract (Datei oder Gerät)")
+    args = parser.parse_args(argv)
+    if not (args.jobfile or args.serve or args.partitions or args.extract):
+        parser.error("Jobdatei, --serve, --partitions oder --extract angeben")
+    if args.partitions or args.extract:
+        return extract_main(args, parser)
+
+    io_priority = IOPriority()
+    io_priority.enter()
+    if args.idle_io and not io_priority.set_idle(True):
+        print("Hinweis: I/O-Priorität idle konnte nicht gesetzt werden.", file=sys.stderr)
+
+    if args.serve:
+        host, _, port = args.listen.rpartition(":")
+        try:
+            token = os.environ.get(NET_TOKEN_ENV)
+            if args.token_file:
+                with open(args.token_file, "r", encoding="utf-8") as f:
+                    token = f.read().strip()
+                if not token:
+                    raise ValueError(f"Token-Datei {args.token_file} ist leer.")
+            serve(args.serve, host.strip("[]") or NET_DEFAULT_HOST, int(port),
+                  on_message=lambda text: print(text, flush=True), token=token)
+        except (OSError, ValueError) as e:
+            print(f"Fehler: {e}", file=sys.stderr)
+            return 2
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    lock = threading.Lock()
+
+    def log(job, text):
+        with lock:
+            print(f"[{job.name}] {text}", flush=True)
+
+    def run(job, should_abort):
+        try:
+            ok = run_job(
+                job,
+                on_message=lambda text: log(job, text),
+                on_progress=lambda index, info: log(job, f"{job.dests[index]}: {format_progress(info)}"),
+                should_abort=should_abort,
+                progress_interval=args.progress_interval
+            )
+        except CopyAborted:
+            log(job, "Abgebrochen.")
+            return False
+        except Exception as e:
+            log(job, f"Fehler: {e}")
+            return False
+        return ok
+
+    try:
+        jobs = load_jobs(args.jobfile, args.dry_run)
+        scheduler = JobScheduler(run, args.per_device, args.max_jobs)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+    results = scheduler.run_all(jobs)
+    print(f"{sum(results)} von {len(jobs)} Job(s) erfolgreich.")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
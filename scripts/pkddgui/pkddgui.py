@@ -1,4 +1,4 @@
-#version 0.0.1
+#version 0.1.0
 
 #============================================================================
 #MIT License
@@ -24,116 +24,275 @@
 #DEALINGS IN THE SOFTWARE.
 #============================================================================
 
+import os
 import sys
-import subprocess
+import time
 import shutil
+
+from pkddengine import (
+    DEFAULT_BLOCK_SIZE, BLOCK_SIZES, AUTO_BLOCK_SIZE, COMPRESSIONS, CopyAborted, Job, run_job, get_size_bytes,
+    available_compressions, detect_compression, estimate_compressed_size, format_progress,
+    device_inventory, device_size_bytes, format_size, list_journals, IOPriority, parse_remote, is_remote,
+    net_compressions, NET_SCHEME, ProgressTracker, image_partitions, extract_range, format_rate
+)
+
+# Headless-Modus (pkddgui.py --headless JOBDATEI): Jobs ohne Oberfläche ausführen, Qt wird gar nicht erst geladen
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    import pkddengine
+    sys.argv.remove("--headless")
+    sys.exit(pkddengine.main())
+
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QPushButton,
-    QComboBox, QFileDialog, QCheckBox, QDialog, QMessageBox, QProgressBar, QTextEdit
+    QComboBox, QFileDialog, QCheckBox, QDialog, QMessageBox, QProgressBar, QPlainTextEdit,
+    QListWidget, QListWidgetItem, QInputDialog, QSpinBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 
+# Anzahl Zeilen, die das Protokoll im Fortschrittsdialog behält
+LOG_LINES = 500
+
 # -------------------------------------------------------------------
 #Funktion zum Abrufen der Blockgeräte
 def get_block_devices():
     """
     Ruft alle verfügbaren Blockgeräte und deren Partitionen ab und gibt sie als Liste zurück.
+    Die Daten kommen aus der gemeinsamen, zwischengespeicherten Geräteliste (ohne lsblk).
     """
     try:
-        output = subprocess.check_output(['lsblk', '-ln', '-o', 'NAME,SIZE'], text=True)
         devices = []
-        for line in output.strip().split('\n'):
-            parts = line.split()
-            if len(parts) == 2:
-                name, size = parts
-                devices.append((f"/dev/{name}", size))
+        for device in device_inventory().devices():
+            info = format_size(device.size)
+            if device.mountpoints:
+                info += ", eingehängt: " + " ".join(device.mountpoints)
+            devices.append((device.path, info))
         return devices
     except Exception as e:
         return [("Fehler beim Laden", str(e))]
 
+
+def ask_remote_path(parent, title):
+    """
+    Fragt nach einem Netzwerkpfad (pkdd://host:port/pfad) und gibt ihn zurück, None bei Abbruch.
+    """
+    url, ok = QInputDialog.getText(parent, title, "Netzwerkpfad (Empfänger: pkddgui.py --headless --serve DIR):",
+                                   text=NET_SCHEME)
+    if not ok:
+        return None
+    try:
+        parse_remote(url.strip())
+    except ValueError as e:
+        QMessageBox.warning(parent, title, str(e))
+        return None
+    return url.strip()
+
 # -------------------------------------------------------------------
-#Klasse für den Hintergrundprozess (dd-Kommando)
+#Klasse für den Hintergrundprozess (Kopiervorgang)
 class DDWorker(QThread):
     """
-    Führt das dd-Kommando in einem separaten Thread aus.
+    Führt einen Job (siehe pkddengine.run_job) in einem separaten Thread aus.
+    progress liefert gedrosselt ProgressInfo-Meldungen (siehe ProgressTracker), message Statusmeldungen.
+    Bandbreite und Ziel-Latenz (job.throttle) sowie die I/O-Priorität lassen sich während der Kopie ändern.
     """
-    progress = pyqtSignal(str)
+    progress = pyqtSignal(object)
+    message = pyqtSignal(str)
     finished = pyqtSignal()
 
-    def __init__(self, source, dest, dry_run):
+    def __init__(self, source, dest, dry_run, block_size=DEFAULT_BLOCK_SIZE, strategy="auto", direct=False,
+                 sparse=False, compress=None, decompress=None, delta=False, verify=False, resumable=False,
+                 rescue=False, rate_limit=0, latency_target=0, idle_io=False, net_compress=None):
         super().__init__()
-        self.source = source
-        self.dest = dest
-        self.dry_run = dry_run
+        self.job = Job(source, dest, block_size, strategy, direct, sparse, compress, decompress, delta, verify, dry_run,
+                       resumable=resumable, rescue=rescue, rate_limit=rate_limit, latency_target=latency_target,
+                       net_compress=net_compress)
+        self.idle_io = idle_io
+        self.io_priority = IOPriority()
         self._abort = False
 
     def run(self):
-        if self.dry_run:
-            self.progress.emit(f"[DRY RUN] dd if={self.source} of={self.dest} bs=4M status=progress")
-        else:
-            try:
-                process = subprocess.Popen(
-                    ['dd', f'if={self.source}', f'of={self.dest}', 'bs=4M', 'status=progress'],
-                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
-                )
-                while True:
-                    if self._abort:
-                        process.terminate()
-                        self.progress.emit("Abgebrochen.")
-                        break
-                    line = process.stdout.readline()
-                    if not line:
-                        break
-                    self.progress.emit(line.strip())
-                process.wait()
-            except Exception as e:
-                self.progress.emit(f"Fehler: {e}")
+        self.io_priority.enter()
+        if self.idle_io:
+            self.set_idle_io(True)
+        try:
+            run_job(self.job, self.message.emit, self.emit_progress, lambda: self._abort)
+        except CopyAborted:
+            self.message.emit("Abgebrochen.")
+        except Exception as e:
+            self.message.emit(f"Fehler: {e}")
+        finally:
+            self.io_priority.leave()
         self.finished.emit()
 
+    def set_idle_io(self, idle):
+        """
+        Schaltet die I/O-Priorität idle (wie ionice -c3) ein oder aus; gilt nur für den Worker-Thread
+        und die von ihm gestarteten Kopier-Threads, nicht für die Oberfläche.
+        """
+        self.idle_io = idle
+        if not self.io_priority.set_idle(idle):
+            self.message.emit("Hinweis: I/O-Priorität konnte nicht geändert werden.")
+
+    def emit_progress(self, index, info):
+        """
+        Leitet den Fortschritt des (einzigen) Ziels an progress weiter.
+        """
+        self.progress.emit(info)
+
     def abort(self):
         """
         Setzt das Abbruch-Flag, um den Prozess zu beenden.
         """
         self._abort = True
 
+# -------------------------------------------------------------------
+#Hintergrundprozess zum Klonen auf mehrere Ziele
+class CloneWorker(DDWorker):
+    """
+    Klont die Quelle in einem Lesedurchgang auf mehrere Ziele.
+    target_progress liefert (Index des Ziels, ProgressInfo).
+    """
+    target_progress = pyqtSignal(int, object)
+
+    def __init__(self, source, dests, dry_run, block_size=DEFAULT_BLOCK_SIZE, strategy="auto", direct=False,
+                 verify=False, resumable=False):
+        super().__init__(source, dests, dry_run, block_size, strategy, direct, verify=verify, resumable=resumable)
+        self.dests = dests
+
+    def emit_progress(self, index, info):
+        """
+        Leitet den Fortschritt eines Ziels an target_progress weiter.
+        """
+        self.target_progress.emit(index, info)
+
+# -------------------------------------------------------------------
+#Hintergrundprozess zum Herauskopieren eines Bereichs (Partition) aus einem Image
+class ExtractWorker(DDWorker):
+    """
+    Kopiert length Bytes ab offset aus einem (indizierten oder rohen) Image nach dest.
+    """
+    def __init__(self, image, dest, offset, length):
+        super().__init__(image, dest, False)
+        self.offset = offset
+        self.length = length
+
+    def run(self):
+        try:
+            tracker = ProgressTracker(self.length, lambda info: self.emit_progress(0, info))
+            start = tracker.start
+            done = extract_range(self.job.source, self.job.dests[0], self.offset, self.length,
+                                 self.job.throttle.wrap(tracker.update, lambda: self._abort), lambda: self._abort)
+            tracker.finish()
+            self.message.emit(f"Fertig: {done} Bytes kopiert ({format_rate(done, time.monotonic() - start)}).")
+        except CopyAborted:
+            self.message.emit("Abgebrochen.")
+        except Exception as e:
+            self.message.emit(f"Fehler: {e}")
+        self.finished.emit()
+
 # -------------------------------------------------------------------
 # Dialog zur Anzeige des Fortschritts
 class ProgressDialog(QDialog):
     """
-    Zeigt den Fortschritt des dd-Kommandos an.
+    Zeigt den Fortschritt des Kopiervorgangs an.
+    Mit targets (CloneWorker) bekommt jedes Ziel einen eigenen Fortschrittsbalken.
+    Das Protokoll behält nur die letzten LOG_LINES Zeilen, damit lange Jobs den Speicher nicht füllen.
     """
-    def __init__(self, worker):
+    def __init__(self, worker, targets=None):
         super().__init__()
         self.setWindowTitle("Fortschritt")
         self.resize(500, 300)
 
         self.worker = worker
         self.layout = QVBoxLayout()
-        self.output = QTextEdit()
+        self.output = QPlainTextEdit()
         self.output.setReadOnly(True)
+        self.output.setMaximumBlockCount(LOG_LINES)
         self.progress = QProgressBar()
+        self.progress.setRange(0, 1000)
+        self.stats = QLabel("")
         self.abort_button = QPushButton("Abbrechen")
 
+        # Begrenzung während der Kopie ändern
+        throttle = self.worker.job.throttle
+        self.rate_limit = QSpinBox()
+        self.rate_limit.setRange(0, 100000)
+        self.rate_limit.setSuffix(" MB/s")
+        self.rate_limit.setSpecialValueText("unbegrenzt")
+        self.rate_limit.setValue(int(throttle.rate / 1e6))
+        self.latency_target = QSpinBox()
+        self.latency_target.setRange(0, 10000)
+        self.latency_target.setSuffix(" ms")
+        self.latency_target.setSpecialValueText("aus")
+        self.latency_target.setValue(int(throttle.latency_target))
+        self.idle_io = QCheckBox("Niedrige I/O-Priorität (idle)")
+        self.idle_io.setChecked(self.worker.idle_io)
+
         self.layout.addWidget(self.output)
         self.layout.addWidget(self.progress)
+        self.layout.addWidget(self.stats)
+        self.targets = targets or []
+        self.target_bars = []
+        for target in self.targets:
+            bar = QProgressBar()
+            bar.setRange(0, 1000)
+            bar.setFormat(f"{target}: %p%")
+            self.target_bars.append(bar)
+            self.layout.addWidget(bar)
+        self.layout.addWidget(QLabel("Bandbreite je Ziel (nur Schreiben, Verifizieren ungebremst):"))
+        self.layout.addWidget(self.rate_limit)
+        self.layout.addWidget(QLabel("Ziel-Latenz (automatisch bremsen):"))
+        self.layout.addWidget(self.latency_target)
+        self.layout.addWidget(self.idle_io)
         self.layout.addWidget(self.abort_button)
         self.setLayout(self.layout)
 
         self.abort_button.clicked.connect(self.on_abort)
+        self.rate_limit.valueChanged.connect(lambda value: throttle.set_rate(value * 1e6))
+        self.latency_target.valueChanged.connect(throttle.set_latency_target)
+        self.idle_io.toggled.connect(self.worker.set_idle_io)
 
         self.worker.progress.connect(self.on_progress)
+        if self.target_bars:
+            self.progress.hide()
+            self.worker.target_progress.connect(self.on_target_progress)
+        self.worker.message.connect(self.on_message)
         self.worker.finished.connect(self.on_finished)
         self.worker.start()
 
-    def on_progress(self, text):
+    def on_progress(self, info):
+        """
+        Aktualisiert Fortschrittsbalken und Statistik anhand einer ProgressInfo.
+        """
+        if info.total:
+            self.progress.setValue(min(1000, info.done * 1000 // info.total))
+        self.progress.setFormat(f"{info.phase}: {info.done / 1024 / 1024:.0f} MiB")
+        self.show_stats(info)
+
+    def on_target_progress(self, index, info):
+        """
+        Aktualisiert den Fortschrittsbalken eines einzelnen Ziels.
+        """
+        if info.total:
+            self.target_bars[index].setValue(min(1000, info.done * 1000 // info.total))
+        self.target_bars[index].setFormat(f"{self.targets[index]}: {info.phase} %p% ({info.average / 1e6:.1f} MB/s)")
+        self.show_stats(info)
+
+    def show_stats(self, info):
         """
-        Aktualisiert die Textausgabe mit dem aktuellen Fortschritt.
+        Zeigt die Statistik und, falls aktiv, Limit und gemessene Latenz an.
         """
-        self.output.append(text)
+        limit = self.worker.job.throttle.describe()
+        self.stats.setText(f"{format_progress(info)}\n{limit}" if limit else format_progress(info))
+
+    def on_message(self, text):
+        """
+        Hängt eine Statusmeldung an das Protokoll an (älteste Zeilen fallen heraus).
+        """
+        self.output.appendPlainText(text)
 
     def on_finished(self):
         """
-        Wird aufgerufen, wenn der dd-Prozess abgeschlossen ist.
+        Wird aufgerufen, wenn der Kopiervorgang abgeschlossen ist.
         """
         self.abort_button.setText("Beenden")
 
@@ -167,7 +326,34 @@ class DiskToImageWindow(QWidget):
             self.source_combo.addItem(f"{dev} ({size})", dev)
 
         self.target_button = QPushButton("Ziel-Image-Datei wählen...")
+        self.remote_button = QPushButton("Netzwerkziel (pkdd://host:port/pfad)...")
         self.target_label = QLabel("Kein Ziel gewählt.")
+        self.block_size_combo = QComboBox()
+        for label, size in BLOCK_SIZES:
+            self.block_size_combo.addItem(label, size)
+        self.block_size_combo.addItem("Auto (messen)", AUTO_BLOCK_SIZE)
+        self.block_size_combo.setCurrentIndex(self.block_size_combo.findData(DEFAULT_BLOCK_SIZE))
+        self.pipeline = QCheckBox("Lesen und Schreiben parallel (Pipeline)")
+        self.direct_io = QCheckBox("O_DIRECT (Page-Cache umgehen)")
+        self.sparse = QCheckBox("Sparse-Image (leere Blöcke überspringen)")
+        self.delta = QCheckBox("Delta (nur geänderte Blöcke ins vorhandene Image schreiben)")
+        self.rescue = QCheckBox("Rettungsmodus (Lesefehler überspringen und später erneut versuchen)")
+        self.compression_combo = QComboBox()
+        self.compression_combo.addItem("Keine", None)
+        for fmt in available_compressions():
+            self.compression_combo.addItem(fmt, fmt)
+        self.verify = QCheckBox("Verifizieren (Ziel nach dem Kopieren mit der Quelle vergleichen)")
+        self.resumable = QCheckBox("Fortsetzbar (Checkpoint-Journal, nach Abbruch im Hauptmenü fortsetzen)")
+        self.rate_limit = QSpinBox()
+        self.rate_limit.setRange(0, 100000)
+        self.rate_limit.setSuffix(" MB/s")
+        self.rate_limit.setSpecialValueText("unbegrenzt")
+        self.latency_target = QSpinBox()
+        self.latency_target.setRange(0, 10000)
+        self.latency_target.setSuffix(" ms")
+        self.latency_target.setSpecialValueText("aus")
+        self.idle_io = QCheckBox("Niedrige I/O-Priorität (idle, wie ionice -c3)")
+        self.net_compress = QCheckBox("Netzwerk: Chunks komprimiert übertragen")
         self.dry_run = QCheckBox("Dry Run (nur anzeigen, nicht ausführen)")
         self.run_button = QPushButton("Starten")
         self.back_button = QPushButton("Zurück zur Aktionsauswahl")
@@ -175,13 +361,32 @@ class DiskToImageWindow(QWidget):
         layout.addWidget(QLabel("Quelle:"))
         layout.addWidget(self.source_combo)
         layout.addWidget(self.target_button)
+        layout.addWidget(self.remote_button)
         layout.addWidget(self.target_label)
+        layout.addWidget(QLabel("Blockgröße:"))
+        layout.addWidget(self.block_size_combo)
+        layout.addWidget(self.pipeline)
+        layout.addWidget(self.direct_io)
+        layout.addWidget(self.sparse)
+        layout.addWidget(self.delta)
+        layout.addWidget(self.rescue)
+        layout.addWidget(QLabel("Kompression:"))
+        layout.addWidget(self.compression_combo)
+        layout.addWidget(self.verify)
+        layout.addWidget(self.resumable)
+        layout.addWidget(QLabel("Bandbreite je Ziel (nur Schreiben, im Fortschrittsdialog änderbar):"))
+        layout.addWidget(self.rate_limit)
+        layout.addWidget(QLabel("Ziel-Latenz des Ziel-Laufwerks (automatisch bremsen):"))
+        layout.addWidget(self.latency_target)
+        layout.addWidget(self.idle_io)
+        layout.addWidget(self.net_compress)
         layout.addWidget(self.dry_run)
         layout.addWidget(self.run_button)
         layout.addWidget(self.back_button)
         self.setLayout(layout)
 
         self.target_button.clicked.connect(self.choose_file)
+        self.remote_button.clicked.connect(self.choose_remote)
         self.run_button.clicked.connect(self.start_dd)
         self.back_button.clicked.connect(self.go_back)
 
@@ -196,11 +401,20 @@ class DiskToImageWindow(QWidget):
         """
         Öffnet einen Dialog zur Auswahl der Ziel-Image-Datei.
         """
-        path, _ = QFileDialog.getSaveFileName(self, "Ziel-Datei wählen", "", "Image-Dateien (*.img);;Alle Dateien (*)")
+        path, _ = QFileDialog.getSaveFileName(self, "Ziel-Datei wählen", "", "Image-Dateien (*.img *.img.gz *.img.xz *.img.zst *.img.pkdi);;Alle Dateien (*)")
         if path:
             self.target_label.setText(path)
             self.target_path = path
 
+    def choose_remote(self):
+        """
+        Fragt nach einem Netzwerkziel; das Image wird dann direkt zum Empfänger gestreamt.
+        """
+        url = ask_remote_path(self, "Netzwerkziel")
+        if url:
+            self.target_label.setText(url)
+            self.target_path = url
+
     def start_dd(self):
         source = self.source_combo.currentData()
         target = getattr(self, "target_path", None)
@@ -208,18 +422,45 @@ class DiskToImageWindow(QWidget):
             self.target_label.setText("❗ Ziel nicht gewählt!")
             return
     
-        # Überprüft den verfügbaren Speicherplatz
-        free = shutil.disk_usage(target.rsplit("/", 1)[0]).free
-        source_size = self.get_device_size_bytes(source)
-        if source_size and source_size > free:
-            self.target_label.setText("❗ Nicht genug Speicherplatz!")
+        # Komprimierte Images bekommen die passende Dateiendung
+        compression = self.compression_combo.currentData()
+        delta = self.delta.isChecked()
+        if delta and compression:
+            self.target_label.setText("❗ Delta-Modus nur für unkomprimierte Images!")
+            return
+        if self.rescue.isChecked() and compression:
+            self.target_label.setText("❗ Rettungsmodus nur für unkomprimierte Images!")
+            return
+        remote = is_remote(target)
+        if remote and (compression or delta or self.sparse.isChecked() or self.rescue.isChecked()
+                       or self.resumable.isChecked()):
+            self.target_label.setText("❗ Netzwerkziele nur ohne Kompression, Sparse, Delta, Rettung und Journal!")
+            return
+        if compression and not target.endswith(COMPRESSIONS[compression][0]):
+            target += COMPRESSIONS[compression][0]
+            self.target_label.setText(target)
+
+        # Überprüft den verfügbaren Speicherplatz (ein Sparse-Image belegt nur die Datenblöcke,
+        # für komprimierte Images wird die Größe anhand von Stichproben geschätzt)
+        free = shutil.disk_usage(target.rsplit("/", 1)[0]).free if not remote else None
+        source_size = device_size_bytes(source)
+        required = source_size
+        if compression and source_size:
+            try:
+                required = estimate_compressed_size(source, compression, source_size)
+            except OSError:
+                required = source_size
+        elif delta and source_size and os.path.exists(target):
+            required = max(0, source_size - os.path.getsize(target))
+        if required and free is not None and required > free and not self.sparse.isChecked():
+            self.target_label.setText(f"❗ Nicht genug Speicherplatz! (benötigt ca. {required / 1024 ** 3:.1f} GiB)")
             return
     
         # Sicherheitsabfrage
         reply = QMessageBox.question(
             self,
             "Bestätigung erforderlich",
-            f"Sind Sie sicher, dass Sie den Vorgang mit dd starten möchten?\n\nQuelle: {source}\nZiel: {target}",
+            f"Sind Sie sicher, dass Sie den Kopiervorgang starten möchten?\n\nQuelle: {source}\nZiel: {target}",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             QMessageBox.StandardButton.No
         )
@@ -228,22 +469,16 @@ class DiskToImageWindow(QWidget):
             return  # Abbrechen, wenn der Benutzer nicht bestätigt
 
         dry = self.dry_run.isChecked()
-        self.worker = DDWorker(source, target, dry)
+        self.worker = DDWorker(source, target, dry, self.block_size_combo.currentData(),
+                               "pipeline" if self.pipeline.isChecked() else "auto", self.direct_io.isChecked(),
+                               sparse=self.sparse.isChecked(), compress=compression, delta=delta,
+                               verify=self.verify.isChecked(), resumable=self.resumable.isChecked(),
+                               rescue=self.rescue.isChecked(), rate_limit=self.rate_limit.value() * 1e6,
+                               latency_target=self.latency_target.value(), idle_io=self.idle_io.isChecked(),
+                               net_compress=net_compressions()[0] if self.net_compress.isChecked() else None)
         self.dialog = ProgressDialog(self.worker)
         self.dialog.exec()
 
-## -------------------------------------------------------------------
-#Diskgrösse ermitteln
-    def get_device_size_bytes(self, device):
-        """
-        Gibt die Größe des Geräts in Bytes zurück.
-        """
-        try:
-            output = subprocess.check_output(['blockdev', '--getsize64', device], text=True)
-            return int(output.strip())
-        except Exception:
-            return None
-
 ## -------------------------------------------------------------------
 #Image to Disk/Partition
 class ImageToDiskWindow(QWidget):
@@ -260,26 +495,44 @@ class ImageToDiskWindow(QWidget):
         layout = QVBoxLayout()
 
         self.image_button = QPushButton("Image-Datei wählen...")
+        self.remote_button = QPushButton("Image vom Netzwerk (pkdd://host:port/pfad)...")
         self.image_label = QLabel("Kein Image gewählt.")
         self.dest_combo = QComboBox()
         self.devices = get_block_devices()
         for dev, size in self.devices:
             self.dest_combo.addItem(f"{dev} ({size})", dev)
 
+        self.block_size_combo = QComboBox()
+        for label, size in BLOCK_SIZES:
+            self.block_size_combo.addItem(label, size)
+        self.block_size_combo.addItem("Auto (messen)", AUTO_BLOCK_SIZE)
+        self.block_size_combo.setCurrentIndex(self.block_size_combo.findData(DEFAULT_BLOCK_SIZE))
+        self.pipeline = QCheckBox("Lesen und Schreiben parallel (Pipeline)")
+        self.direct_io = QCheckBox("O_DIRECT (Page-Cache umgehen)")
+        self.verify = QCheckBox("Verifizieren (Ziel nach dem Kopieren mit der Quelle vergleichen)")
+        self.resumable = QCheckBox("Fortsetzbar (Checkpoint-Journal, nach Abbruch im Hauptmenü fortsetzen)")
         self.dry_run = QCheckBox("Dry Run (nur anzeigen, nicht ausführen)")
         self.run_button = QPushButton("Starten")
         self.back_button = QPushButton("Zurück zur Aktionsauswahl")
 
         layout.addWidget(self.image_button)
+        layout.addWidget(self.remote_button)
         layout.addWidget(self.image_label)
         layout.addWidget(QLabel("Ziel:"))
         layout.addWidget(self.dest_combo)
+        layout.addWidget(QLabel("Blockgröße:"))
+        layout.addWidget(self.block_size_combo)
+        layout.addWidget(self.pipeline)
+        layout.addWidget(self.direct_io)
+        layout.addWidget(self.verify)
+        layout.addWidget(self.resumable)
         layout.addWidget(self.dry_run)
         layout.addWidget(self.run_button)
         layout.addWidget(self.back_button)
         self.setLayout(layout)
 
         self.image_button.clicked.connect(self.choose_file)
+        self.remote_button.clicked.connect(self.choose_remote)
         self.run_button.clicked.connect(self.start_dd)
         self.back_button.clicked.connect(self.go_back)
 
@@ -294,14 +547,23 @@ class ImageToDiskWindow(QWidget):
         """
         Öffnet einen Dialog zur Auswahl der Image-Datei.
         """
-        path, _ = QFileDialog.getOpenFileName(self, "Image-Datei wählen", "", "Image-Dateien (*.img);;Alle Dateien (*)")
+        path, _ = QFileDialog.getOpenFileName(self, "Image-Datei wählen", "", "Image-Dateien (*.img *.img.gz *.img.xz *.img.zst *.img.pkdi);;Alle Dateien (*)")
         if path:
             self.image_label.setText(path)
             self.image_path = path
 
+    def choose_remote(self):
+        """
+        Fragt nach einem Image auf einem Empfänger; es wird beim Zurückschreiben direkt gestreamt.
+        """
+        url = ask_remote_path(self, "Image vom Netzwerk")
+        if url:
+            self.image_label.setText(url)
+            self.image_path = url
+
     def start_dd(self):
         """
-        Startet den dd-Prozess mit den ausgewählten Parametern.
+        Startet den Kopiervorgang mit den ausgewählten Parametern.
         """
         image = getattr(self, "image_path", None)
         dest = self.dest_combo.currentData()
@@ -309,32 +571,39 @@ class ImageToDiskWindow(QWidget):
             self.image_label.setText("❗ Image nicht gewählt!")
             return
 
+        # Komprimierte Images werden beim Zurückschreiben entpackt (Netzwerk-Images werden unverändert gestreamt)
+        remote = is_remote(image)
+        if remote and self.resumable.isChecked():
+            self.image_label.setText("❗ Netzwerk-Images sind nicht fortsetzbar!")
+            return
+        compression = detect_compression(image) if not remote else None
+        if compression and compression not in available_compressions():
+            self.image_label.setText(f"❗ {compression}-Images benötigen python-zstandard!")
+            return
+
         # Überprüft die Größe des Images und den verfügbaren Speicherplatz
-        image_size = os.path.getsize(image)
-        dest_size = self.get_device_size_bytes(dest)
-        if dest_size and image_size > dest_size:
+        # (die entpackte Größe komprimierter Images ist vorab nicht bekannt)
+        image_size = get_size_bytes(image) if remote else os.path.getsize(image)
+        if image_size is None:
+            self.image_label.setText("❗ Image auf dem Empfänger nicht gefunden!")
+            return
+        dest_size = device_size_bytes(dest)
+        if dest_size and image_size > dest_size and not compression:
             self.image_label.setText("❗ Image größer als Zielgerät!")
             return
 
         dry = self.dry_run.isChecked()
-        self.worker = DDWorker(image, dest, dry)
+        self.worker = DDWorker(image, dest, dry, self.block_size_combo.currentData(),
+                               "pipeline" if self.pipeline.isChecked() else "auto", self.direct_io.isChecked(),
+                               decompress=compression, verify=self.verify.isChecked(),
+                               resumable=self.resumable.isChecked())
         self.dialog = ProgressDialog(self.worker)
         self.dialog.exec()
-
-    def get_device_size_bytes(self, device):
-        """
-        Gibt die Größe des Geräts in Bytes zurück.
-        """
-        try:
-            output = subprocess.check_output(['blockdev', '--getsize64', device], text=True)
-            return int(output.strip())
-        except Exception:
-            return None
             
 # Klonen
 class DiskToDiskWindow(QWidget):
     """
-    Fenster zur Auswahl des Quell- und Ziellaufwerks für das Klonen.
+    Fenster zur Auswahl des Quelllaufwerks und eines oder mehrerer Ziellaufwerke für das Klonen.
     """
     back_to_menu = pyqtSignal()
 
@@ -346,20 +615,41 @@ class DiskToDiskWindow(QWidget):
         layout = QVBoxLayout()
 
         self.source_combo = QComboBox()
-        self.dest_combo = QComboBox()
+        self.dest_list = QListWidget()
         self.devices = get_block_devices()
         for dev, size in self.devices:
             self.source_combo.addItem(f"{dev} ({size})", dev)
-            self.dest_combo.addItem(f"{dev} ({size})", dev)
-
+            item = QListWidgetItem(f"{dev} ({size})")
+            item.setData(Qt.ItemDataRole.UserRole, dev)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.dest_list.addItem(item)
+
+        self.block_size_combo = QComboBox()
+        for label, size in BLOCK_SIZES:
+            self.block_size_combo.addItem(label, size)
+        self.block_size_combo.addItem("Auto (messen)", AUTO_BLOCK_SIZE)
+        self.block_size_combo.setCurrentIndex(self.block_size_combo.findData(DEFAULT_BLOCK_SIZE))
+        self.pipeline = QCheckBox("Lesen und Schreiben parallel (Pipeline)")
+        self.direct_io = QCheckBox("O_DIRECT (Page-Cache umgehen)")
+        self.verify = QCheckBox("Verifizieren (Ziel nach dem Kopieren mit der Quelle vergleichen)")
+        self.resumable = QCheckBox("Fortsetzbar (Checkpoint-Journal, nach Abbruch im Hauptmenü fortsetzen)")
+        self.rescue = QCheckBox("Rettungsmodus (Lesefehler überspringen, nur ein Ziel)")
         self.dry_run = QCheckBox("Dry Run (nur anzeigen, nicht ausführen)")
         self.run_button = QPushButton("Starten")
         self.back_button = QPushButton("Zurück zur Aktionsauswahl")
 
         layout.addWidget(QLabel("Quelllaufwerk:"))
         layout.addWidget(self.source_combo)
-        layout.addWidget(QLabel("Ziellaufwerk:"))
-        layout.addWidget(self.dest_combo)
+        layout.addWidget(QLabel("Ziellaufwerke (mehrere möglich):"))
+        layout.addWidget(self.dest_list)
+        layout.addWidget(QLabel("Blockgröße:"))
+        layout.addWidget(self.block_size_combo)
+        layout.addWidget(self.pipeline)
+        layout.addWidget(self.direct_io)
+        layout.addWidget(self.verify)
+        layout.addWidget(self.resumable)
+        layout.addWidget(self.rescue)
         layout.addWidget(self.dry_run)
         layout.addWidget(self.run_button)
         layout.addWidget(self.back_button)
@@ -377,36 +667,51 @@ class DiskToDiskWindow(QWidget):
 
     def start_dd(self):
         """
-        Startet den dd-Prozess mit den ausgewählten Parametern.
+        Startet den Kopiervorgang mit den ausgewählten Parametern.
         """
         source = self.source_combo.currentData()
-        dest = self.dest_combo.currentData()
+        dests = [
+            self.dest_list.item(i).data(Qt.ItemDataRole.UserRole)
+            for i in range(self.dest_list.count())
+            if self.dest_list.item(i).checkState() == Qt.CheckState.Checked
+        ]
+
+        if not dests:
+            QMessageBox.warning(self, "Fehler", "Bitte mindestens ein Ziellaufwerk wählen.")
+            return
 
-        if source == dest:
+        if source in dests:
             QMessageBox.warning(self, "Fehler", "Quell- und Ziellaufwerk dürfen nicht identisch sein.")
             return
 
         # Überprüft die Größe der Laufwerke
-        source_size = self.get_device_size_bytes(source)
-        dest_size = self.get_device_size_bytes(dest)
-        if source_size and dest_size and source_size > dest_size:
-            QMessageBox.warning(self, "Fehler", "Ziellaufwerk ist kleiner als das Quelllaufwerk.")
+        source_size = device_size_bytes(source)
+        for dest in dests:
+            dest_size = device_size_bytes(dest)
+            if source_size and dest_size and source_size > dest_size:
+                QMessageBox.warning(self, "Fehler", f"Ziellaufwerk {dest} ist kleiner als das Quelllaufwerk.")
+                return
+
+        if self.rescue.isChecked() and len(dests) > 1:
+            QMessageBox.warning(self, "Fehler", "Der Rettungsmodus kopiert nur auf ein Ziellaufwerk.")
             return
 
         dry = self.dry_run.isChecked()
-        self.worker = DDWorker(source, dest, dry)
-        self.dialog = ProgressDialog(self.worker)
+        strategy = "pipeline" if self.pipeline.isChecked() else "auto"
+        if len(dests) > 1:
+            # Mehrere Ziele: Quelle nur einmal lesen, jedes Ziel mit eigenem Schreib-Thread;
+            # Pipeline und Journal gibt es dabei nicht, run_job weist darauf hin
+            self.worker = CloneWorker(source, dests, dry, self.block_size_combo.currentData(), strategy,
+                                      self.direct_io.isChecked(), verify=self.verify.isChecked(),
+                                      resumable=self.resumable.isChecked())
+            self.dialog = ProgressDialog(self.worker, dests)
+        else:
+            self.worker = DDWorker(source, dests[0], dry, self.block_size_combo.currentData(), strategy,
+                                   self.direct_io.isChecked(), verify=self.verify.isChecked(),
+                                   resumable=self.resumable.isChecked(), rescue=self.rescue.isChecked())
+            self.dialog = ProgressDialog(self.worker)
         self.dialog.exec()
 
-    def get_device_size_bytes(self, device):
-        """
-        Gibt die Größe des Geräts in Bytes zurück.
-        """
-        try:
-            output = subprocess.check_output(['blockdev', '--getsize64', device], text=True)
-            return int(output.strip())
-        except Exception:
-            return None
 
 # -------------------------------------------------------------------
 #Hauptmenü zur Funktionsauswahl
@@ -424,7 +729,9 @@ class ActionSelector(QDialog):
         self.combo.addItems([
             "Disk/Partition → Image",
             "Image → Disk/Partition",
-            "Laufwerk → Laufwerk"
+            "Laufwerk → Laufwerk",
+            "Abgebrochene Kopie fortsetzen",
+            "Partition aus Image kopieren"
         ])
         self.button = QPushButton("Ausführen")
 
@@ -455,6 +762,68 @@ class ActionSelector(QDialog):
             self.window = DiskToDiskWindow()
             self.window.back_to_menu.connect(self.show_again)
             self.window.show()
+        elif index == 3:
+            self.resume()
+        elif index == 4:
+            self.extract()
+
+    def resume(self):
+        """
+        Setzt eine abgebrochene oder unterbrochene Kopie am letzten Checkpoint fort.
+        """
+        journals = list_journals()
+        if not journals:
+            QMessageBox.information(self, "Fortsetzen", "Es gibt keine fortsetzbare Kopie.")
+            return
+        labels = [
+            f"{journal['source']} → {journal['dest']} ({journal['offset'] * 100 // max(journal['size'], 1)} %)"
+            for journal in journals
+        ]
+        label, ok = QInputDialog.getItem(self, "Fortsetzen", "Kopie wählen:", labels, 0, False)
+        if not ok:
+            return
+        journal = journals[labels.index(label)]
+        reply = QMessageBox.question(
+            self,
+            "Bestätigung erforderlich",
+            f"Kopiervorgang fortsetzen?\n\nQuelle: {journal['source']}\nZiel: {journal['dest']}",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        self.worker = DDWorker(journal["source"], journal["dest"], False)
+        self.worker.job = Job.from_journal(journal)
+        self.dialog = ProgressDialog(self.worker)
+        self.dialog.exec()
+
+    def extract(self):
+        """
+        Kopiert eine Partition aus einem Image heraus; bei indizierten Images werden nur die
+        betroffenen Chunks gelesen und entpackt.
+        """
+        image, _ = QFileDialog.getOpenFileName(self, "Image-Datei wählen", "", "Image-Dateien (*.img *.img.pkdi);;Alle Dateien (*)")
+        if not image:
+            return
+        try:
+            partitions = image_partitions(image)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Partition kopieren", str(e))
+            return
+        if not partitions:
+            QMessageBox.information(self, "Partition kopieren", "Keine Partitionstabelle gefunden (GPT oder MBR).")
+            return
+        labels = [f"{number}: {format_size(size)} ab {format_size(start)} {name}" for number, start, size, name in partitions]
+        label, ok = QInputDialog.getItem(self, "Partition kopieren", "Partition wählen:", labels, 0, False)
+        if not ok:
+            return
+        _, start, size, _ = partitions[labels.index(label)]
+        dest, _ = QFileDialog.getSaveFileName(self, "Ziel-Datei wählen", "", "Image-Dateien (*.img);;Alle Dateien (*)")
+        if not dest:
+            return
+        self.worker = ExtractWorker(image, dest, start, size)
+        self.dialog = ProgressDialog(self.worker)
+        self.dialog.exec()
 
     def show_again(self):
         """
@@ -0,0 +1,239 @@
+#version 0.0.1
+
+#============================================================================
+#MIT License
+#
+#Copyright (c) 2025 Peter Kasparak <peter.kasparak@gmail.com>
+#
+#Permission is hereby granted, free of charge, to any person obtaining a copy
+#of this software and associated documentation files (the "Software"), to deal
+#in the Software without restriction, including without limitation the rights
+#to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#copies of the Software, and to permit persons to whom the Software is
+#furnished to do so, subject to the following conditions:
+#
+#The above copyright notice and this permission notice shall be included in
+#all copies or substantial portions of the Software.
+#
+#THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#DEALINGS IN THE SOFTWARE.
+#============================================================================
+
+# Benchmark für das Syntaxhighlighting von pkmangui.py: vergleicht die früheren Regeln (Muster als Strings,
+# re pro Block importiert) mit den vorkompilierten Regeln und misst mit Qt, wie lange das Anzeigen einer
+# großen Manpage mit sofortigem bzw. verzögertem Highlighting dauert.
+#
+#   python3 bench_pkmangui.py                      # synthetische Manpage mit 20000 Zeilen
+#   python3 bench_pkmangui.py --page bash --repeat 5
+#   python3 bench_pkmangui.py --file perltoc.txt --json highlight.json
+#   python3 bench_pkmangui.py --no-qt              # nur die Regeln, ohne Fenster
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+
+# Ohne Display läuft Qt mit der offscreen-Plattform
+if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pkmangui
+
+# Regeln von ManSyntaxHighlighter vor der Umstellung, zum Vergleich
+LEGACY_RULES = [
+    (r"^[A-Z\s]+$", "header"),
+    (r"^[A-Z][A-Z\s]+:$", "section"),
+    (r"(--?\w+)", "option"),
+    (r"https?://[^\s]+", "url"),
+]
+
+# Bausteine der synthetischen Manpage
+SAMPLE_LINES = [
+    "NAME",
+    "       tool - do something useful with files",
+    "",
+    "SYNOPSIS",
+    "       tool [-a] [--recursive] [--block-size=SIZE] FILE...",
+    "",
+    "OPTIONS:",
+    "       -a, --all",
+    "              do not ignore entries starting with . and include --hidden ones",
+    "       -r, -R, --recursive",
+    "              visit directories recursively; see https://www.gnu.org/software/coreutils/ for details",
+    "       Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt",
+    "       ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation.",
+]
+
+
+def synthetic_page(lines):
+    """
+    Erzeugt eine Manpage mit der gewünschten Zeilenzahl aus typischen Zeilen.
+    """
+    return "\n".join(SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(lines))
+
+
+def render_page(name):
+    """
+    Rendert eine installierte Manpage wie der Viewer (man | col -b).
+    """
+    env = dict(os.environ, MANWIDTH=str(pkmangui.MANWIDTH))
+    man = subprocess.Popen(["man", name], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+    col = subprocess.run(["col", "-b"], stdin=man.stdout, stdout=subprocess.PIPE, check=True)
+    man.stdout.close()
+    man.wait()
+    return col.stdout.decode("utf-8", errors="ignore")
+
+
+def legacy_highlight(lines):
+    """
+    Früheres highlightBlock ohne Qt: Muster pro Block über den re-Cache, re bei jeder Regel importiert.
+    """
+    count = 0
+    for text in lines:
+        for pattern, name in LEGACY_RULES:
+            import re
+            for match in re.finditer(pattern, text, re.MULTILINE):
+                count += 1
+    return count
+
+
+def compiled_highlight(lines):
+    """
+    Aktuelles highlightBlock ohne Qt: vorkompilierte Zeilenregeln und ein Durchlauf für Optionen/URLs.
+    """
+    spans = pkmangui.ManSyntaxHighlighter.spans
+    count = 0
+    for text in lines:
+        count += len(spans(text))
+    return count
+
+
+def median_time(func, repeat, *args):
+    """
+    Führt func repeat-mal aus und gibt den Median der Laufzeiten in Sekunden zurück.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def qt_load(app, text, mode, legacy_class):
+    """
+    Zeigt text in einem QPlainTextEdit wie der Viewer an und gibt (Zeit bis zur Anzeige, Zeit bis alles formatiert ist) zurück.
+    mode: "legacy" (frühere Regeln), "eager" (alle Zeilen sofort) oder "lazy" (sichtbare Zeilen sofort, Rest im Leerlauf).
+    """
+    from PyQt6.QtWidgets import QPlainTextEdit
+
+    edit = QPlainTextEdit()
+    edit.setReadOnly(True)
+    edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+    edit.resize(800, 600)
+    if mode == "legacy":
+        highlighter = legacy_class(edit.document())
+    else:
+        highlighter = pkmangui.ManSyntaxHighlighter(edit.document(), lazy=(mode == "lazy"))
+        highlighter.set_visible(0, 50)
+
+    start = time.perf_counter()
+    edit.setPlainText(text)
+    app.processEvents()
+    shown = time.perf_counter() - start
+    if mode == "lazy":
+        while highlighter.pending:
+            app.processEvents()
+    done = time.perf_counter() - start
+    edit.deleteLater()
+    return shown, done
+
+
+def make_legacy_highlighter():
+    """
+    Baut die frühere Highlighter-Klasse (Regeln als Strings, re pro Block importiert) für den Qt-Vergleich.
+    """
+    from PyQt6.QtGui import QSyntaxHighlighter
+
+    class Legacy(QSyntaxHighlighter):
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            current = pkmangui.ManSyntaxHighlighter(None)
+            self.rules = [(pattern, current.formats[name]) for pattern, name in LEGACY_RULES]
+
+        def highlightBlock(self, text):
+            for pattern, fmt in self.rules:
+                import re
+                for match in re.finditer(pattern, text, re.MULTILINE):
+                    start, end = match.span()
+                    self.setFormat(start, end - start, fmt)
+
+    return Legacy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark: Syntaxhighlighting von pkmangui")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--page", help="Installierte Manpage rendern und messen (z. B. bash)")
+    source.add_argument("--file", help="Bereits gerenderten Text aus einer Datei messen")
+    parser.add_argument("--lines", type=int, default=20000, help="Zeilen der synthetischen Manpage")
+    parser.add_argument("--repeat", type=int, default=3, help="Messungen je Verfahren (Median wird berichtet)")
+    parser.add_argument("--no-qt", action="store_true", help="Nur die Regeln messen, ohne QPlainTextEdit")
+    parser.add_argument("--json", help="Ergebnisse als JSON schreiben")
+    args = parser.parse_args()
+
+    if args.page:
+        text, label = render_page(args.page), args.page
+    elif args.file:
+        with open(args.file, encoding="utf-8", errors="ignore") as f:
+            text, label = f.read(), os.path.basename(args.file)
+    else:
+        text, label = synthetic_page(args.lines), "synthetic"
+    lines = text.split("\n")
+    print(f"{label}: {len(lines)} Zeilen")
+
+    results = []
+    print(f"{'Verfahren':<24}{'Anzeige (ms)':>14}{'gesamt (ms)':>14}{'Zeilen/s':>14}")
+
+    def report(method, shown, done):
+        results.append({"method": method, "shown_ms": shown * 1000, "total_ms": done * 1000,
+                        "lines_per_s": len(lines) / done if done else 0.0})
+        print(f"{method:<24}{shown * 1000:>14.1f}{done * 1000:>14.1f}{len(lines) / done if done else 0:>14.0f}")
+
+    for method, func in (("rules:legacy", legacy_highlight), ("rules:compiled", compiled_highlight)):
+        elapsed = median_time(func, args.repeat, lines)
+        report(method, elapsed, elapsed)
+
+    if not args.no_qt:
+        from PyQt6.QtWidgets import QApplication
+
+        app = QApplication.instance() or QApplication(sys.argv)
+        legacy_class = make_legacy_highlighter()
+        for mode in ("legacy", "eager", "lazy"):
+            runs = [qt_load(app, text, mode, legacy_class) for _ in range(args.repeat)]
+            report(f"qt:{mode}", statistics.median(r[0] for r in runs), statistics.median(r[1] for r in runs))
+
+    if args.json:
+        meta = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "page": label,
+            "lines": len(lines),
+            "repeat": args.repeat,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
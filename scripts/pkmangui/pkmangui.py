@@ -24,58 +24,751 @@
 #DEALINGS IN THE SOFTWARE.
 #============================================================================
 
+import os
+import re
 import sys
+import bisect
+import mmap
 import subprocess
 import shutil
+import tempfile
+import zlib
+import gzip
+import json
+import hashlib
+import heapq
+import math
+import sqlite3
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QListWidget, QPushButton, QLabel, QLineEdit, QFileDialog,
-    QTextEdit, QComboBox, QMessageBox
+    QListWidget, QListWidgetItem, QListView, QPushButton, QLabel, QLineEdit, QFileDialog,
+    QTextEdit, QPlainTextEdit, QCheckBox, QComboBox, QMessageBox
 )
 from PyQt6.QtGui import QTextCharFormat, QColor, QFont, QSyntaxHighlighter, QTextCursor
-from PyQt6.QtCore import Qt, QProcess
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QPoint, QProcess, QProcessEnvironment, QThread, QTimer, pyqtSignal
+
+# Anzahl Zeilen, die auf einmal in die Anzeige geladen werden (erste Seite sofort, weitere beim Scrollen)
+PAGE_LINES = 400
+
+# Breite, mit der man rendert (MANWIDTH); Teil des Cache-Schlüssels
+MANWIDTH = 80
+
+# Manpage-Verzeichnisse, wenn MANPATH nicht gesetzt ist (wie man-db), und Endungen komprimierter Quellen (für den Volltextindex)
+DEFAULT_MANPATH = ["/usr/local/share/man", "/usr/share/man", "/usr/local/man", "/usr/man"]
+MAN_COMPRESSIONS = ("", ".gz", ".bz2", ".xz", ".zst", ".Z")
+
+# Cache für gerenderte Manpages: Verzeichnis, Maximalgröße auf der Platte, Einträge im Speicher und deren Maximalgröße
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pkmangui"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_MEMORY_ENTRIES = 32
+CACHE_MEMORY_MAX_ENTRY = 256 * 1024
+# Blockgröße beim Komprimieren eines Eintrags aus der Ausgabedatei
+CACHE_CHUNK = 1024 * 1024
+
+
+def man_directories():
+    """Liefert die Manpage-Verzeichnisse aus MANPATH (leere Einträge = Standardpfade), lokalisierte zuerst."""
+    manpath = os.environ.get("MANPATH")
+    if manpath:
+        dirs = []
+        for entry in manpath.split(":"):
+            dirs.extend(DEFAULT_MANPATH if entry == "" else [entry])
+    else:
+        dirs = list(DEFAULT_MANPATH)
+
+    # Sprachvarianten wie man: de_DE.UTF-8 -> de_DE.UTF-8, de_DE, de
+    lang = os.environ.get("LC_ALL") or os.environ.get("LC_MESSAGES") or os.environ.get("LANG") or ""
+    langs = []
+    if lang and lang not in ("C", "POSIX") and not lang.startswith("C."):
+        langs = list(dict.fromkeys([lang, lang.split(".")[0], lang.split("_")[0]]))
+
+    result = []
+    for d in dict.fromkeys(dirs):
+        result.extend(os.path.join(d, l) for l in langs)
+        result.append(d)
+    return [d for d in result if os.path.isdir(d)]
+
+
+class RenderCache:
+    """
+    Cache for rendered manpage text, keyed by the manpage source file, its mtime and the render width.
+    Entries are stored zlib-compressed in the cache directory with an in-memory LRU layer in front
+    that only holds entries up to memory_max_entry bytes; when the directory grows beyond max_bytes
+    the least recently used entries are removed. It also remembers, per session, which source file
+    man chose for a program and section, so reopening an unchanged page needs no man -w.
+    """
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, memory_entries=CACHE_MEMORY_ENTRIES,
+                 memory_max_entry=CACHE_MEMORY_MAX_ENTRY):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory_max_entry = memory_max_entry
+        self.memory = OrderedDict()
+        self.sources = {}  # (Programm, Sektion) -> (Quelldatei, Schlüssel)
+
+    @staticmethod
+    def key(source, width=MANWIDTH):
+        """Bildet den Schlüssel aus Quellpfad, mtime und Breite; None, wenn die Quelle nicht lesbar ist."""
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        raw = f"{os.path.realpath(source)}\0{st.st_mtime_ns}\0{st.st_size}\0{width}"
+        return hashlib.sha1(raw.encode("utf-8", errors="surrogateescape")).hexdigest()
+
+    def _path(self, key):
+        return self.directory / (key + ".z")
+
+    def source_key(self, name):
+        """Schlüssel der für name (Programm, Sektion) gemerkten Quelle, wenn sie seitdem unverändert ist; sonst None."""
+        known = self.sources.get(name)
+        if known is None:
+            return None
+        source, key = known
+        if self.key(source) != key:
+            del self.sources[name]
+            return None
+        return key
+
+    def set_source(self, name, source):
+        """Merkt sich die von man -w gemeldete Quelle für name und gibt ihren Schlüssel zurück."""
+        key = self.key(source)
+        if key is not None:
+            self.sources[name] = (source, key)
+        return key
+
+    def _remember(self, key, data):
+        if len(data) > self.memory_max_entry:
+            return
+        self.memory[key] = bytes(data)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """Gibt den gecachten Text (bytes) zurück oder None."""
+        if key is None:
+            return None
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory.move_to_end(key)
+            return data
+        path = self._path(key)
+        try:
+            data = zlib.decompress(path.read_bytes())
+            os.utime(path)  # Zugriffszeit für die LRU-Verdrängung auf der Platte
+        except (OSError, zlib.error):
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        """Speichert den Text (bytes oder mmap der Ausgabedatei) blockweise komprimiert; Fehler beim Schreiben werden ignoriert."""
+        if key is None:
+            return
+        self._remember(key, data)
+        tmp = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # erst vollständig schreiben, dann umbenennen: parallele Fenster sehen nie halbe Einträge
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=".tmp-", delete=False) as f:
+                tmp = f.name
+                compressor = zlib.compressobj(6)
+                for pos in range(0, len(data), CACHE_CHUNK):
+                    f.write(compressor.compress(data[pos:pos + CACHE_CHUNK]))
+                f.write(compressor.flush())
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Löscht die am längsten nicht benutzten Einträge, bis der Cache wieder unter max_bytes liegt."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".z") and entry.is_file():
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+        except OSError:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+
+RENDER_CACHE = RenderCache()
+
+
+# Datei des Volltextindex und Anzahl gespeicherter Zeilennummern pro Wort und Seite
+INDEX_PATH = CACHE_DIR / "index.sqlite"
+INDEX_VERSION = 1
+INDEX_MAX_LINES = 16
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_]+")
+# Überschreibungen (x\bx fett, _\bx unterstrichen) und SGR-Farbcodes, wie sie col -b entfernt
+OVERSTRIKE_RE = re.compile(rb".\x08|\x1b\[[0-9;]*m")
+
+
+def list_manpages():
+    """Listet alle Manpages als (Name, Sektion, Quelldatei); bei gleichem Namen und Sektion gewinnt das erste Verzeichnis."""
+    pages = {}
+    for d in man_directories():
+        try:
+            with os.scandir(d) as it:
+                subdirs = sorted(e.path for e in it if e.name.startswith("man") and e.is_dir())
+        except OSError:
+            continue
+        for sub in subdirs:
+            try:
+                with os.scandir(sub) as it:
+                    entries = [e for e in it if e.is_file()]
+            except OSError:
+                continue
+            for entry in entries:
+                name = entry.name
+                for ext in MAN_COMPRESSIONS[1:]:
+                    if name.endswith(ext):
+                        name = name[:-len(ext)]
+                        break
+                name, dot, section = name.rpartition(".")
+                if dot and name and section:
+                    pages.setdefault((name, section), entry.path)
+    return [(name, section, source) for (name, section), source in pages.items()]
+
+
+def render_manpage_source(source, cache=None):
+    """Rendert eine Manpage-Quelldatei zu reinem Text (bytes); nutzt gecachte Ausgaben des Viewers. None bei Fehlern."""
+    if cache is not None:
+        data = cache.get(RenderCache.key(source))
+        if data is not None:
+            return data
+    env = dict(os.environ, MANWIDTH=str(MANWIDTH))
+    try:
+        proc = subprocess.run(["man", "-l", source], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              stdin=subprocess.DEVNULL, env=env, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if proc.returncode != 0:
+        return None
+    return OVERSTRIKE_RE.sub(b"", proc.stdout)
+
+
+class ManIndex:
+    """
+    Inverted full-text index over all manpages, stored in SQLite: every token maps to the pages
+    (name, section) containing it, with its count and the first line numbers in the rendered text.
+    update() re-indexes only pages whose source file changed; search() ranks pages with BM25.
+    """
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.db = None
+
+    def connect(self):
+        """Öffnet die Datenbank (einmal pro Thread) und legt das Schema an bzw. neu an."""
+        if self.db is not None:
+            return self.db
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.path), timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")  # Suchen, während der Indexer schreibt
+        if db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            db.executescript("""
+                DROP TABLE IF EXISTS postings;
+                DROP TABLE IF EXISTS pages;
+                CREATE TABLE pages (id INTEGER PRIMARY KEY, name TEXT, section TEXT,
+                                    source TEXT UNIQUE, mtime_ns INTEGER, length INTEGER);
+                CREATE TABLE postings (token TEXT, page_id INTEGER, count INTEGER, lines BLOB,
+                                       PRIMARY KEY (token, page_id)) WITHOUT ROWID;
+                CREATE INDEX postings_page ON postings (page_id);
+            """)
+            db.execute(f"PRAGMA user_version={INDEX_VERSION}")
+            db.commit()
+        self.db = db
+        return db
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def update(self, progress=None, should_stop=None, cache=None):
+        """Indexiert neue und geänderte Manpages, entfernt verschwundene; gibt die Anzahl neu indexierter Seiten zurück."""
+        db = self.connect()
+        known = {source: (page_id, mtime) for page_id, source, mtime in db.execute("SELECT id, source, mtime_ns FROM pages")}
+        current = list_manpages()
+
+        # Seiten, deren Quelldatei verschwunden ist
+        present = {source for _, _, source in current}
+        for source, (page_id, _) in known.items():
+            if source not in present:
+                self._delete(db, page_id)
+        db.commit()
+
+        todo = []
+        for name, section, source in current:
+            try:
+                mtime = os.stat(source).st_mtime_ns
+            except OSError:
+                continue
+            old = known.get(source)
+            if old is None or old[1] != mtime:
+                todo.append((name, section, source, mtime, old[0] if old else None))
+
+        done = 0
+        for i, (name, section, source, mtime, old_id) in enumerate(todo):
+            if should_stop is not None and should_stop():
+                break
+            data = render_manpage_source(source, cache)
+            if progress is not None:
+                progress(i + 1, len(todo))
+            if data is None:
+                # nicht eintragen: ohne gespeicherte mtime wird die Seite beim nächsten Lauf erneut versucht
+                continue
+            text = data.decode("utf-8", errors="ignore").lower()
+            if old_id is not None:
+                self._delete(db, old_id)
+            self._insert(db, name, section, source, mtime, text)
+            done += 1
+            # regelmäßig committen, damit die Suche schon den Teilindex sieht
+            if done % 50 == 0:
+                db.commit()
+        db.commit()
+        return done
+
+    @staticmethod
+    def _delete(db, page_id):
+        db.execute("DELETE FROM postings WHERE page_id = ?", (page_id,))
+        db.execute("DELETE FROM pages WHERE id = ?", (page_id,))
+
+    @staticmethod
+    def _insert(db, name, section, source, mtime, text):
+        counts = {}
+        lines = {}
+        length = 0
+        for lineno, line in enumerate(text.splitlines()):
+            for token in TOKEN_RE.findall(line):
+                length += 1
+                if token in counts:
+                    counts[token] += 1
+                    found = lines[token]
+                    if len(found) < INDEX_MAX_LINES and found[-1] != lineno:
+                        found.append(lineno)
+                else:
+                    counts[token] = 1
+                    lines[token] = array("I", [lineno])
+        cur = db.execute("INSERT INTO pages (name, section, source, mtime_ns, length) VALUES (?, ?, ?, ?, ?)",
+                         (name, section, source, mtime, length))
+        page_id = cur.lastrowid
+        db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)",
+                       ((token, page_id, count, lines[token].tobytes()) for token, count in counts.items()))
+
+    def search(self, query, limit=100):
+        """Sucht Seiten, die alle Wörter der Anfrage enthalten; Liste von (Score, Name, Sektion, Zeile), beste zuerst."""
+        tokens = list(dict.fromkeys(TOKEN_RE.findall(query.lower())))
+        if not tokens:
+            return []
+        db = self.connect()
+        total, avg_length = db.execute("SELECT count(*), avg(length) FROM pages").fetchone()
+        if not total:
+            return []
+        avg_length = avg_length or 1
+
+        # Posting-Listen laden, seltenste Wörter zuerst, und Seiten schneiden (UND-Verknüpfung)
+        postings = []
+        for token in tokens:
+            rows = db.execute("SELECT page_id, count, lines FROM postings WHERE token = ?", (token,)).fetchall()
+            if not rows:
+                return []
+            postings.append((token, rows))
+        postings.sort(key=lambda p: len(p[1]))
+        candidates = {row[0] for row in postings[0][1]}
+        for _, rows in postings[1:]:
+            candidates &= {row[0] for row in rows}
+            if not candidates:
+                return []
+
+        pages = {}
+        ids = list(candidates)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for page_id, name, section, length in db.execute(
+                    f"SELECT id, name, section, length FROM pages WHERE id IN ({marks})", chunk):
+                pages[page_id] = (name, section, length)
+
+        # BM25 mit Bonus, wenn ein Wort der Seitenname ist
+        k1, b = 1.2, 0.75
+        scores = {}
+        first_line = {}
+        for token, rows in postings:
+            idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+            for page_id, count, lines in rows:
+                if page_id not in pages:
+                    continue
+                name, section, length = pages[page_id]
+                score = idf * count * (k1 + 1) / (count + k1 * (1 - b + b * length / avg_length))
+                if token == name.lower():
+                    score += 10
+                scores[page_id] = scores.get(page_id, 0) + score
+                # Sprungziel: erste Fundstelle des seltensten Wortes
+                if page_id not in first_line:
+                    first_line[page_id] = array("I", lines)[0]
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(score, pages[page_id][0], pages[page_id][1], first_line[page_id]) for page_id, score in best]
+
+
+class ManIndexer(QThread):
+    """
+    Background thread that brings the full-text index up to date (see ManIndex.update).
+    Reports progress as (done, total) and the number of re-indexed pages when finished.
+    """
+    progress = pyqtSignal(int, int)
+    indexed = pyqtSignal(int)
+
+    def __init__(self, path=INDEX_PATH):
+        super().__init__()
+        self.path = path
+        self._stop = False
+
+    def stop(self):
+        """Bricht die Indexierung nach der aktuellen Seite ab."""
+        self._stop = True
+
+    def run(self):
+        index = ManIndex(self.path)
+        # eigener Cache ohne Speicherschicht: nur lesend, unabhängig vom GUI-Thread
+        cache = RenderCache(memory_entries=0)
+        try:
+            done = index.update(self.progress.emit, lambda: self._stop, cache)
+        except (OSError, sqlite3.Error):
+            done = 0
+        finally:
+            index.close()
+        self.indexed.emit(done)
+
+
+# Wurzeln für Dokumentation (PKMANGUI_DOC_ROOTS, durch ':' getrennt) und persistenter Index der Hilfedateien
+DOC_ROOTS = [d for d in os.environ.get("PKMANGUI_DOC_ROOTS", "/usr/share/doc:/usr/local/share/doc").split(os.pathsep) if d]
+DOC_INDEX_PATH = CACHE_DIR / "docindex.json"
+DOC_INDEX_VERSION = 1
+DOC_MAX_DEPTH = 3
+DOC_EXTENSIONS = (".txt", ".md", ".help", ".rst", ".readme")
+DOC_NAMES = ("readme", "news", "changelog", "changes", "usage", "faq", "howto")
+
+
+def is_doc_file(name):
+    """True für Dateien, die als Hilfedatei angeboten werden (auch gzip-komprimiert)."""
+    lower = name.lower()
+    if lower.endswith(".gz"):
+        lower = lower[:-3]
+    return lower.endswith(DOC_EXTENSIONS) or lower.startswith(DOC_NAMES)
+
+
+class DocIndex:
+    """
+    Index of documentation files: for every directory its mtime, the doc files it contains and its
+    subdirectories. Directories below a doc root (e.g. /usr/share/doc/<pkg>) belong to the package
+    named by their first path component; program directories are indexed flat.
+    refresh() only lists directories whose mtime changed, everything else is taken from the old index.
+    """
+    def __init__(self, dirs=None):
+        self.dirs = dirs or {}
+        self.packages = {}  # Paketname (klein) -> Pfade
+        self.loose = []     # (Dateiname klein, Pfad) außerhalb von Paketen, für die Suche nach Teilnamen
+        for directory, entry in self.dirs.items():
+            package = entry.get("package")
+            for name in entry["files"]:
+                path = os.path.join(directory, name)
+                if package:
+                    self.packages.setdefault(package.lower(), []).append(path)
+                else:
+                    self.loose.append((name.lower(), path))
+
+    @classmethod
+    def load(cls, path=DOC_INDEX_PATH):
+        """Lädt den gespeicherten Index; bei fehlender oder unpassender Datei einen leeren."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != DOC_INDEX_VERSION:
+                return cls()
+            return cls(data["dirs"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls()
+
+    def save(self, path=DOC_INDEX_PATH):
+        """Speichert den Index atomar; Fehler werden ignoriert (der Index wird dann neu aufgebaut)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": DOC_INDEX_VERSION, "dirs": self.dirs}, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def refresh(self, roots=DOC_ROOTS, flat_dirs=(), should_stop=None):
+        """Gibt einen aktualisierten Index zurück; None, wenn should_stop() den Lauf abgebrochen hat."""
+        old = self.dirs
+        new = {}
+
+        def walk(directory, package, depth, max_depth):
+            if should_stop is not None and should_stop():
+                return False
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                return True
+            entry = old.get(directory)
+            if entry is None or entry["mtime"] != mtime or entry.get("package") != package:
+                files = []
+                subdirs = []
+                try:
+                    with os.scandir(directory) as it:
+                        for e in it:
+                            try:
+                                if e.is_dir():
+                                    subdirs.append(e.name)
+                                elif is_doc_file(e.name) and e.is_file():
+                                    files.append(e.name)
+                            except OSError:
+                                continue
+                except OSError:
+                    return True
+                entry = {"mtime": mtime, "package": package, "files": sorted(files), "subdirs": sorted(subdirs)}
+            new[directory] = entry
+            if depth < max_depth:
+                for sub in entry["subdirs"]:
+                    if not walk(os.path.join(directory, sub), package or sub, depth + 1, max_depth):
+                        return False
+            return True
+
+        for root in roots:
+            if not walk(root, None, 0, DOC_MAX_DEPTH):
+                return None
+        for directory in flat_dirs:
+            if directory not in new and not walk(directory, None, 0, 0):
+                return None
+        return DocIndex(new)
+
+    def lookup(self, program, limit=200):
+        """Hilfedateien zu einem Programm: Dateien seines Pakets (auch <programm>-doc usw.) und Dateien mit dem Namen im Dateinamen."""
+        key = program.lower()
+        result = list(self.packages.get(key, []))
+        for package, paths in self.packages.items():
+            if package.startswith(key + "-"):
+                result.extend(paths)
+        result.extend(path for name, path in self.loose if key in name)
+        return list(dict.fromkeys(result))[:limit]
+
+
+class DocIndexer(QThread):
+    """
+    Background thread that loads the persisted documentation index, reports it right away,
+    brings it up to date (see DocIndex.refresh), saves it and reports the updated index.
+    """
+    ready = pyqtSignal(object)
+
+    def __init__(self, flat_dirs=(), roots=DOC_ROOTS, path=DOC_INDEX_PATH):
+        super().__init__()
+        self.flat_dirs = list(flat_dirs)
+        self.roots = roots
+        self.path = path
+        self._stop = False
+
+    def stop(self):
+        """Bricht die Aktualisierung ab."""
+        self._stop = True
+
+    def run(self):
+        index = DocIndex.load(self.path)
+        if index.dirs:
+            self.ready.emit(index)
+        index = index.refresh(self.roots, self.flat_dirs, lambda: self._stop)
+        if index is None:
+            return
+        index.save(self.path)
+        self.ready.emit(index)
+
+
+class PagedText:
+    """
+    Read-only access to rendered manpage text (bytes or a memory-mapped file) in pages of PAGE_LINES lines.
+    Line ends are searched only as far as the pages handed out so far, so the first page of a
+    huge manpage is available immediately and the text is never held in memory as a whole.
+    """
+    def __init__(self, data, keep=None):
+        self.data = data
+        self._keep = keep  # Datei hinter dem mmap, muss offen bleiben
+        self.pos = 0
+        self.lines = 0
+
+    @classmethod
+    def from_file(cls, f):
+        """Bildet eine (temporäre) Datei in den Speicher ab; leere Dateien ergeben leeren Text."""
+        if os.fstat(f.fileno()).st_size == 0:
+            f.close()
+            return cls(b"")
+        return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), f)
+
+    def is_empty(self):
+        """True, wenn der Text nur aus Leerraum besteht (keine Manpage gefunden)."""
+        return re.search(rb"\S", self.data) is None
+
+    def at_end(self):
+        """True, wenn alle Seiten ausgegeben wurden."""
+        return self.pos >= len(self.data)
+
+    def next_page(self, lines=PAGE_LINES):
+        """Gibt die nächsten lines Zeilen (ohne abschließenden Zeilenumbruch) zurück, None am Ende."""
+        if self.at_end():
+            return None
+        start = end = self.pos
+        for _ in range(lines):
+            end = self.data.find(b"\n", end) + 1
+            if end == 0:
+                end = len(self.data)
+                break
+            self.lines += 1
+        self.pos = end
+        return bytes(self.data[start:end]).decode("utf-8", errors="ignore").rstrip("\n")
+
+    def close(self):
+        """Gibt mmap und Datei frei."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        if self._keep is not None:
+            self._keep.close()
+        self.data = b""
 
 
 class ManSyntaxHighlighter(QSyntaxHighlighter):
     """
     Simple syntax highlighter for manpages.
     Highlights manpage headers (all caps), section titles, options (starting with - or --), and URLs.
+    The patterns are compiled once; options and URLs are found in a single pass over the line.
+    With lazy=True only the visible lines (see set_visible) are formatted right away,
+    all other lines are formatted in small batches from a timer while the GUI is idle.
     """
-    def __init__(self, parent=None):
+    # Zeilenregeln (ganze Zeile) und ein Durchlauf für Optionen und URLs; eine Option endet vor einer
+    # direkt anschließenden URL, damit das Ergebnis dem früheren "URL überschreibt Option" entspricht
+    HEADER_RE = re.compile(r"[A-Z\s]+")
+    SECTION_RE = re.compile(r"[A-Z][A-Z\s]+:")
+    INLINE_RE = re.compile(r"(?P<url>https?://[^\s]+)|(?P<option>--?(?=\w)(?:(?!https?://\S)\w)*)")
+
+    # Anzahl Zeilen, die pro Timer-Durchlauf nachträglich formatiert werden
+    IDLE_BATCH = 200
+
+    def __init__(self, parent=None, lazy=False):
         super().__init__(parent)
-        self.rules = []
+        self.formats = {}
 
         # Header format (all caps lines)
         header_format = QTextCharFormat()
         header_format.setForeground(QColor("darkblue"))
         header_format.setFontWeight(QFont.Weight.Bold)
-        self.rules.append((r"^[A-Z\s]+$", header_format))
+        self.formats["header"] = header_format
 
         # Section titles, e.g. "NAME", "SYNOPSIS", "DESCRIPTION"
         section_format = QTextCharFormat()
         section_format.setForeground(QColor("darkgreen"))
         section_format.setFontWeight(QFont.Weight.Bold)
-        self.rules.append((r"^[A-Z][A-Z\s]+:$", section_format))
+        self.formats["section"] = section_format
 
         # Options starting with - or --
         option_format = QTextCharFormat()
         option_format.setForeground(QColor("darkred"))
-        self.rules.append((r"(--?\w+)", option_format))
+        self.formats["option"] = option_format
 
         # URLs (simple pattern)
         url_format = QTextCharFormat()
         url_format.setForeground(QColor("blue"))
         url_format.setFontUnderline(True)
-        self.rules.append((r"https?://[^\s]+", url_format))
+        self.formats["url"] = url_format
+
+        # Verzögertes Formatieren: sichtbarer Zeilenbereich und noch offene Blocknummern (dict als geordnete Menge)
+        self.lazy = lazy
+        self.visible = (0, 100)
+        self.pending = {}
+        self._force = False
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(0)
+        self.idle_timer.timeout.connect(self.highlight_pending)
+
+    @classmethod
+    def spans(cls, text):
+        """Liefert (Start, Länge, Formatname) für eine Zeile; ohne Qt, damit es sich messen lässt."""
+        if cls.HEADER_RE.fullmatch(text):
+            return [(0, len(text), "header")]
+        if cls.SECTION_RE.fullmatch(text):
+            return [(0, len(text), "section")]
+        return [(m.start(), m.end() - m.start(), m.lastgroup) for m in cls.INLINE_RE.finditer(text)]
 
     def highlightBlock(self, text):
-        for pattern, fmt in self.rules:
-            import re
-            for match in re.finditer(pattern, text, re.MULTILINE):
-                start, end = match.span()
-                self.setFormat(start, end - start, fmt)
+        if self.lazy and not self._force:
+            number = self.currentBlock().blockNumber()
+            if not self.visible[0] <= number < self.visible[1]:
+                self.pending[number] = None
+                if not self.idle_timer.isActive():
+                    self.idle_timer.start()
+                return
+        for start, length, name in self.spans(text):
+            self.setFormat(start, length, self.formats[name])
+
+    def reset(self):
+        """Vergisst offene Zeilen (vor dem Setzen eines neuen Textes)."""
+        self.pending.clear()
+        self.idle_timer.stop()
+
+    def set_visible(self, first, count):
+        """Setzt den sichtbaren Zeilenbereich und formatiert dort noch offene Zeilen sofort."""
+        self.visible = (max(0, first - count), first + 2 * count)
+        due = [n for n in range(*self.visible) if n in self.pending]
+        self._rehighlight(due)
+
+    def highlight_pending(self):
+        """Formatiert im Leerlauf die nächsten IDLE_BATCH offenen Zeilen."""
+        due = []
+        for number in self.pending:
+            due.append(number)
+            if len(due) >= self.IDLE_BATCH:
+                break
+        self._rehighlight(due)
+        if not self.pending:
+            self.idle_timer.stop()
+
+    def _rehighlight(self, numbers):
+        document = self.document()
+        self._force = True
+        try:
+            for number in numbers:
+                self.pending.pop(number, None)
+                block = document.findBlockByNumber(number)
+                if block.isValid():
+                    self.rehighlightBlock(block)
+        finally:
+            self._force = False
 
 
 class ManPageWindow(QWidget):
@@ -86,23 +779,36 @@ class ManPageWindow(QWidget):
     - Buttons zum Öffnen des Programmordners und Ausführen des Programms
     """
 
-    def __init__(self, program, base_path):
+    def __init__(self, program, base_path, section=None, line=None, doc_index=None):
         super().__init__()
         self.program = program
         self.base_path = Path(base_path)
+        self.doc_index = doc_index  # Index der Hilfedateien (DocIndex), vom Hauptfenster aktuell gehalten
+        self.section = section
+        self.jump_line = line  # Zeile, zu der nach dem Laden gesprungen wird (Treffer der Volltextsuche)
 
-        self.setWindowTitle(f"Manpage Viewer - {program}")
+        title = f"{program}({section})" if section else program
+        self.setWindowTitle(f"Manpage Viewer - {title}")
         self.resize(800, 600)
 
         layout = QVBoxLayout()
 
-        # Textbereich für Manpage oder "No Manpage found"
-        self.text_edit = QTextEdit()
+        # Textbereich für Manpage oder "No Manpage found"; QPlainTextEdit layoutet nur sichtbare Blöcke
+        self.text_edit = QPlainTextEdit()
         self.text_edit.setReadOnly(True)
+        self.text_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
         layout.addWidget(self.text_edit)
+        self.pages = None
+        # laufende Suche der Quelldatei (man -w), laufendes Rendern (man | col -b) und dessen Ausgabedatei
+        self.where_proc = None
+        self.man_proc = None
+        self.col_proc = None
+        self.output = None
+        self.cache_key = None
+        self.text_edit.verticalScrollBar().valueChanged.connect(self.on_scroll)
 
         # Syntax-Highlighter anwenden
-        self.highlighter = ManSyntaxHighlighter(self.text_edit.document())
+        self.highlighter = ManSyntaxHighlighter(self.text_edit.document(), lazy=True)
 
         # HBox für Combobox + Buttons
         controls_layout = QHBoxLayout()
@@ -135,47 +841,202 @@ class ManPageWindow(QWidget):
         # Zusätzliche Hilfedateien suchen und in ComboBox einfügen
         self.load_help_files()
 
+    def man_args(self):
+        """Argumente für man: optionale Sektion und Programmname."""
+        return [self.section, self.program] if self.section else [self.program]
+
     def load_manpage(self):
-        """Versucht, die Manpage über das 'man'-Kommando zu laden, ansonsten Fehlermeldung anzeigen."""
+        """Zeigt die Manpage an; man -w läuft nur, wenn die Quelldatei in dieser Sitzung noch nicht bekannt ist."""
+        self.cancel_loading()
+        self.text_edit.setPlainText(f"Loading manpage for {self.program}...")
+        self.cache_key = RENDER_CACHE.source_key((self.program, self.section))
+        if self.cache_key is not None:
+            self.show_cached()
+        else:
+            self.find_source()
+
+    def find_source(self):
+        """Lässt man asynchron die Quelldatei bestimmen (man -w); bis zur Anzeige steht ein Platzhalter da."""
+        # Quelldatei so, wie man sie auswählt (MANSECT, Sprachverzeichnisse, .so-Verweise), als Cache-Schlüssel
+        self.where_proc = QProcess(self)
+        self.where_proc.setStandardErrorFile(QProcess.nullDevice())
+        self.where_proc.finished.connect(self.on_source_found)
+        self.where_proc.errorOccurred.connect(self.on_render_error)
+        self.where_proc.start("man", ["-w"] + self.man_args())
+
+    def on_source_found(self, exit_code=0, exit_status=None):
+        """man -w ist fertig: Quelle merken, dann anzeigen."""
+        proc = self.where_proc
+        self.where_proc = None
+        if proc is None:
+            return
+        output = bytes(proc.readAllStandardOutput()).decode("utf-8", errors="surrogateescape").splitlines()
+        proc.deleteLater()
+        source = output[0].strip() if exit_code == 0 and output else None
+        self.cache_key = RENDER_CACHE.set_source((self.program, self.section), source) if source else None
+        self.show_cached()
+
+    def show_cached(self):
+        """Gerenderte Manpage aus dem Cache anzeigen oder das Rendern starten."""
+        data = RENDER_CACHE.get(self.cache_key)
+        if data is not None:
+            self.show_pages(PagedText(data))
+            return
+        self.start_render()
+
+    def start_render(self):
+        """Startet 'man | col -b' asynchron über QProcess."""
+        # man gibt oft ANSI-Formatierungen zurück, wir wandeln sie mit col -b um in reinen Text.
+        # Die Ausgabe landet in einer temporären Datei, die per mmap seitenweise angezeigt wird.
+        self.output = tempfile.NamedTemporaryFile(prefix="pkmangui-")
+        self.man_proc = QProcess(self)
+        self.col_proc = QProcess(self)
+        env = QProcessEnvironment.systemEnvironment()
+        env.insert("MANWIDTH", str(MANWIDTH))
+        self.man_proc.setProcessEnvironment(env)
+        self.man_proc.setStandardOutputProcess(self.col_proc)
+        self.man_proc.setStandardErrorFile(QProcess.nullDevice())
+        self.col_proc.setStandardOutputFile(self.output.name)
+        self.col_proc.setStandardErrorFile(QProcess.nullDevice())
+        self.col_proc.finished.connect(self.on_rendered)
+        self.man_proc.errorOccurred.connect(self.on_render_error)
+        self.col_proc.errorOccurred.connect(self.on_render_error)
+        self.col_proc.start("col", ["-b"])
+        self.man_proc.start("man", self.man_args())
+
+    def on_rendered(self, exit_code=0, exit_status=None):
+        """col ist fertig: gerenderten Text aus der temporären Datei anzeigen."""
+        output = self.output
+        self.output = None
+        self.release_processes()
+        if output is None:
+            return
         try:
-            # man gibt oft ANSI-Farbcodes zurück, wir wandeln sie mit col -b um in reinen Text
-            proc1 = subprocess.Popen(["man", self.program], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            proc2 = subprocess.Popen(["col", "-b"], stdin=proc1.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            proc1.stdout.close()
-            output, _ = proc2.communicate()
-            text = output.decode("utf-8", errors="ignore").strip()
-            if not text:
-                text = "No Manpage found"
+            pages = PagedText.from_file(output)
+            if exit_status == QProcess.ExitStatus.NormalExit and not pages.is_empty():
+                RENDER_CACHE.put(self.cache_key, pages.data)
+            self.show_pages(pages)
         except Exception as e:
-            text = "No Manpage found"
-        self.text_edit.setPlainText(text)
+            output.close()
+            self.text_edit.setPlainText("No Manpage found")
+
+    def on_render_error(self, error):
+        """man (auch man -w) oder col konnte nicht gestartet werden oder ist abgestürzt."""
+        if error != QProcess.ProcessError.FailedToStart:
+            return  # Absturz: finished von col folgt und zeigt an, was bis dahin gerendert wurde
+        self.cancel_loading()
+        self.text_edit.setPlainText("No Manpage found")
+
+    def cancel_loading(self):
+        """Bricht ein laufendes Rendern ab und räumt Prozesse und temporäre Datei weg."""
+        for proc in (self.where_proc, self.man_proc, self.col_proc):
+            if proc is None:
+                continue
+            # Keine Signale mehr, sonst würde on_rendered nach dem Abbruch noch anzeigen
+            proc.blockSignals(True)
+            if proc.state() != QProcess.ProcessState.NotRunning:
+                proc.kill()
+                proc.waitForFinished(1000)
+        self.release_processes()
+        if self.output is not None:
+            self.output.close()
+            self.output = None
+
+    def release_processes(self):
+        """Gibt die QProcess-Objekte des letzten Renderlaufs frei."""
+        for proc in (self.where_proc, self.man_proc, self.col_proc):
+            if proc is not None:
+                proc.deleteLater()
+        self.where_proc = None
+        self.man_proc = None
+        self.col_proc = None
+
+    def show_pages(self, pages):
+        """Zeigt die erste Seite des gerenderten Textes an; weitere Seiten folgen beim Scrollen."""
+        if self.pages is not None:
+            self.pages.close()
+        if pages.is_empty():
+            pages.close()
+            self.pages = None
+            self.text_edit.setPlainText("No Manpage found")
+            return
+        self.pages = pages
+        self.highlighter.reset()
+        self.highlighter.set_visible(self.jump_line or 0, self.visible_line_count())
+        self.text_edit.setPlainText(pages.next_page())
+        self.text_edit.moveCursor(QTextCursor.MoveOperation.Start)
+        if self.jump_line is not None:
+            self.goto_line(self.jump_line)
+
+    def goto_line(self, line):
+        """Lädt Seiten bis zur gewünschten Zeile nach und zeigt diese Zeile mittig an."""
+        self.highlighter.set_visible(line, self.visible_line_count())
+        while self.pages is not None and not self.pages.at_end() and self.pages.lines <= line:
+            self.append_page()
+        block = self.text_edit.document().findBlockByNumber(line)
+        if block.isValid():
+            self.text_edit.setTextCursor(QTextCursor(block))
+            self.text_edit.centerCursor()
+
+    def visible_line_count(self):
+        """Anzahl Zeilen, die in die Anzeige passen (ohne Umbruch ist jede Zeile ein Block), mindestens 50."""
+        lines = self.text_edit.viewport().height() // max(1, self.text_edit.fontMetrics().lineSpacing()) + 1
+        return max(lines, 50)
+
+    def on_scroll(self, value):
+        """Formatiert die sichtbar gewordenen Zeilen und lädt die nächste Seite, sobald das Ende in Sicht kommt."""
+        first = self.text_edit.cursorForPosition(QPoint(0, 0)).blockNumber()
+        self.highlighter.set_visible(first, self.visible_line_count())
+        if self.pages is None or self.pages.at_end():
+            return
+        bar = self.text_edit.verticalScrollBar()
+        if value >= bar.maximum() - bar.pageStep():
+            self.append_page()
+            bar.setValue(value)
+
+    def append_page(self):
+        """Hängt genau eine weitere Seite an; das Anhängen verschiebt die Scrollbar, löst aber kein on_scroll aus."""
+        bar = self.text_edit.verticalScrollBar()
+        blocked = bar.blockSignals(True)
+        try:
+            self.text_edit.appendPlainText(self.pages.next_page())
+        finally:
+            bar.blockSignals(blocked)
+
+    def closeEvent(self, event):
+        """Bricht das Rendern ab und gibt den gerenderten Text frei, wenn das Fenster geschlossen wird."""
+        self.cancel_loading()
+        self.highlighter.reset()
+        if self.pages is not None:
+            self.pages.close()
+            self.pages = None
+        super().closeEvent(event)
 
     def load_help_files(self):
-        """Sucht im Programmordner nach Hilfedateien, die den Programmnamen enthalten und populäre Endungen haben."""
+        """Füllt die ComboBox aus dem Index der Hilfedateien (Paketdokumentation und Dateien im Programmordner)."""
         self.help_combo.blockSignals(True)  # Signale blockieren beim Befüllen
         self.help_combo.clear()
         self.help_combo.addItem("-- Select --")
 
-        self.help_files = []
-        program_lower = self.program.lower()
-        valid_exts = (".txt", ".md", ".help", ".rst", ".readme")
-
-        for f in self.base_path.iterdir():
-            if not f.is_file():
-                continue
-            fname = f.name.lower()
-            if program_lower in fname and fname.endswith(valid_exts):
-                self.help_files.append(str(f))
-                self.help_combo.addItem(f.name)
+        self.help_files = self.doc_index.lookup(self.program) if self.doc_index is not None else []
+        for f in self.help_files:
+            # Paketordner mit anzeigen, z. B. "grep/README.gz"
+            self.help_combo.addItem(os.path.join(os.path.basename(os.path.dirname(f)), os.path.basename(f)))
         self.help_combo.blockSignals(False)
 
+    def set_doc_index(self, doc_index):
+        """Übernimmt einen aktualisierten Index der Hilfedateien."""
+        self.doc_index = doc_index
+        self.load_help_files()
+
     def open_help_file(self, index):
         """Wenn eine zusätzliche Hilfedatei ausgewählt wird, öffnet sie sich in neuem Fenster."""
         if index <= 0:
             return
         filepath = self.help_files[index - 1]
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
+            opener = gzip.open if filepath.endswith(".gz") else open
+            with opener(filepath, "rt", encoding="utf-8", errors="replace") as f:
                 content = f.read()
         except Exception as e:
             content = f"Could not read file:\n{filepath}\n\n{str(e)}"
@@ -219,10 +1080,172 @@ class ManPageWindow(QWidget):
             QMessageBox.warning(self, "Error", f"Failed to run program:\n{str(e)}")
 
 
+class ProgramScanner(QThread):
+    """
+    Background thread that scans directories for executable files with os.scandir.
+    The directories are scanned concurrently by a small thread pool; each result carries the rank
+    of its directory, and for duplicate names the lowest rank wins (PATH precedence).
+    Results are streamed as batches of (name, directory, rank) tuples tagged with the scan id.
+    """
+    batch = pyqtSignal(int, object)
+    scanned = pyqtSignal(int, int)
+
+    BATCH_SIZE = 256
+    MAX_WORKERS = 8
+
+    def __init__(self, scan_id, directories):
+        super().__init__()
+        self.scan_id = scan_id
+        self.directories = directories
+        self._stop = False
+
+    def stop(self):
+        """Bricht den Scan beim nächsten Eintrag ab."""
+        self._stop = True
+
+    def scan_directory(self, directory):
+        """Liefert die ausführbaren Dateien eines Verzeichnisses (is_file nutzt den Typ aus scandir)."""
+        names = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if self._stop:
+                        break
+                    try:
+                        if entry.is_file() and os.access(entry.path, os.X_OK):
+                            names.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return names
+
+    def run(self):
+        best = {}  # Name -> Rang des Verzeichnisses, aus dem er gemeldet wurde
+        workers = max(1, min(self.MAX_WORKERS, len(self.directories)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self.scan_directory, d): (rank, d) for rank, d in enumerate(self.directories)}
+            # Ergebnisse in der Reihenfolge liefern, in der die Verzeichnisse fertig werden
+            for future in as_completed(futures):
+                if self._stop:
+                    return
+                rank, directory = futures[future]
+                found = []
+                for name in future.result():
+                    if best.get(name, rank + 1) > rank:
+                        best[name] = rank
+                        found.append((name, directory, rank))
+                for start in range(0, len(found), self.BATCH_SIZE):
+                    self.batch.emit(self.scan_id, found[start:start + self.BATCH_SIZE])
+        if not self._stop:
+            self.scanned.emit(self.scan_id, len(best))
+
+
+class ProgramListModel(QAbstractListModel):
+    """
+    Read-only list model over the program names, sorted case-insensitively.
+    A prefix filter is just the range [lo, hi) of the sorted lowercase names, found by binary search;
+    a longer prefix only searches inside the previous range, and no per-row objects are created.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.keys = []
+        self.dirs = {}  # Name -> (Rang, Verzeichnis), in dem das Programm gefunden wurde
+        self.prefix = ""
+        self.lo = 0
+        self.hi = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.hi - self.lo
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self.names[self.lo + index.row()]
+        return None
+
+    def name_at(self, index):
+        """Gibt den Programmnamen zu einem Index der Ansicht zurück."""
+        return self.names[self.lo + index.row()]
+
+    def directory_of(self, name):
+        """Verzeichnis, in dem das Programm gefunden wurde (None, wenn unbekannt)."""
+        found = self.dirs.get(name)
+        return found[1] if found else None
+
+    def set_names(self, names):
+        """Ersetzt alle Namen (sortiert nach Kleinschreibung) und wendet den aktuellen Filter neu an."""
+        self.beginResetModel()
+        self.dirs = {}
+        self.names = sorted(names, key=str.lower)
+        self.keys = [name.lower() for name in self.names]
+        self.lo, self.hi = self._range(self.prefix, 0, len(self.keys))
+        self.endResetModel()
+
+    def add_programs(self, programs):
+        """Fügt (Name, Verzeichnis, Rang) eines Scan-Batches ein; bei bekannten Namen gilt das Verzeichnis mit kleinerem Rang."""
+        new = []
+        for name, directory, rank in programs:
+            known = self.dirs.get(name)
+            if known is None:
+                new.append(name)
+            elif known[0] <= rank:
+                continue
+            self.dirs[name] = (rank, directory)
+        if not new:
+            return
+        # Zusammenhängende Läufe einfügen; die Ansicht behält Auswahl und Scrollposition, Signale
+        # gibt es nur für Zeilen im aktuellen Präfix-Bereich, davor liegende verschieben ihn nur
+        new.sort(key=str.lower)
+        new_keys = [name.lower() for name in new]
+        i = 0
+        while i < len(new):
+            key = new_keys[i]
+            pos = bisect.bisect_left(self.keys, key)
+            visible = key.startswith(self.prefix)
+            j = i + 1
+            while (j < len(new) and new_keys[j].startswith(self.prefix) == visible
+                   and bisect.bisect_left(self.keys, new_keys[j], pos) == pos):
+                j += 1
+            count = j - i
+            if visible:
+                row = pos - self.lo
+                self.beginInsertRows(QModelIndex(), row, row + count - 1)
+            self.names[pos:pos] = new[i:j]
+            self.keys[pos:pos] = new_keys[i:j]
+            if visible:
+                self.hi += count
+                self.endInsertRows()
+            elif key < self.prefix:
+                self.lo += count
+                self.hi += count
+            i = j
+
+    def set_prefix(self, prefix):
+        """Filtert auf Namen, die mit prefix beginnen (ohne Groß-/Kleinschreibung)."""
+        prefix = prefix.lower()
+        if prefix == self.prefix:
+            return
+        # längerer Präfix: nur im bisherigen Bereich suchen, sonst in der ganzen Liste
+        if prefix.startswith(self.prefix):
+            lo, hi = self._range(prefix, self.lo, self.hi)
+        else:
+            lo, hi = self._range(prefix, 0, len(self.keys))
+        self.beginResetModel()
+        self.prefix = prefix
+        self.lo, self.hi = lo, hi
+        self.endResetModel()
+
+    def _range(self, prefix, lo, hi):
+        start = bisect.bisect_left(self.keys, prefix, lo, hi)
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", start, hi)
+        return start, end
+
+
 class MainWindow(QWidget):
     """
     Hauptfenster mit:
-    - Pfadauswahl (standardmäßig /usr/bin)
+    - Pfadauswahl (standardmäßig /usr/bin, mehrere Verzeichnisse durch ':' getrennt oder alle aus $PATH)
     - Filterfeld zum Eingrenzen der Programme nach Beginn des Namens
     - Liste aller Programme im Verzeichnis, gefiltert nach Eingabe
     """
@@ -245,31 +1268,78 @@ class MainWindow(QWidget):
         self.browse_btn = QPushButton("Browse")
         path_layout.addWidget(self.browse_btn)
 
+        self.all_path_check = QCheckBox("All $PATH directories")
+        path_layout.addWidget(self.all_path_check)
+
         self.layout_main.addLayout(path_layout)
 
+        # Status des Verzeichnis-Scans
+        self.scan_label = QLabel()
+        self.layout_main.addWidget(self.scan_label)
+
         # Filterfeld
         self.filter_edit = QLineEdit()
         self.filter_edit.setPlaceholderText("Filter files by name prefix...")
         self.layout_main.addWidget(self.filter_edit)
 
-        # Liste aller Programme
-        self.list_widget = QListWidget()
-        self.layout_main.addWidget(self.list_widget)
+        # Volltextsuche über alle Manpages (Index wird im Hintergrund aufgebaut)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Full-text search in all manpages...")
+        self.layout_main.addWidget(self.search_edit)
+
+        self.search_results = QListWidget()
+        self.search_results.hide()
+        self.layout_main.addWidget(self.search_results)
+
+        self.index_label = QLabel("Indexing manpages...")
+        self.layout_main.addWidget(self.index_label)
+
+        # Liste aller Programme (Model/View: Filtern ändert nur den Bereich im Model, keine Items pro Zeile)
+        self.program_model = ProgramListModel(self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.program_model)
+        self.layout_main.addWidget(self.list_view)
 
         self.setLayout(self.layout_main)
 
-        # interne Liste aller Dateien (Strings)
-        self.all_files = []
+        # laufender Verzeichnis-Scan; die Id verwirft Batches eines abgebrochenen Scans
+        self.scanner = None
+        self.scan_id = 0
+
+        # Index der Hilfedateien, wird im Hintergrund geladen und aktualisiert
+        self.doc_index = None
+        self.doc_indexer = None
+
+        # offene Manpage-Fenster (laden unabhängig voneinander im Hintergrund)
+        self.manpage_windows = []
+
+        # Suchindex im GUI-Thread (nur lesend) und verzögerte Suche beim Tippen
+        self.index = ManIndex()
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
 
         # Signale verbinden
         self.browse_btn.clicked.connect(self.browse_folder)
         self.path_edit.returnPressed.connect(self.load_files)
+        self.all_path_check.toggled.connect(self.load_files)
         self.filter_edit.textChanged.connect(self.filter_list)
-        self.list_widget.itemDoubleClicked.connect(self.open_manpage)
+        self.list_view.doubleClicked.connect(self.open_manpage)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.search_edit.returnPressed.connect(self.run_search)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_results.itemDoubleClicked.connect(self.open_search_hit)
 
         # Initial Dateien laden
         self.load_files()
 
+        # Volltextindex im Hintergrund aktualisieren (nur neue/geänderte Manpages werden gerendert)
+        self.indexer = ManIndexer()
+        self.indexer.progress.connect(self.on_index_progress)
+        self.indexer.indexed.connect(self.on_indexed)
+        self.indexer.start()
+
     def browse_folder(self):
         """Öffnet einen Dialog zur Auswahl eines Verzeichnisses."""
         dir_path = QFileDialog.getExistingDirectory(self, "Select Directory", self.path_edit.text())
@@ -277,39 +1347,144 @@ class MainWindow(QWidget):
             self.path_edit.setText(dir_path)
             self.load_files()
 
+    def scan_directories(self):
+        """Verzeichnisse für die Programmliste: alle aus $PATH oder die im Pfadfeld (durch ':' getrennt), ohne Duplikate."""
+        if self.all_path_check.isChecked():
+            text = os.environ.get("PATH", "")
+        else:
+            text = self.path_edit.text()
+        dirs = [os.path.realpath(d) for d in text.split(os.pathsep) if d.strip()]
+        return [d for d in dict.fromkeys(dirs) if os.path.isdir(d)]
+
     def load_files(self):
-        """Lädt alle ausführbaren Dateien im gewählten Verzeichnis und zeigt sie in der Liste an."""
-        path = Path(self.path_edit.text())
-        if not path.is_dir():
+        """Startet den Scan nach ausführbaren Dateien im Hintergrund; die Liste füllt sich, während er läuft."""
+        self.path_edit.setEnabled(not self.all_path_check.isChecked())
+        dirs = self.scan_directories()
+        if not dirs:
             QMessageBox.warning(self, "Error", "Invalid directory")
             return
 
-        # Nur ausführbare Dateien anzeigen
-        files = [f.name for f in path.iterdir() if f.is_file() and os.access(f, os.X_OK)]
+        self.stop_scan()
+        self.scan_id += 1
+        self.program_model.set_names([])
+        self.scan_label.setText(f"Scanning {len(dirs)} director{'y' if len(dirs) == 1 else 'ies'}...")
+        self.scanner = ProgramScanner(self.scan_id, dirs)
+        self.scanner.batch.connect(self.on_scan_batch)
+        self.scanner.scanned.connect(self.on_scanned)
+        self.scanner.start()
+        self.start_doc_index(dirs)
+
+    def start_doc_index(self, dirs):
+        """Aktualisiert den Index der Hilfedateien im Hintergrund (Dokumentationswurzeln plus Programmordner)."""
+        self.stop_doc_index()
+        self.doc_indexer = DocIndexer(dirs)
+        self.doc_indexer.ready.connect(self.on_doc_index)
+        self.doc_indexer.start()
+
+    def stop_doc_index(self):
+        """Beendet eine laufende Aktualisierung des Hilfedatei-Index."""
+        if self.doc_indexer is not None:
+            self.doc_indexer.stop()
+            self.doc_indexer.wait()
+            self.doc_indexer = None
+
+    def on_doc_index(self, doc_index):
+        """Neuer Hilfedatei-Index: an die offenen Manpage-Fenster weitergeben."""
+        self.doc_index = doc_index
+        for win in self.manpage_windows:
+            win.set_doc_index(doc_index)
+
+    def stop_scan(self):
+        """Beendet einen laufenden Scan."""
+        if self.scanner is not None:
+            self.scanner.stop()
+            self.scanner.wait()
+            self.scanner = None
 
-        # Sortieren und speichern
-        self.all_files = sorted(files)
-        self.filter_list(self.filter_edit.text())
+    def on_scan_batch(self, scan_id, programs):
+        """Übernimmt einen Batch gefundener Programme in die Liste (der aktuelle Filter bleibt erhalten)."""
+        if scan_id == self.scan_id:
+            self.program_model.add_programs(programs)
+
+    def on_scanned(self, scan_id, count):
+        """Scan fertig: Anzahl der Programme anzeigen."""
+        if scan_id == self.scan_id:
+            self.scan_label.setText(f"{count} programs")
+
+    def program_directory(self, program):
+        """Verzeichnis eines Programms für Hilfedateien und 'Open Folder'."""
+        directory = self.program_model.directory_of(program)
+        if directory is None:
+            dirs = self.scan_directories()
+            directory = dirs[0] if dirs else self.path_edit.text()
+        return directory
 
     def filter_list(self, text):
         """Filtert die Liste der Dateien, so dass nur Dateien angezeigt werden, die mit 'text' beginnen."""
-        text = text.lower()
-        self.list_widget.clear()
-        for file in self.all_files:
-            if file.lower().startswith(text):
-                self.list_widget.addItem(file)
+        self.program_model.set_prefix(text)
 
-    def open_manpage(self, item):
+    def open_manpage(self, index):
         """Öffnet das Manpage-Fenster für das ausgewählte Programm."""
-        program = item.text()
-        win = ManPageWindow(program, self.path_edit.text())
+        program = self.program_model.name_at(index)
+        win = ManPageWindow(program, self.program_directory(program), doc_index=self.doc_index)
         win.show()
-        # Referenz behalten, damit Fenster nicht sofort geschlossen wird
-        self._manpage_window = win
+        # Referenzen behalten, damit Fenster nicht sofort geschlossen werden; geschlossene fallen heraus
+        self.manpage_windows = [w for w in self.manpage_windows if w.isVisible()]
+        self.manpage_windows.append(win)
+
+    def run_search(self):
+        """Durchsucht den Volltextindex und zeigt die Treffer nach Relevanz sortiert an."""
+        self.search_timer.stop()
+        query = self.search_edit.text().strip()
+        self.search_results.clear()
+        if not query:
+            self.search_results.hide()
+            return
+        try:
+            hits = self.index.search(query)
+        except (OSError, sqlite3.Error) as e:
+            hits = []
+            self.index_label.setText(f"Search failed: {e}")
+        for score, name, section, line in hits:
+            item = QListWidgetItem(f"{name}({section})  -  line {line + 1}")
+            item.setData(Qt.ItemDataRole.UserRole, (name, section, line))
+            self.search_results.addItem(item)
+        if not hits:
+            self.search_results.addItem("No matches")
+        self.search_results.show()
+
+    def open_search_hit(self, item):
+        """Öffnet die Manpage eines Suchtreffers an der gefundenen Zeile."""
+        hit = item.data(Qt.ItemDataRole.UserRole)
+        if not hit:
+            return
+        name, section, line = hit
+        win = ManPageWindow(name, self.program_directory(name), section=section, line=line, doc_index=self.doc_index)
+        win.show()
+        self.manpage_windows = [w for w in self.manpage_windows if w.isVisible()]
+        self.manpage_windows.append(win)
+
+    def on_index_progress(self, done, total):
+        """Zeigt den Fortschritt des Indexers an."""
+        self.index_label.setText(f"Indexing manpages... {done}/{total}")
+
+    def on_indexed(self, count):
+        """Indexer fertig: Statuszeile aktualisieren und eine laufende Suche wiederholen."""
+        self.index_label.setText(f"Full-text index up to date ({count} pages updated)")
+        if self.search_edit.text().strip():
+            self.run_search()
+
+    def closeEvent(self, event):
+        """Stoppt Scanner und Indexer vor dem Beenden."""
+        self.stop_scan()
+        self.stop_doc_index()
+        self.indexer.stop()
+        self.indexer.wait()
+        self.index.close()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
-    import os
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()